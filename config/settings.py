@@ -47,6 +47,28 @@ DEFAULT_DANGEROUS_PATTERNS = [
     r"\bnpm\s+install\s+-g",
 ]
 
+# Prompt files read on every request, keyed by path: (mtime_ns, text)
+_prompt_file_cache: dict = {}
+
+
+def _read_prompt_file(path: Path) -> Optional[str]:
+    """Read a prompt file, reusing the previous read while its mtime is unchanged.
+
+    The system prompt is assembled on every /query; this turns the per-request
+    open+read+decode of each file into a stat. Edits still take effect on the
+    next request. Returns None if the file doesn't exist.
+    """
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    cached = _prompt_file_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    text = path.read_text(encoding="utf-8")
+    _prompt_file_cache[path] = (mtime, text)
+    return text
+
 
 class Config:
     """Configuration manager for PKM Bridge Server.
@@ -94,6 +116,9 @@ class Config:
         self.host = os.getenv("HOST", "127.0.0.1")
         self.debug = os.getenv("DEBUG", "true").lower() == "true"
 
+        # Max concurrent in-flight LLM API calls (shared by queries, scheduler, agents)
+        self.llm_max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
         # Logging Configuration
         self.log_level = os.getenv("LOG_LEVEL", "INFO").upper()
 
@@ -106,7 +131,8 @@ class Config:
             self.timezone = None  # Use system default
 
         # Security - Dangerous command patterns (blacklist), see module constant.
-        self.dangerous_patterns = list(DEFAULT_DANGEROUS_PATTERNS)
+        # A tuple so the shell tools' compiled-pattern cache can key on it as-is.
+        self.dangerous_patterns = tuple(DEFAULT_DANGEROUS_PATTERNS)
 
         # Authentication Configuration
         self.auth_enabled = os.getenv("AUTH_ENABLED", "true").lower() == "true"
@@ -150,13 +176,11 @@ class Config:
         Returns:
             Rendered system prompt string.
         """
-        template = self.system_prompt_file.read_text(encoding="utf-8")
+        template = self._read_system_prompt_template()
 
         # Use provided user context, or fall back to file
         if user_context is None:
-            user_context_file = Path(__file__).parent / "user_context.txt"
-            if user_context_file.exists():
-                user_context = user_context_file.read_text(encoding="utf-8")
+            user_context = _read_prompt_file(Path(__file__).parent / "user_context.txt")
 
         # Insert user context if available
         if user_context:
@@ -197,13 +221,11 @@ class Config:
         Returns:
             List of dicts with 'type', 'text', and optionally 'cache_control' keys.
         """
-        template = self.system_prompt_file.read_text(encoding="utf-8")
+        template = self._read_system_prompt_template()
 
         # Use provided user context, or fall back to file
         if user_context is None:
-            user_context_file = Path(__file__).parent / "user_context.txt"
-            if user_context_file.exists():
-                user_context = user_context_file.read_text(encoding="utf-8")
+            user_context = _read_prompt_file(Path(__file__).parent / "user_context.txt")
 
         # Replace static placeholders (paths don't change)
         template = template.replace("{ORG_DIR}", str(self.org_dir))
@@ -291,15 +313,20 @@ class Config:
             return self._format_learned_rules(learned_rules)
         return ""
 
+    def _read_system_prompt_template(self) -> str:
+        """Read system_prompt.txt; unlike the optional prompt files, it must exist."""
+        template = _read_prompt_file(self.system_prompt_file)
+        if template is None:
+            raise FileNotFoundError(f"System prompt file not found: {self.system_prompt_file}")
+        return template
+
     def _read_curated_patterns(self) -> str:
         """Read `.pkm/learned-patterns.md`, or '' if absent/empty/unreadable."""
-        path = self.org_dir / ".pkm" / "learned-patterns.md"
         try:
-            if path.exists():
-                return path.read_text(encoding="utf-8").strip()
+            text = _read_prompt_file(self.org_dir / ".pkm" / "learned-patterns.md")
         except OSError:
-            pass
-        return ""
+            return ""
+        return text.strip() if text else ""
 
     @staticmethod
     def _format_learned_rules(rules) -> str:
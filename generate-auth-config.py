@@ -9,6 +9,7 @@
 This script generates a secure JWT secret and password hash for use in .env file.
 """
 
+import os
 import secrets
 import sys
 
@@ -21,8 +22,8 @@ def generate_jwt_secret() -> str:
 
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt with 12 rounds."""
-    salt = bcrypt.gensalt(rounds=12)
+    """Hash a password using bcrypt (BCRYPT_ROUNDS, default 12)."""
+    salt = bcrypt.gensalt(rounds=int(os.getenv("BCRYPT_ROUNDS", "12")))
     return bcrypt.hashpw(password.encode(), salt).decode("utf-8")
 
 
@@ -185,27 +185,18 @@ def _get_file_editor():
 
 def _log_tool_execution(tool_name: str, params: dict, result: str, duration_ms: int):
     """Log tool execution to the ToolExecutionLog table."""
-    try:
-        from pkm_bridge.database import get_db
-        from pkm_bridge.db_repository import ToolExecutionLogRepository
-
-        db = get_db()
-        try:
-            ToolExecutionLogRepository.create_log(
-                db=db,
-                session_id="mcp",
-                query_id=f"mcp-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}",
-                user_message="(via MCP)",
-                tool_name=tool_name,
-                tool_params=params,
-                result_summary=result[:500] if result else "",
-                exit_code=0,
-                execution_time_ms=duration_ms,
-            )
-        finally:
-            db.close()
-    except Exception as e:
-        logger.debug(f"Failed to log tool execution: {e}")
+    from pkm_bridge.log_writer import tool_log_writer
+
+    tool_log_writer.submit(
+        session_id="mcp",
+        query_id=f"mcp-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}",
+        user_message="(via MCP)",
+        tool_name=tool_name,
+        tool_params=params,
+        result_summary=result[:500] if result else "",
+        exit_code=0,
+        execution_time_ms=duration_ms,
+    )
 
 
 def _execute_tool(name: str, params: dict, context: dict | None = None) -> str:
@@ -657,17 +648,18 @@ def register_all_tools(mcp: FastMCP):
                         title = name.replace(".md", "").replace("-", " ").upper()
                         parts.append(f"\n\n# {title}\n\n{content}")
 
-        # 4. Recent journal summary (last 3 days)
+        # 4. Recent journal summary (last 3 days). Journals are read from
+        # files, so this works without Voyage or the database.
         try:
-            retriever = _get_context_retriever()
-            if retriever:
-                journals = retriever.retrieve_recent_journals(days=3)
-                if journals:
-                    journal_text = "\n\n".join(
-                        f"## {j.get('filename', 'unknown')}\n{j.get('content', '')}"
-                        for j in journals
-                    )
-                    parts.append("\n\n# RECENT JOURNALS (last 3 days)\n\n" + journal_text)
+            from pkm_bridge.context_retriever import ContextRetriever
+
+            retriever = _get_context_retriever() or ContextRetriever()
+            journals = retriever.retrieve_recent_journals(days=3)
+            if journals:
+                journal_text = "\n\n".join(
+                    f"## {j.get('filename', 'unknown')}\n{j.get('content', '')}" for j in journals
+                )
+                parts.append("\n\n# RECENT JOURNALS (last 3 days)\n\n" + journal_text)
         except Exception as e:
             logger.debug(f"Failed to load recent journals: {e}")
 
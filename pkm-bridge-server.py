@@ -18,11 +18,15 @@
 #   "google-auth-oauthlib>=1.2.0",
 #   "google-auth-httplib2>=0.2.0",
 #   "google-api-python-client>=2.147.0",
-#   "pgvector>=0.2.0",
+#   "pgvector>=0.3.0",
 #   "voyageai>=0.2.0",
 #   "apscheduler>=3.10.0",
 #   "croniter>=1.3.0",
 #   "litellm>=1.50.0",
+#   "httpx[http2]>=0.28.0",
+#   "orjson>=3.9.0",
+#   "waitress>=3.0.0",
+#   "numpy>=1.26",
 # ]
 # ///
 """
@@ -31,18 +35,21 @@ gco-pkm-llm Bridge Server
 A modular server providing Claude API access to Personal Knowledge Management files.
 """
 
-import json
+import logging
 import os
 import re
 import secrets
 import threading
 import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Dict
 
-from anthropic import Anthropic
+import httpx
+from anthropic import Anthropic, DefaultHttpxClient
 from flask import (
     Flask,
     Response,
@@ -55,7 +62,7 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from werkzeug.middleware.proxy_fix import ProxyFix
 
-from pkm_bridge.llm import LLMClient
+from pkm_bridge.llm import LLMClient, response_text
 from pkm_bridge.models import (
     get_anthropic_cost,
     get_available_models,
@@ -97,7 +104,10 @@ from pkm_bridge.db_repository import (
     ToolExecutionLogRepository,
     UserSettingsRepository,
 )
-from pkm_bridge.embeddings.embedding_service import run_incremental_embedding
+from pkm_bridge.embeddings.embedding_service import (
+    invalidate_note_manifest,
+    run_incremental_embedding,
+)
 from pkm_bridge.embeddings.voyage_client import VoyageClient
 
 # Import SSE event manager
@@ -108,10 +118,15 @@ from pkm_bridge.feedback_capture import capture_feedback, check_previous_correct
 
 # Import Google Calendar components
 from pkm_bridge.google_oauth import GoogleOAuth
+from pkm_bridge.json_provider import OrjsonProvider
+from pkm_bridge.json_provider import dumps as json_dumps
+from pkm_bridge.log_writer import tool_log_writer
 from pkm_bridge.logging_config import setup_logging
 
 # Import org-mode link utilities
 from pkm_bridge.org_links import resolve_attachment_path, resolve_org_id_to_file
+from pkm_bridge.prompt_cache import MAX_CACHE_BREAKPOINTS, mark_last_message_for_cache
+from pkm_bridge.query_cache import RecentAnswerCache
 from pkm_bridge.query_enhancer import QueryEnhancer
 from pkm_bridge.retrospective import SessionRetrospective
 from pkm_bridge.scheduler.dispatcher import TaskDispatcher
@@ -165,7 +180,19 @@ config = Config()
 logger = setup_logging(config.log_level)
 
 # Initialize Anthropic client and multi-LLM adapter
-client = Anthropic(api_key=config.anthropic_api_key)
+# One pooled HTTP client for every Anthropic call. httpx's default 5s keepalive
+# is shorter than a typical tool execution, so each tool-loop turn would
+# otherwise pay a fresh TLS handshake. HTTP/2 lets concurrent queries share a
+# connection instead of each opening its own.
+client = Anthropic(
+    api_key=config.anthropic_api_key,
+    http_client=DefaultHttpxClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0
+        ),
+    ),
+)
 llm_client = LLMClient(anthropic_client=client, config=config)
 
 # Initialize voice preprocessor
@@ -292,6 +319,8 @@ query_enhancer = QueryEnhancer(logger)
 
 # Flask app
 app = Flask(__name__)
+# orjson for jsonify/request.get_json — history and session payloads are large
+app.json = OrjsonProvider(app)
 
 # Behind Traefik: trust one proxy hop so request.remote_addr (and thus the rate
 # limiter's key_func) reflects the real client IP from X-Forwarded-For, not Traefik.
@@ -497,6 +526,48 @@ def timer(label: str):
         logger.debug(f"{label}: {time.time() - start:.3f}s")
 
 
+# Threads for one turn's run of consecutive read-only tool calls (most are
+# subprocess / network bound)
+_TOOL_WORKERS = 4
+
+
+def _run_tool(name: str, params: Dict[str, Any], context: Dict[str, Any]):
+    """Execute one tool call; returns (result, execution_time_ms)."""
+    start_time = time.time()
+    with timer(f"<<< Tool execution: {name}"):
+        result = tool_registry.execute_tool(name, params, context=context)
+    return result, int((time.time() - start_time) * 1000)
+
+
+def _iter_tool_results(blocks: list, context: Dict[str, Any]):
+    """Run one turn's tool_use blocks; yields (result, execution_time_ms) in block order.
+
+    Consecutive read-only tools run concurrently on a pool owned by this turn.
+    Any other tool runs alone once everything before it has finished, so side
+    effects (shell commands, file edits) happen in the order they were issued.
+    """
+    pool = None
+    try:
+        i = 0
+        while i < len(blocks):
+            j = i
+            while j < len(blocks) and tool_registry.is_read_only(blocks[j].name):
+                j += 1
+            if j - i < 2:
+                yield _run_tool(blocks[i].name, blocks[i].input, context)
+                i += 1
+                continue
+            if pool is None:
+                pool = ThreadPoolExecutor(max_workers=_TOOL_WORKERS, thread_name_prefix="tool")
+            futures = [pool.submit(_run_tool, b.name, b.input, context) for b in blocks[i:j]]
+            for future in futures:
+                yield future.result()
+            i = j
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
 def serialize_message_content(content, *, strip_thinking: bool = True):
     """Convert Anthropic message content to JSON-serializable format.
 
@@ -582,38 +653,15 @@ def _independent_message_copy(messages):
     return copied
 
 
-def mark_last_message_for_cache(messages):
-    """Move a single ephemeral cache breakpoint to the end of the message list.
-
-    The conversation history (assistant tool_use + large tool_result blocks) is
-    re-sent on every tool-loop iteration and every turn. A moving breakpoint on
-    the last content block lets cache hits accrue through the loop. We clear any
-    previous per-message breakpoint first so that, together with the up-to-3
-    cached system blocks, we stay within Anthropic's 4-breakpoint limit.
-    String-content messages can't carry a per-block breakpoint, so they're skipped.
-
-    Blocks are *replaced* rather than mutated in place: a block dict may be shared
-    with the persisted history, so an in-place edit would leak the cache_control
-    marker (or a stripped-vs-unstripped mismatch) into stored conversation state.
-    """
-    for msg in messages:
-        content = msg.get("content")
-        if isinstance(content, list):
-            for i, block in enumerate(content):
-                if isinstance(block, dict) and "cache_control" in block:
-                    content[i] = {k: v for k, v in block.items() if k != "cache_control"}
-
-    if not messages:
-        return
-    last_content = messages[-1].get("content")
-    if isinstance(last_content, list) and last_content and isinstance(last_content[-1], dict):
-        last_content[-1] = {**last_content[-1], "cache_control": {"type": "ephemeral"}}
-
-
 # Per-session in-process locks: a session's history is read at request start and
-# rewritten at the end, so two overlapping /query calls on one session would be
-# last-writer-wins. We reject a second in-flight query for the same session.
-_session_locks: Dict[str, threading.Lock] = {}
+# extended at the end, so two overlapping /query calls on one session would
+# interleave their turns. We reject a second in-flight query for the same session.
+# Across worker processes the append-only save (SessionRepository.extend_history)
+# still keeps every turn; the lock only provides the friendly rejection.
+# Kept as an LRU so a long-running server doesn't hold a lock for every session
+# id it has ever seen; only idle (unlocked) entries are evicted.
+_SESSION_LOCKS_MAX = 1024
+_session_locks: "OrderedDict[str, threading.Lock]" = OrderedDict()
 _session_locks_guard = threading.Lock()
 
 
@@ -621,25 +669,64 @@ def _get_session_lock(session_id: str) -> threading.Lock:
     """Return the process-wide lock for `session_id`, creating it on first use."""
     with _session_locks_guard:
         lock = _session_locks.get(session_id)
-        if lock is None:
-            lock = threading.Lock()
-            _session_locks[session_id] = lock
+        if lock is not None:
+            _session_locks.move_to_end(session_id)
+            return lock
+
+        lock = threading.Lock()
+        _session_locks[session_id] = lock
+        if len(_session_locks) > _SESSION_LOCKS_MAX:
+            for sid in list(_session_locks):  # least recently used first
+                if len(_session_locks) <= _SESSION_LOCKS_MAX:
+                    break
+                if sid != session_id and not _session_locks[sid].locked():
+                    del _session_locks[sid]
         return lock
 
 
-def _persist_history_safely(session_id: str, history) -> None:
-    """Best-effort save of `history` to the DB, swallowing all errors.
+# Final answers of just-finished turns, so a client resend (stream dropped right
+# at the end, same request_id) replays the answer instead of re-running the
+# turn. Per process.
+recent_answers = RecentAnswerCache()
+
+
+def _replay_recent_answer(session_id: str, request_id: str) -> dict | None:
+    """Return the cached 'done' event if `request_id` is a resend of the last turn.
+
+    Only matches while the stored history is exactly as that turn left it.
+    """
+    entry = recent_answers.get(session_id, request_id)
+    if entry is None:
+        return None
+    history_len, event = entry
+    db = get_db()
+    try:
+        db_session = SessionRepository.get_session(db, session_id)
+        current_len = len(db_session.history or []) if db_session else 0
+    finally:
+        db.close()
+    if current_len != history_len:
+        return None
+    return {
+        **event,
+        "replayed": True,
+        "usage": {**event["usage"], "input_tokens": 0, "output_tokens": 0, "cost": 0.0},
+    }
+
+
+def _persist_history_safely(session_id: str, new_messages) -> None:
+    """Best-effort append of `new_messages` to the DB history, swallowing all errors.
 
     Used from the GeneratorExit path (client disconnect) where we can't yield
-    and must never raise. `history` may be None if the disconnect happened
-    before it was loaded.
+    and must never raise. `new_messages` is empty if the disconnect happened
+    before anything was added or after the turn was already saved.
     """
-    if not history:
+    if not new_messages:
         return
     try:
         db = get_db()
         try:
-            SessionRepository.update_history(db, session_id, history)
+            SessionRepository.extend_history(db, session_id, new_messages)
             logger.info(f"Persisted history for session {session_id} after client disconnect")
         finally:
             db.close()
@@ -652,6 +739,26 @@ def _persist_history_safely(session_id: str, history) -> None:
 # -------------------------
 
 
+def _check_auth(allow_query_token: bool = False):
+    """Check auth if enabled. Returns error response or None.
+
+    Args:
+        allow_query_token: Also accept the token from a ``?token=`` query param.
+            Needed for browser-native GETs that cannot set headers (EventSource,
+            <img>) — mirrors the /assets endpoint.
+    """
+    if config.auth_enabled:
+        auth_header = request.headers.get("Authorization", "")
+        token = auth_header[7:] if auth_header.startswith("Bearer ") else ""
+        if not token and allow_query_token:
+            token = request.args.get("token", "")
+        if not token:
+            return jsonify({"error": "Missing authorization"}), 401
+        if not auth_manager.verify_token(token):
+            return jsonify({"error": "Invalid token"}), 401
+    return None
+
+
 @app.route("/")
 def index():
     """Serve the main web interface."""
@@ -840,7 +947,7 @@ def transcribe():
 
 def _ndjson(obj: dict) -> str:
     """Serialize a dict as a single NDJSON line (one JSON object + newline)."""
-    return json.dumps(obj) + "\n"
+    return json_dumps(obj) + "\n"
 
 
 # When a tool returns "...visit /auth/<provider>/authorize..." (the standard
@@ -865,13 +972,20 @@ def _forward_llm_deltas(stream_gen):
     inside another generator — Python's `yield from` captures the inner
     generator's return value via StopIteration.value, which gives us the
     fully-assembled LLM response after streaming.
+
+    If the client disconnects mid-stream, the upstream stream is closed right
+    away so its HTTP connection and LLMClient concurrency slot are released
+    instead of lingering until the generator is garbage-collected.
     """
-    while True:
-        try:
-            delta = next(stream_gen)
+    try:
+        while True:
+            try:
+                delta = next(stream_gen)
+            except StopIteration as exc:
+                return exc.value
             yield _ndjson(delta)
-        except StopIteration as exc:
-            return exc.value
+    finally:
+        stream_gen.close()
 
 
 @app.route("/query", methods=["POST"])
@@ -907,6 +1021,7 @@ def query():
         session_id = "default"  # may be overwritten before any error event
         terminal_emitted = False  # whether 'done' or 'error' was sent
         history = None  # full, persisted history; set once loaded from the DB
+        persisted_len = 0  # how much of `history` is already stored
         session_lock = None
         lock_acquired = False
 
@@ -915,7 +1030,7 @@ def query():
             session_id = data.get("session_id", "default")
 
             # Serialize queries per session: history is read at the start and
-            # rewritten at the end, so a concurrent query would drop a turn.
+            # extended at the end, so a concurrent query would interleave turns.
             session_lock = _get_session_lock(session_id)
             lock_acquired = session_lock.acquire(blocking=False)
             if not lock_acquired:
@@ -933,6 +1048,15 @@ def query():
 
             user_message = data["message"]
             model = data.get("model", config.model)
+
+            # Set by clients that support replay; reused only on a resend
+            request_id = data.get("request_id")
+            replay = _replay_recent_answer(session_id, request_id) if request_id else None
+            if replay is not None:
+                logger.info(f"Replaying previous answer for resent message (session={session_id})")
+                terminal_emitted = True
+                yield _ndjson(replay)
+                return
             thinking = data.get("thinking")
             user_timezone = data.get("timezone")  # Optional timezone from client
             if not user_timezone and config.timezone:
@@ -1048,7 +1172,7 @@ def query():
                         logger.warning(f"Context retrieval failed: {e}")
 
                 # Debug: log system block structure
-                if logger.level <= 10:  # DEBUG level
+                if logger.isEnabledFor(logging.DEBUG):
                     for i, block in enumerate(system_prompt_blocks, 1):
                         cached = "✓ CACHED" if "cache_control" in block else "✗ not cached"
                         logger.debug(f"  System block {i}: {len(block['text'])} chars, {cached}")
@@ -1061,7 +1185,8 @@ def query():
                 db_session = SessionRepository.get_or_create_session(
                     db, session_id, system_prompt=system_prompt_flat
                 )
-                history = db_session.history if db_session.history else []
+                history = list(db_session.history) if db_session.history else []
+                persisted_len = len(history)
             finally:
                 db.close()
 
@@ -1090,7 +1215,10 @@ def query():
             # Validate all messages have non-empty content (API requirement)
             validate_history(api_messages)
 
-            # Get tools in Anthropic format (adapter translates for non-Anthropic)
+            # Get tools in Anthropic format (adapter translates for non-Anthropic).
+            # The registry hands back the same definitions every time, so the
+            # tools→system prefix stays byte-identical and the system breakpoints
+            # cover it on turn ≥2 of the tool loop.
             tools = tool_registry.get_anthropic_tools()
 
             # Anthropic server-side web search — executed by the API, not by us.
@@ -1119,7 +1247,12 @@ def query():
                 # tools→system→messages and the system blocks already carry cache
                 # breakpoints, so a tools breakpoint is redundant and leaves the
                 # growing history re-sent uncached every loop iteration.
-                mark_last_message_for_cache(api_messages)
+                # Whatever the system blocks leave of the 4-breakpoint budget
+                # goes to the message tail (and the previous call's tail).
+                message_breakpoints = MAX_CACHE_BREAKPOINTS - sum(
+                    1 for b in system_prompt_blocks if "cache_control" in b
+                )
+                mark_last_message_for_cache(api_messages, message_breakpoints)
                 if thinking:
                     api_params["thinking"] = thinking
 
@@ -1187,121 +1320,114 @@ def query():
                     accumulate_usage(response)
                     continue
 
-                tool_results = []
-                for block in response.content:
-                    if getattr(block, "type", None) == "tool_use":
-                        tool_call_count += 1
-                        tool_names_used.append(block.name)
-                        logger.info(f">>> Tool call: {block.name} with params: {block.input}")
-
-                        # Surface the call to the UI before we run it — for slow
-                        # tools (network, LLM-driven scripts) the user sees what
-                        # the model is doing instead of a silent spinner.
-                        yield _ndjson(
-                            {
-                                "type": "tool_call",
-                                "id": block.id,
-                                "name": block.name,
-                                "input": block.input,
-                            }
-                        )
-
-                        # Capture start time for tool execution logging
-                        start_time = time.time()
+                # Announce every call, then run them (read-only ones
+                # concurrently, see _iter_tool_results)
+                tool_blocks = [
+                    b for b in response.content if getattr(b, "type", None) == "tool_use"
+                ]
+                for block in tool_blocks:
+                    tool_call_count += 1
+                    tool_names_used.append(block.name)
+                    # Params can be whole scripts or note bodies; log a preview
+                    params_preview = str(block.input)
+                    if len(params_preview) > 500:
+                        params_preview = params_preview[:500] + "..."
+                    logger.info(f">>> Tool call: {block.name} with params: {params_preview}")
+
+                    # Surface the call to the UI before we run it — for slow
+                    # tools (network, LLM-driven scripts) the user sees what
+                    # the model is doing instead of a silent spinner.
+                    yield _ndjson(
+                        {
+                            "type": "tool_call",
+                            "id": block.id,
+                            "name": block.name,
+                            "input": block.input,
+                        }
+                    )
 
-                        with timer(f"<<< Tool execution: {block.name}"):
-                            # Pass session_id and user_timezone in context for tools that need it
-                            context = {"session_id": session_id, "user_timezone": user_timezone}
-                            result = tool_registry.execute_tool(
-                                block.name, block.input, context=context
-                            )
+                # Pass session_id and user_timezone in context for tools that need it
+                context = {"session_id": session_id, "user_timezone": user_timezone}
 
-                        # Calculate execution time
-                        end_time = time.time()
-                        execution_time_ms = int((end_time - start_time) * 1000)
-
-                        # Ensure result is never empty (API requirement)
-                        if not result or (isinstance(result, str) and not result.strip()):
-                            result = "[Empty result]"
-                            logger.warning(f"Tool {block.name} returned empty result")
-
-                        # Truncate large tool results for non-Anthropic models
-                        # to avoid blowing context windows (Anthropic has 200K+)
-                        if not is_anthropic(model) and len(result) > 20000:
-                            truncated_len = len(result)
-                            result = (
-                                result[:20000]
-                                + f"\n\n[... truncated {truncated_len - 20000:,} chars "
-                                f"— result too large for model context]"
-                            )
-                            logger.warning(
-                                f"Truncated {block.name} result "
-                                f"from {truncated_len:,} to 20,000 chars"
-                            )
+                # Results are reported (and sent back) in block order
+                tool_results = []
+                for block, (result, execution_time_ms) in zip(
+                    tool_blocks, _iter_tool_results(tool_blocks, context)
+                ):
+
+                    # Ensure result is never empty (API requirement)
+                    if not result or (isinstance(result, str) and not result.strip()):
+                        result = "[Empty result]"
+                        logger.warning(f"Tool {block.name} returned empty result")
+
+                    # Truncate large tool results for non-Anthropic models
+                    # to avoid blowing context windows (Anthropic has 200K+)
+                    if not is_anthropic(model) and len(result) > 20000:
+                        truncated_len = len(result)
+                        result = (
+                            result[:20000] + f"\n\n[... truncated {truncated_len - 20000:,} chars "
+                            f"— result too large for model context]"
+                        )
+                        logger.warning(
+                            f"Truncated {block.name} result "
+                            f"from {truncated_len:,} to 20,000 chars"
+                        )
 
-                        # Log if tool result contains an error
-                        if result.startswith("❌"):
-                            tool_error_count += 1
-                            logger.error(f"Tool {block.name} returned error: {result[:200]}")
+                    # Log if tool result contains an error
+                    if result.startswith("❌"):
+                        tool_error_count += 1
+                        logger.error(f"Tool {block.name} returned error: {result[:200]}")
 
-                        # Extract result summary (first 500 chars)
-                        result_summary = result[:500] if result else ""
+                    # Extract result summary (first 500 chars)
+                    result_summary = result[:500] if result else ""
 
-                        # Stream the result back to the UI; flag auth-required so
-                        # the chat shows a reconnect banner mid-conversation.
-                        is_error = isinstance(result, str) and result.startswith("❌")
+                    # Stream the result back to the UI; flag auth-required so
+                    # the chat shows a reconnect banner mid-conversation.
+                    is_error = isinstance(result, str) and result.startswith("❌")
+                    yield _ndjson(
+                        {
+                            "type": "tool_result",
+                            "id": block.id,
+                            "name": block.name,
+                            "ok": not is_error,
+                            "preview": result_summary,
+                            "duration_ms": execution_time_ms,
+                        }
+                    )
+                    auth_provider = _detect_auth_required(result)
+                    if auth_provider:
                         yield _ndjson(
                             {
-                                "type": "tool_result",
-                                "id": block.id,
-                                "name": block.name,
-                                "ok": not is_error,
-                                "preview": result_summary,
-                                "duration_ms": execution_time_ms,
+                                "type": "auth_required",
+                                "provider": auth_provider,
                             }
                         )
-                        auth_provider = _detect_auth_required(result)
-                        if auth_provider:
-                            yield _ndjson(
-                                {
-                                    "type": "auth_required",
-                                    "provider": auth_provider,
-                                }
-                            )
-
-                        # Extract exit code if shell command
-                        exit_code = None
-                        if block.name == "execute_shell" and "Exit code:" in result:
-                            try:
-                                # Parse exit code from result (format: "Exit code: N")
-                                exit_code = int(result.split("Exit code:")[1].split()[0])
-                            except (IndexError, ValueError):
-                                pass
 
-                        # Store tool execution log in database
+                    # Extract exit code if shell command
+                    exit_code = None
+                    if block.name == "execute_shell" and "Exit code:" in result:
                         try:
-                            log_db = get_db()
-                            try:
-                                ToolExecutionLogRepository.create_log(
-                                    db=log_db,
-                                    session_id=session_id,
-                                    query_id=query_id,
-                                    user_message=user_message,
-                                    tool_name=block.name,
-                                    tool_params=block.input,
-                                    result_summary=result_summary,
-                                    exit_code=exit_code,
-                                    execution_time_ms=execution_time_ms,
-                                )
-                            finally:
-                                log_db.close()
-                        except Exception as log_error:
-                            # Don't fail the query if logging fails
-                            logger.warning(f"Failed to log tool execution: {log_error}")
-
-                        tool_results.append(
-                            {"type": "tool_result", "tool_use_id": block.id, "content": result}
-                        )
+                            # Parse exit code from result (format: "Exit code: N")
+                            exit_code = int(result.split("Exit code:")[1].split()[0])
+                        except (IndexError, ValueError):
+                            pass
+
+                    # Store tool execution log in database (batched in the
+                    # background; a failed write never fails the query)
+                    tool_log_writer.submit(
+                        session_id=session_id,
+                        query_id=query_id,
+                        user_message=user_message,
+                        tool_name=block.name,
+                        tool_params=block.input,
+                        result_summary=result_summary,
+                        exit_code=exit_code,
+                        execution_time_ms=execution_time_ms,
+                    )
+
+                    tool_results.append(
+                        {"type": "tool_result", "tool_use_id": block.id, "content": result}
+                    )
 
                 if not tool_results:
                     # tool_use with no executable client tools (shouldn't happen,
@@ -1335,7 +1461,7 @@ def query():
                 # Send the truncated copy; move the cache breakpoint to its tail.
                 api_params["messages"] = api_messages
                 if is_anthropic(model):
-                    mark_last_message_for_cache(api_messages)
+                    mark_last_message_for_cache(api_messages, message_breakpoints)
 
                 api_call_count += 1
                 # Keepalive before each follow-up LLM call (the slow part)
@@ -1347,19 +1473,18 @@ def query():
                 accumulate_usage(response)
 
             # Final text
-            assistant_text = ""
-            for block in response.content:
-                if getattr(block, "type", "") == "text":
-                    assistant_text += block.text
+            assistant_text = response_text(response.content)
 
             history.append(
                 {"role": "assistant", "content": serialize_message_content(response.content)}
             )
 
-            # Save updated history to database
+            # Save this turn's messages; appending (rather than rewriting the
+            # whole history) keeps turns saved by other workers meanwhile.
             db = get_db()
             try:
-                SessionRepository.update_history(db, session_id, history)
+                SessionRepository.extend_history(db, session_id, history[persisted_len:])
+                persisted_len = len(history)
             finally:
                 db.close()
 
@@ -1397,29 +1522,20 @@ def query():
             )
 
             # Log query summary (always, even if no tools were used)
-            try:
-                log_db = get_db()
-                try:
-                    ToolExecutionLogRepository.create_log(
-                        db=log_db,
-                        session_id=session_id,
-                        query_id=query_id,
-                        user_message=user_message,
-                        tool_name="__query_summary__",  # Special marker for query summary
-                        tool_params={
-                            "model": model,
-                            "api_calls": api_call_count,
-                            "tool_calls": tool_call_count,
-                        },
-                        result_summary=assistant_text[:200] if assistant_text else "",
-                        exit_code=None,
-                        execution_time_ms=int(total_elapsed * 1000),
-                    )
-                finally:
-                    log_db.close()
-            except Exception as log_error:
-                # Don't fail the query if logging fails
-                logger.warning(f"Failed to log query summary: {log_error}")
+            tool_log_writer.submit(
+                session_id=session_id,
+                query_id=query_id,
+                user_message=user_message,
+                tool_name="__query_summary__",  # Special marker for query summary
+                tool_params={
+                    "model": model,
+                    "api_calls": api_call_count,
+                    "tool_calls": tool_call_count,
+                },
+                result_summary=assistant_text[:200] if assistant_text else "",
+                exit_code=None,
+                execution_time_ms=int(total_elapsed * 1000),
+            )
 
             # Capture feedback signals for self-improvement retrospective
             capture_feedback(
@@ -1458,7 +1574,7 @@ def query():
             # Update session totals in database
             db = get_db()
             try:
-                SessionRepository.update_session_cost(
+                total_session_cost = SessionRepository.update_session_cost(
                     db,
                     session_id,
                     total_input_tokens,
@@ -1467,31 +1583,28 @@ def query():
                     cache_write_tokens=total_cache_write_tokens,
                     cache_read_tokens=total_cache_read_tokens,
                 )
-
-                # Get updated totals
-                db_session_obj = SessionRepository.get_session(db, session_id)
-                total_session_cost = db_session_obj.total_cost if db_session_obj else request_cost
             finally:
                 db.close()
 
+            done_event = {
+                "type": "done",
+                "response": assistant_text,
+                "session_id": session_id,
+                "session_cost": total_session_cost,
+                "query_id": query_id,
+                "usage": {
+                    "input_tokens": total_input_tokens,
+                    "output_tokens": total_output_tokens,
+                    "cache_read_tokens": total_cache_read_tokens,
+                    "cache_write_tokens": total_cache_write_tokens,
+                    "tool_calls": tool_call_count,
+                    "cost": round(request_cost, 6),
+                },
+            }
+            if request_id:
+                recent_answers.put(session_id, request_id, persisted_len, done_event)
             terminal_emitted = True
-            yield _ndjson(
-                {
-                    "type": "done",
-                    "response": assistant_text,
-                    "session_id": session_id,
-                    "session_cost": total_session_cost,
-                    "query_id": query_id,
-                    "usage": {
-                        "input_tokens": total_input_tokens,
-                        "output_tokens": total_output_tokens,
-                        "cache_read_tokens": total_cache_read_tokens,
-                        "cache_write_tokens": total_cache_write_tokens,
-                        "tool_calls": tool_call_count,
-                        "cost": round(request_cost, 6),
-                    },
-                }
-            )
+            yield _ndjson(done_event)
 
         except GeneratorExit:
             # Client disconnected mid-stream (browser tab closed, network drop,
@@ -1503,7 +1616,7 @@ def query():
                 f"Query stream closed by client before terminal event "
                 f"(session={session_id}, query_id={query_id})"
             )
-            _persist_history_safely(session_id, history)
+            _persist_history_safely(session_id, (history or [])[persisted_len:])
             terminal_emitted = True  # suppress the finally-block log; this case is logged above
             raise
         except Exception as e:
@@ -1566,12 +1679,13 @@ def get_history(session_id):
                 if isinstance(msg["content"], str):
                     history.append({"role": msg["role"], "text": msg["content"]})
                 elif isinstance(msg["content"], list):
-                    text = ""
-                    for item in msg["content"]:
-                        if hasattr(item, "text"):
-                            text += item.text
-                        elif isinstance(item, dict) and "text" in item:
-                            text += item["text"]
+                    # Stored history is plain JSON (serialize_message_content),
+                    # so blocks are always dicts here.
+                    text = "".join(
+                        item["text"]
+                        for item in msg["content"]
+                        if isinstance(item, dict) and "text" in item
+                    )
                     if text:
                         history.append({"role": msg["role"], "text": text})
 
@@ -1720,6 +1834,7 @@ def clear_session(session_id):
     db = get_db()
     try:
         deleted = SessionRepository.delete_session(db, session_id)
+        recent_answers.invalidate(session_id)
         if deleted:
             logger.info(f"Cleared session: {session_id}")
         return jsonify({"status": "ok"})
@@ -2998,6 +3113,19 @@ def trigger_embedding():
         return jsonify({"error": "Failed to start embedding", "message": str(e)}), 500
 
 
+@app.route("/admin/manifest/refresh", methods=["POST"])
+@limiter.limit("30 per minute")
+def refresh_note_manifest():
+    """Drop the cached note-file manifest so the next lookup re-scans (admin endpoint)."""
+    auth_err = _check_auth()
+    if auth_err:
+        return auth_err
+
+    dropped = invalidate_note_manifest()
+    logger.info(f"Note manifest invalidated ({dropped} directories)")
+    return jsonify({"status": "ok", "dropped": dropped})
+
+
 # -------------------------
 # System Prompt API
 # -------------------------
@@ -3016,13 +3144,9 @@ def get_system_prompt(prompt_type: str):
     Args:
         prompt_type: 'web' or 'mcp'
     """
-    if config.auth_enabled:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return jsonify({"error": "Missing authorization"}), 401
-        token = auth_header[7:]
-        if not auth_manager.verify_token(token):
-            return jsonify({"error": "Invalid token"}), 401
+    auth_err = _check_auth()
+    if auth_err:
+        return auth_err
 
     filename = _PROMPT_FILES.get(prompt_type)
     if not filename:
@@ -3044,13 +3168,9 @@ def put_system_prompt(prompt_type: str):
 
     Body: { "content": "...", "expected_mtime": <optional float> }
     """
-    if config.auth_enabled:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return jsonify({"error": "Missing authorization"}), 401
-        token = auth_header[7:]
-        if not auth_manager.verify_token(token):
-            return jsonify({"error": "Invalid token"}), 401
+    auth_err = _check_auth()
+    if auth_err:
+        return auth_err
 
     filename = _PROMPT_FILES.get(prompt_type)
     if not filename:
@@ -3092,13 +3212,9 @@ def put_system_prompt(prompt_type: str):
 @limiter.limit("30 per minute")
 def get_learned_rules():
     """List all learned rules (active and inactive) with metadata."""
-    if config.auth_enabled:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return jsonify({"error": "Missing authorization"}), 401
-        token = auth_header[7:]
-        if not auth_manager.verify_token(token):
-            return jsonify({"error": "Invalid token"}), 401
+    auth_err = _check_auth()
+    if auth_err:
+        return auth_err
 
     db = get_db()
     try:
@@ -3131,13 +3247,9 @@ def get_learned_rules():
 @limiter.limit("30 per minute")
 def update_learned_rule(rule_id):
     """Edit a learned rule (rule_text, is_active, confidence)."""
-    if config.auth_enabled:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return jsonify({"error": "Missing authorization"}), 401
-        token = auth_header[7:]
-        if not auth_manager.verify_token(token):
-            return jsonify({"error": "Invalid token"}), 401
+    auth_err = _check_auth()
+    if auth_err:
+        return auth_err
 
     data = request.json
     if not data:
@@ -3154,6 +3266,7 @@ def update_learned_rule(rule_id):
         rule = LearnedRuleRepository.update(db, rule_id, **updates)
         if not rule:
             return jsonify({"error": "Rule not found"}), 404
+        query_enhancer.invalidate()
 
         return jsonify(
             {
@@ -3173,19 +3286,16 @@ def update_learned_rule(rule_id):
 @limiter.limit("10 per minute")
 def delete_learned_rule(rule_id):
     """Delete a learned rule."""
-    if config.auth_enabled:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return jsonify({"error": "Missing authorization"}), 401
-        token = auth_header[7:]
-        if not auth_manager.verify_token(token):
-            return jsonify({"error": "Invalid token"}), 401
+    auth_err = _check_auth()
+    if auth_err:
+        return auth_err
 
     db = get_db()
     try:
         deleted = LearnedRuleRepository.delete(db, rule_id)
         if not deleted:
             return jsonify({"error": "Rule not found"}), 404
+        query_enhancer.invalidate()
         return jsonify({"status": "deleted"})
     finally:
         db.close()
@@ -3204,13 +3314,9 @@ def submit_feedback():
             "note": "optional user note"
         }
     """
-    if config.auth_enabled:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return jsonify({"error": "Missing authorization"}), 401
-        token = auth_header[7:]
-        if not auth_manager.verify_token(token):
-            return jsonify({"error": "Invalid token"}), 401
+    auth_err = _check_auth()
+    if auth_err:
+        return auth_err
 
     data = request.json
     if not data:
@@ -3253,13 +3359,9 @@ def submit_feedback():
 @limiter.limit("30 per minute")
 def get_note_proposals_pending_count():
     """Count pending note-organization proposals (drives the chat header badge)."""
-    if config.auth_enabled:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return jsonify({"error": "Missing authorization"}), 401
-        token = auth_header[7:]
-        if not auth_manager.verify_token(token):
-            return jsonify({"error": "Invalid token"}), 401
+    auth_err = _check_auth()
+    if auth_err:
+        return auth_err
 
     from pkm_bridge.curation.repository import NoteProposalRepository
 
@@ -3274,13 +3376,9 @@ def get_note_proposals_pending_count():
 @limiter.limit("30 per minute")
 def get_prompt_amendments():
     """List pending prompt amendment proposals from retrospective."""
-    if config.auth_enabled:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return jsonify({"error": "Missing authorization"}), 401
-        token = auth_header[7:]
-        if not auth_manager.verify_token(token):
-            return jsonify({"error": "Invalid token"}), 401
+    auth_err = _check_auth()
+    if auth_err:
+        return auth_err
 
     db = get_db()
     try:
@@ -3316,13 +3414,9 @@ def get_prompt_amendments():
 @limiter.limit("10 per minute")
 def approve_prompt_amendment(rule_id):
     """Approve a prompt amendment (changes it to approved_amendment type)."""
-    if config.auth_enabled:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return jsonify({"error": "Missing authorization"}), 401
-        token = auth_header[7:]
-        if not auth_manager.verify_token(token):
-            return jsonify({"error": "Invalid token"}), 401
+    auth_err = _check_auth()
+    if auth_err:
+        return auth_err
 
     db = get_db()
     try:
@@ -3340,13 +3434,9 @@ def approve_prompt_amendment(rule_id):
 @limiter.limit("10 per minute")
 def reject_prompt_amendment(rule_id):
     """Reject a prompt amendment (deactivates it)."""
-    if config.auth_enabled:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return jsonify({"error": "Missing authorization"}), 401
-        token = auth_header[7:]
-        if not auth_manager.verify_token(token):
-            return jsonify({"error": "Invalid token"}), 401
+    auth_err = _check_auth()
+    if auth_err:
+        return auth_err
 
     db = get_db()
     try:
@@ -3371,13 +3461,9 @@ def trigger_retrospective():
 @limiter.limit("5 per hour")
 def trigger_self_improve():
     """Manually trigger the self-improvement agent."""
-    if config.auth_enabled:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return jsonify({"error": "Missing authorization"}), 401
-        token = auth_header[7:]
-        if not auth_manager.verify_token(token):
-            return jsonify({"error": "Invalid token"}), 401
+    auth_err = _check_auth()
+    if auth_err:
+        return auth_err
 
     try:
         import threading
@@ -3411,13 +3497,9 @@ def get_retrospective_log():
 @limiter.limit("30 per minute")
 def get_self_improve_log():
     """View last self-improvement run and recent run history."""
-    if config.auth_enabled:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return jsonify({"error": "Missing authorization"}), 401
-        token = auth_header[7:]
-        if not auth_manager.verify_token(token):
-            return jsonify({"error": "Invalid token"}), 401
+    auth_err = _check_auth()
+    if auth_err:
+        return auth_err
 
     from pkm_bridge.db_repository import AgentRunLogRepository
 
@@ -3458,13 +3540,9 @@ def get_self_improve_log():
 @limiter.limit("30 per minute")
 def get_self_improve_memory():
     """View all agent memory files."""
-    if config.auth_enabled:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return jsonify({"error": "Missing authorization"}), 401
-        token = auth_header[7:]
-        if not auth_manager.verify_token(token):
-            return jsonify({"error": "Invalid token"}), 401
+    auth_err = _check_auth()
+    if auth_err:
+        return auth_err
 
     from pkm_bridge.self_improvement.filesystem import MEMORY_CATEGORIES, read_memory_file
 
@@ -3639,26 +3717,6 @@ def delete_skill(name: str):
 # -------------------------
 
 
-def _check_auth(allow_query_token: bool = False):
-    """Check auth if enabled. Returns error response or None.
-
-    Args:
-        allow_query_token: Also accept the token from a ``?token=`` query param.
-            Needed for browser-native GETs that cannot set headers (EventSource,
-            <img>) — mirrors the /assets endpoint.
-    """
-    if config.auth_enabled:
-        auth_header = request.headers.get("Authorization", "")
-        token = auth_header[7:] if auth_header.startswith("Bearer ") else ""
-        if not token and allow_query_token:
-            token = request.args.get("token", "")
-        if not token:
-            return jsonify({"error": "Missing authorization"}), 401
-        if not auth_manager.verify_token(token):
-            return jsonify({"error": "Invalid token"}), 401
-    return None
-
-
 @app.route("/api/scheduled-tasks", methods=["GET"])
 @limiter.limit("30 per minute")
 def list_scheduled_tasks():
@@ -3927,7 +3985,6 @@ def get_scheduled_task_budget():
 @app.route("/api/events")
 def sse_events():
     """Server-Sent Events endpoint for real-time notifications."""
-    import json
     import queue
 
     from flask import request
@@ -3946,21 +4003,21 @@ def sse_events():
         keepalive_count = 0
         try:
             # Send initial connection event
-            yield f"data: {json.dumps({'type': 'connected', 'data': {}, 'timestamp': int(time.time())})}\n\n"  # noqa: E501
+            yield f"data: {json_dumps({'type': 'connected', 'data': {}, 'timestamp': int(time.time())})}\n\n"  # noqa: E501
 
             # Stream events from queue
             while True:
                 try:
                     # Wait for messages with timeout to allow checking connection
                     message = client_queue.get(timeout=30)
-                    yield f"data: {json.dumps(message)}\n\n"
+                    yield f"data: {json_dumps(message)}\n\n"
                 except queue.Empty:
                     # Send keepalive event every 30 seconds
                     keepalive_count += 1
                     logger.debug(
                         f"SSE: Sending keepalive #{keepalive_count} to session {session_id}"
                     )
-                    yield f"data: {json.dumps({'type': 'keepalive', 'data': {}, 'timestamp': int(time.time())})}\n\n"  # noqa: E501
+                    yield f"data: {json_dumps({'type': 'keepalive', 'data': {}, 'timestamp': int(time.time())})}\n\n"  # noqa: E501
         except GeneratorExit:
             # Client disconnected, clean up
             logger.info(f"SSE: Client disconnected normally (keepalives sent: {keepalive_count})")
@@ -4004,10 +4061,18 @@ if __name__ == "__main__":
     event_manager.start_file_watcher(watch_dirs)
     logger.info(f"File watcher started for {len(watch_dirs)} directories")
 
-    # In production, use proper WSGI server (gunicorn, waitress, etc.)
-    # Enable threaded mode to handle concurrent requests (e.g., context loading + user queries)
     try:
-        app.run(host=config.host, port=config.port, debug=config.debug, threaded=True)
+        if config.debug:
+            # Dev: Werkzeug server with the reloader (and browser hot-reload)
+            app.run(host=config.host, port=config.port, debug=True, threaded=True)
+        else:
+            # Production: waitress thread pool, no reloader fork. Each open SSE
+            # stream or in-flight /query holds a thread, so keep headroom.
+            from waitress import serve
+
+            threads = int(os.getenv("THREADS", "32"))
+            logger.info(f"Serving with waitress ({threads} threads)")
+            serve(app, host=config.host, port=config.port, threads=threads)
     finally:
         # Clean up on shutdown
         event_manager.stop_file_watcher()
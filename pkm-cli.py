@@ -3,25 +3,35 @@
 # dependencies = [
 #   "requests>=2.31.0",
 #   "python-dotenv>=1.0.0",
+#   "orjson>=3.9.0",
 # ]
 # ///
 """
 gco-pkm-llm CLI Client
 
 Provides command-line access to the PKM bridge server.
-Supports both one-off queries and interactive REPL mode.
+Supports one-off queries, interactive REPL mode, and (with --parallel)
+batches of independent queries piped on stdin.
 """
 
 import argparse
+import atexit
+import base64
 import getpass
 import json
 import os
 import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
+import orjson
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables
 load_dotenv()
@@ -30,8 +40,31 @@ load_dotenv()
 DEFAULT_HOST = os.getenv("HOST", "127.0.0.1")
 DEFAULT_PORT = os.getenv("PORT", "8000")
 BASE_URL = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"
+# Cold-start cache for the auth token: read once when the client starts, then
+# the in-memory token is used for the rest of the process.
 TOKEN_FILE = Path.home() / ".pkm-cli-token"
 AUTH_ENABLED = os.getenv("AUTH_ENABLED", "true").lower() == "true"
+# Failures of a request whose response is parsed as JSON
+# (requests' own JSON errors subclass RequestException; orjson's don't)
+REQUEST_ERRORS = (requests.exceptions.RequestException, orjson.JSONDecodeError)
+# Queries in flight at once when reading from a pipe
+PIPE_WORKERS = 4
+# Treat tokens this close to expiry as already expired (clock skew, slow requests)
+TOKEN_EXPIRY_MARGIN = 30
+
+
+def token_expired(token: str) -> bool:
+    """Check a JWT's exp claim locally, without verifying the signature.
+
+    Only used to skip a saved token that is certainly stale; the server still
+    verifies every request, and a 401 triggers re-authentication.
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = orjson.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return claims["exp"] <= time.time() + TOKEN_EXPIRY_MARGIN
+    except (IndexError, KeyError, TypeError, ValueError):
+        return True
 
 
 class PKMClient:
@@ -40,22 +73,56 @@ class PKMClient:
     def __init__(self, base_url: str = BASE_URL):
         self.base_url = base_url
         self.session_id = None
-        self.token = None
+        self._token = None
+        self._headers = {"Content-Type": "application/json"}
+
+        # One keep-alive connection pool for every request, so only the first
+        # call pays the TCP (and TLS) handshake. Retries cover a restarting
+        # server or proxy; urllib3 doesn't retry POSTs on a status code.
+        self._http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                raise_on_status=False,
+            ),
+        )
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+        self._http.headers.update({"Content-Type": "application/json"})
+        atexit.register(self._http.close)
 
         # Load token if auth is enabled
         if AUTH_ENABLED:
             self._load_token()
 
+    @property
+    def token(self) -> Optional[str]:
+        return self._token
+
+    @token.setter
+    def token(self, value: Optional[str]):
+        # Request headers only depend on the token, so rebuild them here
+        # rather than on every request.
+        self._token = value
+        self._headers = {"Content-Type": "application/json"}
+        if value:
+            self._headers["Authorization"] = f"Bearer {value}"
+
     def _load_token(self):
         """Load authentication token from file or environment"""
         # Try loading from file first
         if TOKEN_FILE.exists():
             try:
-                self.token = TOKEN_FILE.read_text().strip()
-                # Verify token is still valid
-                if not self._verify_token():
-                    self.token = None
+                token = TOKEN_FILE.read_text().strip()
+                # Check expiry locally rather than with a /verify-token round trip
+                if token_expired(token):
                     TOKEN_FILE.unlink(missing_ok=True)
+                else:
+                    self.token = token
             except Exception:
                 pass
 
@@ -64,27 +131,15 @@ class PKMClient:
             self._authenticate()
 
     def _save_token(self, token: str):
-        """Save authentication token to file"""
+        """Use a new token and save it to file for the next run"""
+        # Set in memory first: a failed write must not leave us unauthenticated
+        self.token = token
         try:
             TOKEN_FILE.write_text(token)
             TOKEN_FILE.chmod(0o600)  # Readable only by owner
-            self.token = token
         except Exception as e:
             print(f"Warning: Could not save token: {e}", file=sys.stderr)
 
-    def _verify_token(self) -> bool:
-        """Check if current token is valid"""
-        if not self.token:
-            return False
-
-        try:
-            response = requests.post(
-                f"{self.base_url}/verify-token", json={"token": self.token}, timeout=5
-            )
-            return response.status_code == 200 and response.json().get("valid", False)
-        except Exception:
-            return False
-
     def _authenticate(self):
         """Authenticate with the server"""
         # Try environment variable first
@@ -101,12 +156,12 @@ class PKMClient:
 
         # Login
         try:
-            response = requests.post(
-                f"{self.base_url}/login", json={"password": password}, timeout=10
+            response = self._http.post(
+                f"{self.base_url}/login", data=orjson.dumps({"password": password}), timeout=10
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 token = data.get("token")
                 if token:
                     self._save_token(token)
@@ -117,17 +172,14 @@ class PKMClient:
             else:
                 print("❌ Authentication failed: Invalid password", file=sys.stderr)
 
-        except requests.exceptions.RequestException as e:
+        except REQUEST_ERRORS as e:
             print(f"❌ Authentication error: {e}", file=sys.stderr)
 
         sys.exit(1)
 
     def _get_headers(self) -> dict:
         """Get request headers with authentication if needed"""
-        headers = {"Content-Type": "application/json"}
-        if self.token:
-            headers["Authorization"] = f"Bearer {self.token}"
-        return headers
+        return self._headers
 
     def _handle_401(self):
         """Handle 401 Unauthorized by re-authenticating"""
@@ -136,10 +188,23 @@ class PKMClient:
         TOKEN_FILE.unlink(missing_ok=True)
         self._authenticate()
 
+    def ensure_token(self):
+        """Re-authenticate now if the token is missing or about to expire"""
+        if AUTH_ENABLED and (not self.token or token_expired(self.token)):
+            self._handle_401()
+
     def query(
-        self, message: str, session_id: Optional[str] = None, model: Optional[str] = None
+        self,
+        message: str,
+        session_id: Optional[str] = None,
+        model: Optional[str] = None,
+        reauthenticate: bool = True,
     ) -> dict:
-        """Send a query to the server"""
+        """Send a query to the server
+
+        With reauthenticate=False a 401 is returned as an error instead of
+        prompting for the password (for calls made off the main thread).
+        """
         if session_id is None:
             session_id = self.session_id or "cli-session"
 
@@ -147,35 +212,40 @@ class PKMClient:
         if model:
             payload["model"] = model
 
+        # Serialized once; a retry after re-authenticating resends the same bytes
+        body = orjson.dumps(payload)
+
         try:
-            response = requests.post(
-                f"{self.base_url}/query", json=payload, headers=self._get_headers(), timeout=60
+            response = self._http.post(
+                f"{self.base_url}/query", data=body, headers=self._get_headers(), timeout=60
             )
 
             # Handle 401 and retry once
             if response.status_code == 401 and AUTH_ENABLED:
+                if not reauthenticate:
+                    return {"error": "Authentication expired"}
                 self._handle_401()
-                response = requests.post(
-                    f"{self.base_url}/query", json=payload, headers=self._get_headers(), timeout=60
+                response = self._http.post(
+                    f"{self.base_url}/query", data=body, headers=self._get_headers(), timeout=60
                 )
 
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             # Update session ID for next request
             self.session_id = data.get("session_id", session_id)
 
             return data
-        except requests.exceptions.RequestException as e:
+        except REQUEST_ERRORS as e:
             return {"error": str(e)}
 
     def health(self) -> dict:
         """Check server health"""
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
+            response = self._http.get(f"{self.base_url}/health", timeout=5)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return orjson.loads(response.content)
+        except REQUEST_ERRORS as e:
             return {"error": str(e)}
 
     def clear_session(self, session_id: Optional[str] = None):
@@ -184,14 +254,14 @@ class PKMClient:
             session_id = self.session_id or "cli-session"
 
         try:
-            response = requests.delete(
+            response = self._http.delete(
                 f"{self.base_url}/sessions/{session_id}", headers=self._get_headers(), timeout=5
             )
 
             # Handle 401 and retry once
             if response.status_code == 401 and AUTH_ENABLED:
                 self._handle_401()
-                response = requests.delete(
+                response = self._http.delete(
                     f"{self.base_url}/sessions/{session_id}", headers=self._get_headers(), timeout=5
                 )
 
@@ -292,6 +362,39 @@ def repl_mode(client: PKMClient):
             break
 
 
+def pipe_mode(client: PKMClient, session_id: Optional[str] = None, model: Optional[str] = None):
+    """Batch mode (--parallel): one query per stdin line, sent concurrently.
+
+    Each line gets its own new session, so the queries are independent of each
+    other and of earlier runs; answers are printed in input order.
+    """
+    queries = [line.strip() for line in sys.stdin]
+    queries = [q for q in queries if q]
+    prefix = f"{session_id or 'cli-pipe'}-{uuid.uuid4().hex[:8]}"
+
+    # Workers can't prompt for a password, so make sure the token is good first
+    client.ensure_token()
+
+    def run(item):
+        i, query = item
+        return client.query(query, f"{prefix}-{i}", model, reauthenticate=False)
+
+    failed = False
+    with ThreadPoolExecutor(max_workers=PIPE_WORKERS) as pool:
+        # map() yields results in submission order as each becomes ready
+        for query, result in zip(queries, pool.map(run, enumerate(queries))):
+            print(f"> {query}")
+            if "error" in result:
+                failed = True
+                print(f"Error: {result['error']}", file=sys.stderr)
+            else:
+                print(result.get("response", ""))
+            print()
+
+    if failed:
+        sys.exit(1)
+
+
 def one_off_mode(
     client: PKMClient, query: str, session_id: Optional[str] = None, model: Optional[str] = None
 ):
@@ -321,6 +424,9 @@ Examples:
   # Query with custom session ID
   %(prog)s --session my-session "List my org files"
 
+  # Independent queries, one per line, several in flight at once
+  %(prog)s --parallel < questions.txt
+
   # Check server health
   %(prog)s --health
         """,
@@ -343,6 +449,13 @@ Examples:
         "Options: claude-haiku-4-5, claude-sonnet-4-6, claude-opus-4-7",
     )
 
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Read one query per line from stdin and send them concurrently, "
+        "each in its own new session",
+    )
+
     args = parser.parse_args()
 
     # Create client
@@ -361,6 +474,8 @@ Examples:
     # One-off query mode
     if args.query:
         one_off_mode(client, args.query, args.session, args.model)
+    elif args.parallel:
+        pipe_mode(client, args.session, args.model)
     else:
         # REPL mode
         if args.model:
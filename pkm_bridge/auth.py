@@ -3,7 +3,14 @@
 Provides JWT-based token authentication with password verification.
 """
 
-from datetime import datetime, timedelta
+import hashlib
+import hmac
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
 from functools import wraps
 from typing import Any, Dict, Optional
 
@@ -11,6 +18,17 @@ import bcrypt
 import jwt
 from flask import jsonify, request
 
+# Cost factor for new password hashes. Verification cost is set by the stored
+# hash, so this only matters when generating one.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Longer inputs are rejected without running bcrypt (which only reads the
+# first 72 bytes anyway), so oversized posts can't be used to burn CPU.
+MAX_PASSWORD_LENGTH = 1024
+
+# Recently verified tokens kept so repeat requests skip jwt.decode
+TOKEN_CACHE_SIZE = 256
+
 
 class AuthManager:
     """Manages JWT-based authentication with bcrypt password hashing."""
@@ -30,6 +48,16 @@ class AuthManager:
         self.password_hash = password_hash
         self.token_expiry_hours = token_expiry_hours
         self.logger = logger
+        # Both are fixed for the manager's lifetime, so encode them once
+        self._password_hash_bytes = (
+            password_hash.encode() if isinstance(password_hash, str) else password_hash
+        )
+        self._digest_key = secret_key.encode() + (self._password_hash_bytes or b"")
+        # Keyed digest of the last password that passed bcrypt, so repeat
+        # logins skip the deliberately slow check. Failures are never cached.
+        self._verified_digest: Optional[bytes] = None
+        self._token_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._token_cache_lock = threading.Lock()
 
     @staticmethod
     def hash_password(password: str) -> str:
@@ -41,7 +69,7 @@ class AuthManager:
         Returns:
             bcrypt hash as string
         """
-        salt = bcrypt.gensalt(rounds=12)  # 12 rounds is a good balance of security/performance
+        salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
         return bcrypt.hashpw(password.encode(), salt).decode("utf-8")
 
     def verify_password(self, password: str) -> bool:
@@ -53,9 +81,19 @@ class AuthManager:
         Returns:
             True if password matches
         """
+        # Login bodies are arbitrary JSON, so the value may not be a string
+        if not isinstance(password, str) or not password or len(password) > MAX_PASSWORD_LENGTH:
+            return False
+        password_bytes = password.encode()
+        digest = hmac.new(self._digest_key, password_bytes, hashlib.sha256).digest()
+        if self._verified_digest is not None and hmac.compare_digest(digest, self._verified_digest):
+            return True
         try:
-            return bcrypt.checkpw(password.encode(), self.password_hash.encode())
-        except (ValueError, AttributeError):
+            if bcrypt.checkpw(password_bytes, self._password_hash_bytes):
+                self._verified_digest = digest
+                return True
+            return False
+        except (ValueError, TypeError):
             # Invalid hash format
             if self.logger:
                 self.logger.error("Invalid password hash format in configuration")
@@ -70,16 +108,19 @@ class AuthManager:
         Returns:
             JWT token string
         """
-        now = datetime.utcnow()
-        expiry = now + timedelta(hours=self.token_expiry_hours)
+        # JWT carries POSIX seconds; build them directly rather than via datetime
+        now = int(time.time())
+        expiry = now + self.token_expiry_hours * 3600
 
         payload = {"username": username, "exp": expiry, "iat": now}
         token = jwt.encode(payload, self.secret_key, algorithm="HS256")
 
-        if self.logger:
-            self.logger.info(f"Generated token for '{username}', expires at {expiry.isoformat()}Z")
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            expires_at = datetime.fromtimestamp(expiry, tz=timezone.utc).isoformat()
+            self.logger.info(f"Generated token for '{username}', expires at {expires_at}")
             self.logger.debug(
-                f"Token issued at {now.isoformat()}Z, expires in {self.token_expiry_hours} hours"
+                f"Token issued at {datetime.fromtimestamp(now, tz=timezone.utc).isoformat()}, "
+                f"expires in {self.token_expiry_hours} hours"
             )
 
         return token
@@ -91,8 +132,18 @@ class AuthManager:
             token: JWT token string
 
         Returns:
-            Decoded token payload if valid, None otherwise
+            Decoded token payload if valid (a copy the caller may modify),
+            None otherwise
         """
+        with self._token_cache_lock:
+            payload = self._token_cache.get(token)
+            if payload is not None:
+                # Near expiry, fall through so jwt.decode reports it properly
+                if payload["exp"] > time.time() + 5:
+                    self._token_cache.move_to_end(token)
+                    return dict(payload)
+                del self._token_cache[token]
+
         try:
             # Force JWT to use UTC for time comparison (matches token generation)
             payload = jwt.decode(
@@ -108,11 +159,17 @@ class AuthManager:
                 if self.logger:
                     self.logger.warning("Rejected MCP-audience token used as a Flask session token")
                 return None
-            if self.logger:
+            if self.logger and self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug(f"Token verified for user '{payload.get('username', 'unknown')}'")
-            return payload
+            if "exp" in payload:
+                with self._token_cache_lock:
+                    self._token_cache[token] = payload
+                    if len(self._token_cache) > TOKEN_CACHE_SIZE:
+                        self._token_cache.popitem(last=False)
+            return dict(payload)
         except jwt.ExpiredSignatureError:
-            if self.logger:
+            # The second decode only feeds this log line, so skip it when unlogged
+            if self.logger and self.logger.isEnabledFor(logging.WARNING):
                 # Try to decode without verification to see the expiry time
                 try:
                     unverified = jwt.decode(
@@ -120,12 +177,12 @@ class AuthManager:
                     )
                     exp_timestamp = unverified.get("exp")
                     if exp_timestamp:
-                        exp_time = datetime.fromtimestamp(exp_timestamp)
-                        now = datetime.utcnow()
+                        exp_time = datetime.fromtimestamp(exp_timestamp, tz=timezone.utc)
+                        now = datetime.now(timezone.utc)
                         self.logger.warning(
                             f"Token verification failed: expired token. "
-                            f"Token expired at {exp_time.isoformat()}Z, "
-                            f"current time is {now.isoformat()}Z"
+                            f"Token expired at {exp_time.isoformat()}, "
+                            f"current time is {now.isoformat()}"
                         )
                     else:
                         self.logger.warning(
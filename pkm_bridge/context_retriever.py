@@ -4,14 +4,25 @@ Automatically retrieves semantically relevant note chunks for user queries
 and formats them for injection into Claude's system prompt.
 """
 
+import hashlib
 import logging
-from collections import defaultdict
-from typing import Any, Dict, List, Optional
-
-from sqlalchemy import func, null, or_
-
-from pkm_bridge.database import Document, DocumentChunk, get_db
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from pgvector.sqlalchemy import HALFVEC
+from sqlalchemy import String, cast, func, literal, null, or_, text
+
+from pkm_bridge.database import Document, DocumentChunk, halfvec_literal, session_scope
 from pkm_bridge.embeddings.voyage_client import VoyageClient
+from pkm_bridge.lsh_cache import LSHSemanticCache
+from pkm_bridge.retrieval_cache import RetrievalCache
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +41,44 @@ VECTOR_WEIGHT = 0.7
 KEYWORD_WEIGHT = 0.3
 RRF_K = 60  # standard damping constant; higher = flatter rank contribution
 
+# Query embeddings are cached so a repeated question skips the Voyage round
+# trip. They're kept as float32 (the precision Voyage returns): 4 KB each
+# instead of ~32 KB as a list of Python floats, and a shorter SQL literal.
+# The TTL lets a model change on the Voyage side propagate eventually.
+QUERY_EMBED_CACHE_SIZE = 2048
+QUERY_EMBED_TTL = 3600.0
+
+# HNSW search breadth (pgvector default 40); higher trades latency for recall.
+# An index scan returns at most ef_search rows, so the value used per query is
+# raised to cover the dense candidate pool if needed.
+HNSW_EF_SEARCH = int(os.getenv("PGVECTOR_EF_SEARCH", "40"))
+# The distance threshold and date filter are applied to the index scan's
+# output; an iterative scan (pgvector >= 0.8) keeps searching until the
+# LIMIT is filled instead of stopping at ef_search rows and under-returning.
+# Older extensions reject the setting, so it is only sent when supported.
+HNSW_ITERATIVE_SCAN = "strict_order"
+
+# Threads for stat/read of journal files in retrieve_recent_journals
+JOURNAL_IO_WORKERS = 8
+
+# Auto-injection skips messages with no content words at all ("thanks",
+# "ok do it", "summarize that"): they'd pay an embedding call and two SQL
+# queries for context that only matches noise. One word is enough: "Who is
+# Bob?" is exactly the lookup keyword search is there for.
+MIN_CONTENT_WORDS = 1
+_WORD_RE = re.compile(r"\w+")
+_STOPWORDS = frozenset("""
+    a about all also am an and any are as at be been but by can could did do does doing
+    for from had has have he her here him his how i if in into is it its just me more
+    my no not now of on or our out over please she should so some than that the their
+    them then there these they this those to too up us was we were what when where
+    which who why will with would you your
+    hi hello hey thanks thank ok okay yes yeah yep sure great good nice cool right fine
+    go again continue s t ll
+    summarize summarise summary explain elaborate tell show repeat try mean meant
+    perfect awesome got done
+    """.split())
+
 
 def rrf_fuse(
     vector_ids: List[Any],
@@ -52,16 +101,107 @@ def rrf_fuse(
     return [cid for cid, _ in sorted(scores.items(), key=lambda kv: (-kv[1], str(kv[0])))]
 
 
+def is_trivial_query(query: str) -> bool:
+    """True if a message has too few content words to be worth retrieving for."""
+    words = _WORD_RE.findall(query.lower())
+    return sum(w not in _STOPWORDS for w in words) < MIN_CONTENT_WORDS
+
+
+def _mtime(path: Path) -> float:
+    """Modification time, or -inf if the file vanished since listing."""
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return float("-inf")
+
+
+def _read_journal(file_path: Path) -> Optional[Dict[str, Any]]:
+    """Read one journal file into a result dict, or None if unreadable."""
+    try:
+        content = file_path.read_text(encoding="utf-8")
+    except Exception as e:
+        logger.warning(f"Failed to read {file_path}: {e}")
+        return None
+
+    # Extract date from filename
+    # Org: YYYY-MM-DD.org
+    # Logseq: YYYY_MM_DD.md
+    if file_path.suffix == ".org":
+        date_str = file_path.stem  # Already in YYYY-MM-DD format
+        file_type = "org"
+    else:  # .md
+        date_str = file_path.stem.replace("_", "-")  # Convert YYYY_MM_DD to YYYY-MM-DD
+        file_type = "md"
+
+    return {
+        "date": date_str,
+        "file_path": str(file_path),
+        "content": content,
+        "file_type": file_type,
+    }
+
+
 class ContextRetriever:
     """Automatically retrieve relevant note chunks for queries."""
 
-    def __init__(self, voyage_client: VoyageClient):
+    def __init__(self, voyage_client: Optional[VoyageClient] = None):
         """Initialize context retriever.
 
         Args:
-            voyage_client: Voyage AI client for query embedding
+            voyage_client: Voyage AI client for query embedding. Optional: the
+                journal methods never embed, and without a client
+                retrieve_context falls back to keyword-only search.
         """
         self.voyage_client = voyage_client
+        self._embed_cache: "OrderedDict[bytes, Tuple[float, np.ndarray]]" = OrderedDict()
+        self._embed_cache_lock = threading.Lock()
+        self._results = RetrievalCache()
+        self._similar_results = LSHSemanticCache()
+        # Journal path -> (mtime, parsed entry); only edited files are re-read
+        self._journal_cache: Dict[Path, Tuple[float, Dict[str, Any]]] = {}
+        self._journal_cache_lock = threading.Lock()
+        # Whether the installed pgvector has hnsw.iterative_scan (checked once)
+        self._iterative_scan: Optional[bool] = None
+
+    def _supports_iterative_scan(self, db) -> bool:
+        """Whether the database's pgvector extension is 0.8 or newer."""
+        if self._iterative_scan is None:
+            version = db.execute(
+                text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            ).scalar()
+            try:
+                major, minor = (int(part) for part in (version or "").split(".")[:2])
+            except ValueError:
+                major, minor = 0, 0
+            self._iterative_scan = (major, minor) >= (0, 8)
+            if not self._iterative_scan:
+                logger.warning(
+                    f"pgvector {version} has no hnsw.iterative_scan; filtered vector "
+                    "searches may return fewer results (upgrade to 0.8+)"
+                )
+        return self._iterative_scan
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        """Embed a query, reusing a recent embedding of the same text and model."""
+        key = hashlib.blake2b(
+            f"{self.voyage_client.model}\0{query}".encode(), digest_size=16
+        ).digest()
+        now = time.monotonic()
+        with self._embed_cache_lock:
+            entry = self._embed_cache.get(key)
+            if entry is not None and entry[0] > now:
+                self._embed_cache.move_to_end(key)
+                return entry[1]
+
+        embedding = np.asarray(
+            self.voyage_client.embed_single_batched(query, input_type="query"), dtype=np.float32
+        )
+        with self._embed_cache_lock:
+            self._embed_cache[key] = (now + QUERY_EMBED_TTL, embedding)
+            self._embed_cache.move_to_end(key)
+            while len(self._embed_cache) > QUERY_EMBED_CACHE_SIZE:
+                self._embed_cache.popitem(last=False)
+        return embedding
 
     def retrieve_context(
         self,
@@ -90,110 +230,168 @@ class ContextRetriever:
                 the top N.
 
         Returns:
-            List of dicts with keys: content, heading_path, filename, date,
-            similarity (0.0 for keyword-only hits with no embedding),
+            List of dicts with keys: content, heading_path, filename, basename,
+            date, similarity (0.0 for keyword-only hits with no embedding),
             start_line, chunk_type
         """
+        cache_key = RetrievalCache.key(query, limit, min_similarity, newer)
+        cached = self._results.get(cache_key)
+        if cached is not None:
+            return cached
+
         # Embed query. On failure fall back to keyword-only retrieval rather
         # than returning nothing.
         query_embedding = None
-        try:
-            query_embedding = self.voyage_client.embed_single(query, input_type="query")
-        except Exception as e:
-            logger.error(f"Failed to embed query (keyword-only fallback): {e}")
+        if self.voyage_client is not None:
+            try:
+                query_embedding = self._embed_query(query)
+            except Exception as e:
+                logger.error(f"Failed to embed query (keyword-only fallback): {e}")
+
+        # A rephrasing of a recent query retrieves the same chunks
+        params = (limit, min_similarity, newer)
+        if query_embedding is not None:
+            similar = self._similar_results.lookup(query_embedding, params)
+            if similar is not None:
+                self._results.put(cache_key, similar)
+                return list(similar)
+
+        # Serialize the vector once as a pgvector literal; both candidate
+        # queries bind it, and otherwise each would format all 1024 floats.
+        # It's cast to halfvec like the column, or the HNSW index won't apply.
+        query_vector = None
+        if query_embedding is not None:
+            query_vector = cast(literal(halfvec_literal(query_embedding), String), HALFVEC)
 
-        db = get_db()
         try:
-            date_filters = []
-            if newer:
-                # Keep undated chunks too -- we can't verify they're too old.
-                date_filters.append(
-                    or_(Document.date_extracted.is_(None), Document.date_extracted >= newer)
+            with session_scope() as db:
+                date_filters = []
+                if newer:
+                    # Keep undated chunks too -- we can't verify they're too old.
+                    date_filters.append(
+                        or_(Document.date_extracted.is_(None), Document.date_extracted >= newer)
+                    )
+
+                # Candidate pool per modality; fusion narrows to `limit`.
+                pool = max(limit * 3, 30)
+
+                # Only the columns the result dicts need: loading whole entities
+                # would also pull each chunk's embedding vector back from Postgres.
+                columns = (
+                    DocumentChunk.id,
+                    DocumentChunk.content,
+                    DocumentChunk.heading_path,
+                    DocumentChunk.start_line,
+                    DocumentChunk.chunk_type,
+                    Document.file_path,
+                    Document.date_extracted,
                 )
 
-            # Candidate pool per modality; fusion narrows to `limit`.
-            pool = max(limit * 3, 30)
-
-            # Dense candidates (cosine_distance = 1 - cosine_similarity)
-            vector_rows = []
-            if query_embedding is not None:
-                vector_rows = (
-                    db.query(
-                        DocumentChunk,
-                        Document,
-                        DocumentChunk.embedding.cosine_distance(query_embedding).label("distance"),
+                # Both candidate queries select the distance under one label
+                # object; ordering by the object (not the string "distance")
+                # keeps the statement shape fixed for SQLAlchemy's compiled cache.
+                distance = (
+                    DocumentChunk.embedding.cosine_distance(query_vector)
+                    if query_vector is not None
+                    else null()
+                )
+                distance_col = distance.label("distance")
+
+                # Dense candidates (cosine_distance = 1 - cosine_similarity). The
+                # similarity threshold is applied in SQL so rows below it are never
+                # sent back.
+                vector_rows = []
+                if query_vector is not None:
+                    ef_search = str(max(HNSW_EF_SEARCH, pool))
+                    if self._supports_iterative_scan(db):
+                        db.execute(
+                            text(
+                                "SELECT set_config('hnsw.ef_search', :ef, true), "
+                                "set_config('hnsw.iterative_scan', :scan, true)"
+                            ),
+                            {"ef": ef_search, "scan": HNSW_ITERATIVE_SCAN},
+                        )
+                    else:
+                        db.execute(
+                            text("SELECT set_config('hnsw.ef_search', :ef, true)"),
+                            {"ef": ef_search},
+                        )
+                    vector_rows = (
+                        db.query(*columns, distance_col)
+                        .join(Document, DocumentChunk.document_id == Document.id)
+                        .filter(
+                            DocumentChunk.embedding.isnot(None),
+                            distance <= 1 - min_similarity,
+                            *date_filters,
+                        )
+                        .order_by(distance_col)
+                        .limit(pool)
+                        .all()
                     )
+
+                # Keyword candidates. websearch_to_tsquery is built for raw user
+                # input (ANDs terms, tolerates quotes/operators); the expression
+                # must match idx_chunks_content_fts exactly to use the GIN index.
+                tsvector = func.to_tsvector("english", DocumentChunk.content)
+                tsquery = func.websearch_to_tsquery("english", query)
+                keyword_rows = (
+                    db.query(*columns, distance_col)
                     .join(Document, DocumentChunk.document_id == Document.id)
-                    .filter(DocumentChunk.embedding.isnot(None), *date_filters)
-                    .order_by("distance")
+                    .filter(tsvector.op("@@")(tsquery), *date_filters)
+                    .order_by(func.ts_rank_cd(tsvector, tsquery).desc())
                     .limit(pool)
                     .all()
                 )
 
-            # Keyword candidates. websearch_to_tsquery is built for raw user
-            # input (ANDs terms, tolerates quotes/operators); the expression
-            # must match idx_chunks_content_fts exactly to use the GIN index.
-            tsvector = func.to_tsvector("english", DocumentChunk.content)
-            tsquery = func.websearch_to_tsquery("english", query)
-            distance_col = (
-                DocumentChunk.embedding.cosine_distance(query_embedding)
-                if query_embedding is not None
-                else null()
-            ).label("distance")
-            keyword_rows = (
-                db.query(DocumentChunk, Document, distance_col)
-                .join(Document, DocumentChunk.document_id == Document.id)
-                .filter(tsvector.op("@@")(tsquery), *date_filters)
-                .order_by(func.ts_rank_cd(tsvector, tsquery).desc())
-                .limit(pool)
-                .all()
-            )
-
-            # Collect candidates; rank order within each list feeds RRF.
-            candidates: Dict[int, Dict[str, Any]] = {}
-            vector_ids = []
-            for chunk, doc, distance in vector_rows:
-                similarity = 1 - distance
-                if similarity < min_similarity:
-                    continue
-                vector_ids.append(chunk.id)
-                candidates[chunk.id] = self._chunk_dict(chunk, doc, similarity)
-
-            keyword_ids = []
-            for chunk, doc, distance in keyword_rows:
-                keyword_ids.append(chunk.id)
-                if chunk.id not in candidates:
-                    similarity = (1 - distance) if distance is not None else 0.0
-                    candidates[chunk.id] = self._chunk_dict(chunk, doc, similarity)
-
-            fused = rrf_fuse(vector_ids, keyword_ids)
-            chunks = [candidates[cid] for cid in fused[:limit]]
-
-            logger.info(
-                f"Retrieved {len(chunks)} chunks "
-                f"(dense: {len(vector_ids)} >= {min_similarity}, keyword: {len(keyword_ids)})"
-            )
-            return chunks
+                # Collect candidates; rank order within each list feeds RRF.
+                candidates: Dict[int, Dict[str, Any]] = {}
+                vector_ids = []
+                for row in vector_rows:
+                    vector_ids.append(row.id)
+                    candidates[row.id] = self._chunk_dict(row, 1 - row.distance)
+
+                keyword_ids = []
+                for row in keyword_rows:
+                    keyword_ids.append(row.id)
+                    if row.id not in candidates:
+                        similarity = (1 - row.distance) if row.distance is not None else 0.0
+                        candidates[row.id] = self._chunk_dict(row, similarity)
+
+                fused = rrf_fuse(vector_ids, keyword_ids)
+                chunks = [candidates[cid] for cid in fused[:limit]]
+
+                logger.info(
+                    f"Retrieved {len(chunks)} chunks "
+                    f"(dense: {len(vector_ids)} >= {min_similarity}, keyword: {len(keyword_ids)})"
+                )
+                # Keyword-only fallback results are degraded; don't keep them
+                if query_embedding is not None:
+                    self._results.put(cache_key, chunks)
+                    self._similar_results.insert(query_embedding, params, list(chunks))
+                return chunks
 
         except Exception as e:
             logger.error(f"Failed to retrieve context: {e}")
             return []
-        finally:
-            db.close()
 
     @staticmethod
-    def _chunk_dict(chunk: DocumentChunk, doc: Document, similarity: float) -> Dict[str, Any]:
-        """Result dict for one retrieved chunk."""
+    def _chunk_dict(row: Any, similarity: float) -> Dict[str, Any]:
+        """Result dict for one retrieved chunk row (see retrieve_context's columns)."""
         return {
-            "content": chunk.content,
-            "heading_path": chunk.heading_path,
-            "filename": doc.file_path,
-            "date": doc.date_extracted,
+            "content": row.content,
+            "heading_path": row.heading_path,
+            "filename": row.file_path,
+            "basename": row.file_path.rsplit("/", 1)[-1],
+            "date": row.date_extracted,
             "similarity": round(similarity, 3),
-            "start_line": chunk.start_line,
-            "chunk_type": chunk.chunk_type,
+            "start_line": row.start_line,
+            "chunk_type": row.chunk_type,
         }
 
+    def cache_stats(self) -> Dict[str, int]:
+        """Retrieval cache counters (hits, misses, evictions, size)."""
+        return self._results.stats()
+
     def format_as_context_block(self, chunks: List[Dict[str, Any]]) -> str:
         """Format retrieved chunks as a context block for system prompt.
 
@@ -224,21 +422,14 @@ class ContextRetriever:
                 lines.append(f"**Date:** {chunk['date']}")
 
             # Filename (make it more readable)
-            from pathlib import Path
-
-            filename = Path(chunk["filename"]).name
+            filename = chunk.get("basename") or Path(chunk["filename"]).name
             lines.append(f"**File:** {filename}")
 
             if chunk.get("heading_path"):
                 lines.append(f"**Context:** {chunk['heading_path']}")
 
-            lines.append("")
-
             # Content
-            lines.append(chunk["content"])
-            lines.append("")
-            lines.append("---")
-            lines.append("")
+            lines.extend(("", chunk["content"], "", "---", ""))
 
         return "\n".join(lines)
 
@@ -247,6 +438,9 @@ class ContextRetriever:
     ) -> str:
         """Convenience method: retrieve and format in one call.
 
+        Trivial messages (see is_trivial_query) get an empty block without
+        embedding or querying the database.
+
         Args:
             query: User's query text
             limit: Maximum number of chunks
@@ -255,6 +449,9 @@ class ContextRetriever:
         Returns:
             Formatted context block (empty string if no results)
         """
+        if is_trivial_query(query):
+            logger.debug("Skipped RAG for trivial query")
+            return ""
         chunks = self.retrieve_context(query, limit, min_similarity)
         return self.format_as_context_block(chunks)
 
@@ -269,9 +466,7 @@ class ContextRetriever:
         Returns:
             List of documents with their content, sorted by date (newest first)
         """
-        import os
         from datetime import datetime, timedelta
-        from pathlib import Path
 
         # Reuse find_note_files from embedding service
         from pkm_bridge.embeddings.embedding_service import find_note_files
@@ -285,49 +480,34 @@ class ContextRetriever:
             logger.warning("Neither ORG_DIR nor LOGSEQ_DIR found")
             return []
 
-        # Find all note files (respects .gitignore via ripgrep)
-        all_files = find_note_files(directories, logger=logger)
+        # Find all note files (respects .gitignore via ripgrep). Only journals
+        # are wanted, so filter by path before touching the filesystem. The
+        # Paths come from the cached manifest and memoize str(), whereas
+        # as_posix() would build a new string per file on every call.
+        all_files = find_note_files(directories, logger=logger, sort_by_mtime=False)
+        needle = f"{os.sep}journals{os.sep}"
+        candidates = [p for p in all_files if needle in str(p)]
 
         # Calculate cutoff date
         cutoff_date = datetime.now() - timedelta(days=days)
         cutoff_timestamp = cutoff_date.timestamp()
 
-        journals = []
-
-        # Filter for recent journal files only
-        for file_path in all_files:
-            # Check if this is a journal file (contains /journals/ in path)
-            if "/journals/" not in str(file_path):
-                continue
-
-            # Check if file is recent enough (by mtime)
-            if file_path.stat().st_mtime < cutoff_timestamp:
-                continue
-
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # Extract date from filename
-                # Org: YYYY-MM-DD.org
-                # Logseq: YYYY_MM_DD.md
-                if file_path.suffix == ".org":
-                    date_str = file_path.stem  # Already in YYYY-MM-DD format
-                    file_type = "org"
-                else:  # .md
-                    date_str = file_path.stem.replace("_", "-")  # Convert YYYY_MM_DD to YYYY-MM-DD
-                    file_type = "md"
-
-                journals.append(
-                    {
-                        "date": date_str,
-                        "file_path": str(file_path),
-                        "content": content,
-                        "file_type": file_type,
-                    }
-                )
-            except Exception as e:
-                logger.warning(f"Failed to read {file_path}: {e}")
+        # stat() and read() block on I/O, so overlap them across files. Files
+        # whose mtime matches the cached read are not read again.
+        with ThreadPoolExecutor(max_workers=JOURNAL_IO_WORKERS) as pool:
+            mtimes = pool.map(_mtime, candidates)
+            recent = {p: mtime for p, mtime in zip(candidates, mtimes) if mtime >= cutoff_timestamp}
+            with self._journal_cache_lock:
+                cached = {p: self._journal_cache.get(p) for p in recent}
+            stale = [p for p, mtime in recent.items() if not cached[p] or cached[p][0] != mtime]
+            for path, journal in zip(stale, pool.map(_read_journal, stale)):
+                cached[path] = (recent[path], journal) if journal is not None else None
+
+        entries = {p: entry for p, entry in cached.items() if entry is not None}
+        with self._journal_cache_lock:
+            # Replacing wholesale also drops journals that aged out or vanished
+            self._journal_cache = entries
+        journals = [entry[1] for entry in entries.values()]
 
         # Sort by date, newest first
         journals.sort(key=lambda x: x["date"], reverse=True)
@@ -347,8 +527,6 @@ class ContextRetriever:
         if not journals:
             return ""
 
-        from pathlib import Path
-
         lines = [
             "# RECENT JOURNAL ENTRIES",
             "",
@@ -364,11 +542,7 @@ class ContextRetriever:
 
             lines.append(f"## {date_str}")
             lines.append(f"**File:** {filename}")
-            lines.append("")
-            lines.append(journal["content"])
-            lines.append("")
-            lines.append("---")
-            lines.append("")
+            lines.extend(("", journal["content"], "", "---", ""))
 
         return "\n".join(lines)
 
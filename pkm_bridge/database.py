@@ -1,10 +1,16 @@
 """Database models and connection management."""
 
+import io
 import os
+import re
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator
 from urllib.parse import quote_plus
 
-from pgvector.sqlalchemy import Vector
+import numpy as np
+from pgvector.sqlalchemy import HALFVEC
 from sqlalchemy import (
     JSON,
     Boolean,
@@ -20,7 +26,7 @@ from sqlalchemy import (
     inspect,
     text,
 )
-from sqlalchemy.orm import Session, declarative_base, relationship, sessionmaker
+from sqlalchemy.orm import Session, declarative_base, deferred, relationship, sessionmaker
 from sqlalchemy.pool import QueuePool
 
 Base = declarative_base()
@@ -112,7 +118,8 @@ class ToolExecutionLog(Base):
     exit_code = Column(Integer, nullable=True)  # For shell commands
     execution_time_ms = Column(Integer, nullable=False)  # Duration in milliseconds
     was_helpful = Column(Boolean, nullable=True)  # Derived from satisfaction/correction signals
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # Indexed for the time-window reads (retrospective summaries, retention)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
 
     def __repr__(self):
         return (
@@ -124,6 +131,10 @@ class ToolExecutionLog(Base):
 # Database connection management
 _engine = None
 _SessionLocal = None
+_init_lock = threading.Lock()
+
+# user:password@ in a URL, for masking the password in logs
+_URL_PASSWORD_RE = re.compile(r"://([^:]+):([^@]+)@")
 
 
 def get_database_url() -> str:
@@ -160,8 +171,39 @@ def get_database_url() -> str:
     return database_url
 
 
+# Must match DocumentChunk.__table_args__
+_CREATE_VECTOR_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_embedding_hnsw ON document_chunks "
+    "USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)"
+)
+
+
+# Bump whenever _upgrade_schema gains a step, so existing databases run it
+# once; startups on an up-to-date database skip the catalog inspection.
+SCHEMA_VERSION = 1
+
+
+def _schema_is_current(engine) -> bool:
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS _schema_meta (version INTEGER PRIMARY KEY)"))
+        version = conn.execute(text("SELECT max(version) FROM _schema_meta")).scalar()
+    return version is not None and version >= SCHEMA_VERSION
+
+
+def _record_schema_version(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO _schema_meta (version) VALUES (:v) ON CONFLICT DO NOTHING"),
+            {"v": SCHEMA_VERSION},
+        )
+
+
 def _upgrade_schema(engine) -> None:
-    """Add missing columns to existing tables (lightweight migration)."""
+    """Add missing columns to existing tables (lightweight migration).
+
+    Every step must be idempotent: it runs on any database whose recorded
+    schema version is older than SCHEMA_VERSION.
+    """
     insp = inspect(engine)
 
     # ConversationSession: add cache token columns if missing
@@ -191,6 +233,17 @@ def _upgrade_schema(engine) -> None:
                     flush=True,
                 )
 
+    # Document: date index for ContextRetriever's `newer` filter, so a recent
+    # window selects its documents without scanning the whole table
+    if "documents" in insp.get_table_names():
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_documents_date_extracted "
+                    "ON documents (date_extracted)"
+                )
+            )
+
     # DocumentChunk: expression GIN index backing hybrid keyword search
     # (context_retriever). Queries must use the identical
     # to_tsvector('english', content) expression to hit this index.
@@ -202,6 +255,37 @@ def _upgrade_schema(engine) -> None:
                     "ON document_chunks USING gin (to_tsvector('english', content))"
                 )
             )
+            # Store embeddings as halfvec (half the size of vector). The ALTER
+            # would rebuild the old indexes with vector_cosine_ops, which
+            # doesn't accept halfvec, so both must be dropped first.
+            embedding_type = conn.execute(
+                text(
+                    "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+                    "WHERE attrelid = 'document_chunks'::regclass AND attname = 'embedding'"
+                )
+            ).scalar()
+            if embedding_type and embedding_type.startswith("vector"):
+                conn.execute(text("DROP INDEX IF EXISTS idx_embedding_cosine"))
+                conn.execute(text("DROP INDEX IF EXISTS idx_embedding_hnsw"))
+                conn.execute(
+                    text(
+                        "ALTER TABLE document_chunks ALTER COLUMN embedding "
+                        "TYPE halfvec(1024) USING embedding::halfvec(1024)"
+                    )
+                )
+                print("[DB] Converted document_chunks.embedding to halfvec(1024)", flush=True)
+            # Replace the original ivfflat vector index with HNSW
+            conn.execute(text(_CREATE_VECTOR_INDEX))
+            conn.execute(text("DROP INDEX IF EXISTS idx_embedding_cosine"))
+
+    # Partial indexes on hot filters (predicates match the repositories'
+    # .is_(True/False) filters). create_all only adds them to new tables.
+    for model in (QueryFeedback, LearnedRule, ScheduledTask):
+        if model.__tablename__ in insp.get_table_names():
+            with engine.begin() as conn:
+                for index in model.__table__.indexes:
+                    if index.dialect_options["postgresql"]["where"] is not None:
+                        index.create(conn, checkfirst=True)
 
     # ScheduledTask: add per-task model override if missing
     if "scheduled_tasks" in insp.get_table_names():
@@ -218,49 +302,137 @@ def _upgrade_schema(engine) -> None:
             with engine.begin() as conn:
                 conn.execute(text("ALTER TABLE tool_execution_logs ADD COLUMN was_helpful BOOLEAN"))
                 print("[DB] Added 'was_helpful' column to tool_execution_logs", flush=True)
+        indexes = {i["name"] for i in insp.get_indexes("tool_execution_logs")}
+        if "ix_tool_execution_logs_created_at" not in indexes:
+            with engine.begin() as conn:
+                conn.execute(
+                    text(
+                        "CREATE INDEX IF NOT EXISTS ix_tool_execution_logs_created_at "
+                        "ON tool_execution_logs (created_at)"
+                    )
+                )
 
 
 def init_db() -> None:
-    """Initialize database connection and create tables."""
+    """Initialize database connection and create tables.
+
+    Idempotent: once the engine exists, later calls return immediately, so
+    callers (e.g. MCP handlers) can call it per request without building a
+    new engine and re-running the schema checks each time.
+    """
+    if _engine is not None:
+        return
+    with _init_lock:
+        if _engine is None:
+            _init_db()
+
+
+def _init_db() -> None:
     global _engine, _SessionLocal
 
     database_url = get_database_url()
 
     # Debug: Log the database URL (mask password for security)
-    import re
-
-    masked_url = re.sub(r"://([^:]+):([^@]+)@", r"://\1:****@", database_url)
+    masked_url = _URL_PASSWORD_RE.sub(r"://\1:****@", database_url)
     print(f"[DEBUG] Connecting to database: {masked_url}", flush=True)
 
-    _engine = create_engine(
+    engine = create_engine(
         database_url,
         poolclass=QueuePool,
-        pool_size=5,
-        max_overflow=10,
-        pool_pre_ping=True,  # Verify connections before using
+        # Sized for waitress's worker threads plus the tool pool running
+        # concurrently; Postgres' default max_connections is 100.
+        pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("DB_POOL_OVERFLOW", "20")),
+        # Fail a request that can't get a connection instead of hanging it
+        pool_timeout=10,
+        # A pre-ping costs a round trip on every checkout. TCP keepalives plus
+        # recycling catch dead connections instead; after a server restart the
+        # first failed checkout invalidates the whole pool.
+        pool_pre_ping=os.getenv("DB_POOL_PRE_PING", "false").lower() in ("true", "1", "yes"),
+        pool_recycle=1800,  # Replace idle connections before server/proxy timeouts drop them
+        connect_args={"keepalives": 1, "keepalives_idle": 30, "keepalives_interval": 10},
         echo=False,  # Set to True for SQL debugging
     )
 
-    _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
-
     # Create all tables (new tables auto-created; existing tables need ALTER for new columns)
-    Base.metadata.create_all(bind=_engine)
+    Base.metadata.create_all(bind=engine)
 
     # Add any missing columns to existing tables
-    _upgrade_schema(_engine)
+    if not _schema_is_current(engine):
+        _upgrade_schema(engine)
+        _record_schema_version(engine)
+
+    # Checked on every startup, whatever the schema version: a bulk embedding
+    # run killed between drop_vector_index() and rebuild_vector_index() would
+    # otherwise leave every dense query on a sequential scan. A no-op when the
+    # index exists.
+    with engine.begin() as conn:
+        conn.execute(text(_CREATE_VECTOR_INDEX))
+
+    # Publish only once the schema is ready (init_db checks _engine unlocked)
+    _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    _engine = engine
 
 
 def get_db() -> Session:
-    """Get a database session. Use with context manager."""
+    """Get a new database session; the caller must close() it.
+
+    Prefer session_scope(), which also commits or rolls back. Sessions are
+    deliberately not thread-scoped: a streaming request hands work to other
+    threads, and each unit of work should return its connection promptly.
+    """
     if _SessionLocal is None:
         init_db()
+    return _SessionLocal()
+
 
-    db = _SessionLocal()
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Session for a unit of work: committed on success, rolled back on error."""
+    db = get_db()
     try:
-        return db
+        yield db
+        db.commit()
     except Exception:
-        db.close()
+        db.rollback()
         raise
+    finally:
+        db.close()
+
+
+def drop_vector_index() -> None:
+    """Drop the HNSW index on chunk embeddings ahead of a bulk backfill.
+
+    Every inserted row otherwise pays an HNSW graph insertion; building the
+    index once over the loaded table is far cheaper. Pair with
+    rebuild_vector_index(); if that never runs, the next startup (init_db)
+    recreates the index.
+    """
+    if _engine is None:
+        init_db()
+    with _engine.begin() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS idx_embedding_hnsw"))
+
+
+def rebuild_vector_index(maintenance_work_mem: str = "1GB", parallel_workers: int = 2) -> None:
+    """Recreate the HNSW index after a bulk backfill.
+
+    Args:
+        maintenance_work_mem: Build memory; the build is much faster when the
+            graph fits in it
+        parallel_workers: max_parallel_maintenance_workers for the build
+    """
+    if _engine is None:
+        init_db()
+    with _engine.begin() as conn:
+        conn.execute(
+            text(
+                "SELECT set_config('maintenance_work_mem', :mem, true), "
+                "set_config('max_parallel_maintenance_workers', :workers, true)"
+            ),
+            {"mem": maintenance_work_mem, "workers": str(parallel_workers)},
+        )
+        conn.execute(text(_CREATE_VECTOR_INDEX))
 
 
 def close_db() -> None:
@@ -280,14 +452,21 @@ class Document(Base):
     file_path = Column(String(1024), unique=True, nullable=False, index=True)
     file_type = Column(String(10), nullable=False)  # 'org' or 'md'
     file_hash = Column(String(64), nullable=False)  # SHA256 for change detection
-    date_extracted = Column(String(20), nullable=True)  # YYYY-MM-DD
+    date_extracted = Column(String(20), nullable=True, index=True)  # YYYY-MM-DD
     total_chunks = Column(Integer, nullable=False, default=0)
     last_embedded_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    chunks = relationship("DocumentChunk", back_populates="document", cascade="all, delete-orphan")
+    # passive_deletes: deleting a Document leaves its chunks to the FK's ON
+    # DELETE CASCADE instead of loading every chunk row to delete it singly
+    chunks = relationship(
+        "DocumentChunk",
+        back_populates="document",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     def __repr__(self):
         return f"<Document(file_path='{self.file_path}', chunks={self.total_chunks})>"
@@ -309,8 +488,9 @@ class DocumentChunk(Base):
     start_line = Column(Integer, nullable=True)  # Line number in original file
     token_count = Column(Integer, nullable=False)  # Approximate tokens
 
-    # pgvector embedding (voyage-3.5 uses 1024 dimensions)
-    embedding = Column(Vector(1024), nullable=True)
+    # pgvector embedding (voyage-3.5 uses 1024 dimensions), stored as fp16.
+    # Deferred: loading a chunk entity shouldn't pull 2 KB of vector with it.
+    embedding = deferred(Column(HALFVEC(1024), nullable=True))
 
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
@@ -323,18 +503,97 @@ class DocumentChunk(Base):
             f"chunk={self.chunk_index}, tokens={self.token_count})>"
         )
 
-    # Vector similarity search index
+    # Vector similarity search index (HNSW: good recall without ivfflat's
+    # list/probe tuning, and no need to rebuild as the corpus grows)
     __table_args__ = (
         Index(
-            "idx_embedding_cosine",
-            embedding,
-            postgresql_using="ivfflat",
-            postgresql_with={"lists": 100},
-            postgresql_ops={"embedding": "vector_cosine_ops"},
+            "idx_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "halfvec_cosine_ops"},
         ),
     )
 
 
+_CHUNK_COPY_COLUMNS = (
+    "document_id",
+    "chunk_index",
+    "chunk_type",
+    "heading_path",
+    "content",
+    "start_line",
+    "token_count",
+    "embedding",
+    "created_at",
+)
+# COPY text format: backslash escapes for the characters that delimit rows/fields
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+_format_half = "{:.5g}".format
+
+
+def halfvec_literal(values) -> str:
+    """Format an embedding as pgvector text input for a halfvec column.
+
+    Values are rounded to fp16 first and printed with 5 significant digits,
+    which round-trips fp16 exactly: the same stored vector as full-precision
+    text, at under half the size and formatting time.
+    """
+    return "[" + ",".join(map(_format_half, np.asarray(values, dtype=np.float16).tolist())) + "]"
+
+
+def _copy_field(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, str):
+        return value.translate(_COPY_ESCAPES)
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return halfvec_literal(value)
+
+
+def bulk_copy_chunks(db: Session, rows: Iterable[Dict[str, Any]]) -> int:
+    """Insert document chunks with a single COPY instead of per-row INSERTs.
+
+    Runs on the session's own connection, so the rows are part of its current
+    transaction (commit or roll back the session as usual). Pending ORM
+    changes are flushed first so the parent documents exist.
+
+    Args:
+        db: Database session
+        rows: Dicts keyed by DocumentChunk column name (document_id,
+            chunk_index, chunk_type, heading_path, content, start_line,
+            token_count, embedding; created_at defaults to now)
+
+    Returns:
+        Number of rows copied
+    """
+    db.flush()
+    now = datetime.utcnow()
+    buf = io.StringIO()
+    count = 0
+    for row in rows:
+        row = {"created_at": now, **row}
+        buf.write("\t".join(_copy_field(row.get(col)) for col in _CHUNK_COPY_COLUMNS))
+        buf.write("\n")
+        count += 1
+    if not count:
+        return 0
+    buf.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY document_chunks ({', '.join(_CHUNK_COPY_COLUMNS)}) FROM STDIN", buf
+        )
+    finally:
+        cursor.close()
+    return count
+
+
 class QueryFeedback(Base):
     """Capture per-query signals for the self-improvement retrospective."""
 
@@ -373,6 +632,11 @@ class QueryFeedback(Base):
 
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
+    # The retrospective polls the (small) unprocessed backlog oldest first
+    __table_args__ = (
+        Index("idx_qf_unprocessed", "created_at", postgresql_where=text("processed IS false")),
+    )
+
     def __repr__(self):
         return (
             f"<QueryFeedback(query_id='{self.query_id}', miss={self.retrieval_miss}, "
@@ -417,6 +681,11 @@ class LearnedRule(Base):
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Active rules are loaded, in this order, on every query
+    __table_args__ = (
+        Index("idx_rules_active", "confidence", "id", postgresql_where=text("is_active IS true")),
+    )
+
     def __repr__(self):
         return (
             f"<LearnedRule(type='{self.rule_type}', "
@@ -448,6 +717,11 @@ class ScheduledTask(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # The dispatcher looks up due enabled tasks on every tick
+    __table_args__ = (
+        Index("idx_sched_enabled_next", "next_run_at", postgresql_where=text("enabled IS true")),
+    )
+
     def __repr__(self):
         return (
             f"<ScheduledTask(name='{self.name}', "
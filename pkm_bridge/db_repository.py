@@ -3,6 +3,7 @@
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
+from sqlalchemy import func, insert, update
 from sqlalchemy.orm import Session
 
 from .database import (
@@ -150,6 +151,28 @@ class SessionRepository:
         db.refresh(session)
         return session
 
+    @staticmethod
+    def extend_history(db: Session, session_id: str, messages: List[Dict[str, Any]]) -> None:
+        """Append `messages` to the stored history under a row lock.
+
+        Unlike update_history this never overwrites turns written by another
+        worker or process since the caller loaded the session, so several
+        server processes can share one session table. Nothing is read back
+        after the commit; the history can be large.
+        """
+        session = (
+            db.query(ConversationSession).filter_by(session_id=session_id).with_for_update().first()
+        )
+        if not session:
+            db.rollback()
+            raise ValueError(f"Session {session_id} not found")
+
+        # Reassign rather than append in place so the JSON column is flagged dirty
+        session.history = list(session.history or []) + list(messages)
+        session.updated_at = datetime.utcnow()
+
+        db.commit()
+
     @staticmethod
     def delete_session(db: Session, session_id: str) -> bool:
         """Delete a conversation session."""
@@ -170,22 +193,38 @@ class SessionRepository:
         cost: float,
         cache_write_tokens: int = 0,
         cache_read_tokens: int = 0,
-    ) -> ConversationSession:
-        """Update session token and cost totals."""
-        session = SessionRepository.get_session(db, session_id)
-        if not session:
-            raise ValueError(f"Session {session_id} not found")
+    ) -> float:
+        """Add a turn's token counts and cost to the session totals.
 
-        session.total_input_tokens += input_tokens
-        session.total_output_tokens += output_tokens
-        session.total_cache_write_tokens += cache_write_tokens
-        session.total_cache_read_tokens += cache_read_tokens
-        session.total_cost += cost
-        session.updated_at = datetime.utcnow()
+        One UPDATE ... RETURNING: the additions happen in SQL, so concurrent
+        turns can't lose each other's counts, and the (potentially large)
+        history column is never loaded.
 
+        Returns:
+            The session's new total cost
+        """
+        total_cost = db.execute(
+            update(ConversationSession)
+            .where(ConversationSession.session_id == session_id)
+            .values(
+                total_input_tokens=ConversationSession.total_input_tokens + input_tokens,
+                total_output_tokens=ConversationSession.total_output_tokens + output_tokens,
+                total_cache_write_tokens=(
+                    ConversationSession.total_cache_write_tokens + cache_write_tokens
+                ),
+                total_cache_read_tokens=(
+                    ConversationSession.total_cache_read_tokens + cache_read_tokens
+                ),
+                total_cost=ConversationSession.total_cost + cost,
+                updated_at=datetime.utcnow(),
+            )
+            .returning(ConversationSession.total_cost)
+        ).scalar()
+        if total_cost is None:
+            db.rollback()
+            raise ValueError(f"Session {session_id} not found")
         db.commit()
-        db.refresh(session)
-        return session
+        return total_cost
 
     @staticmethod
     def get_all_sessions(db: Session, user_id: str = "default") -> List[ConversationSession]:
@@ -304,6 +343,22 @@ class ToolExecutionLogRepository:
         db.refresh(log)
         return log
 
+    @staticmethod
+    def create_logs(db: Session, rows: List[Dict[str, Any]]) -> None:
+        """Insert many log entries with one multi-row INSERT.
+
+        Bypasses the ORM unit of work; used by the batched log writer
+        (pkm_bridge.log_writer).
+
+        Args:
+            db: Database session
+            rows: Dicts of ToolExecutionLog column values, as for create_log
+        """
+        if not rows:
+            return
+        db.execute(insert(ToolExecutionLog), rows)
+        db.commit()
+
     @staticmethod
     def get_logs_for_session(
         db: Session, session_id: str, limit: int = 100
@@ -541,6 +596,37 @@ class LearnedRuleRepository:
             return True
         return False
 
+    @staticmethod
+    def reinforce(db: Session, rule_id: int, **values: Any) -> Optional[float]:
+        """Count another hit on a rule, raise its confidence and reactivate it.
+
+        One UPDATE ... RETURNING: the increments happen in SQL, so concurrent
+        reinforcements can't lose each other's hits.
+
+        Args:
+            db: Database session
+            rule_id: Rule to reinforce
+            **values: Other columns to set in the same UPDATE
+
+        Returns:
+            The rule's new confidence, or None if it doesn't exist
+        """
+        confidence = db.execute(
+            update(LearnedRule)
+            .where(LearnedRule.id == rule_id)
+            .values(
+                hit_count=LearnedRule.hit_count + 1,
+                confidence=func.least(1.0, LearnedRule.confidence + 0.1),
+                last_reinforced_at=datetime.utcnow(),
+                is_active=True,  # reactivate if it was decayed
+                **values,
+            )
+            .returning(LearnedRule.confidence)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        db.commit()
+        return confidence
+
     @staticmethod
     def merge_or_create(
         db: Session,
@@ -565,16 +651,12 @@ class LearnedRuleRepository:
         )
 
         if existing:
-            existing.hit_count += 1
-            existing.confidence = min(1.0, existing.confidence + 0.1)
-            existing.last_reinforced_at = datetime.utcnow()
-            existing.is_active = True  # reactivate if it was decayed
+            values: Dict[str, Any] = {}
             if source_query_ids:
-                existing_ids = existing.source_query_ids or []
-                existing.source_query_ids = existing_ids + source_query_ids
+                values["source_query_ids"] = (existing.source_query_ids or []) + source_query_ids
             if rule_data:
-                existing.rule_data = rule_data
-            db.commit()
+                values["rule_data"] = rule_data
+            LearnedRuleRepository.reinforce(db, existing.id, **values)
             db.refresh(existing)
             return existing
 
@@ -1,7 +1,10 @@
 """Background embedding service for periodic note embedding."""
 
 import hashlib
+import subprocess
 import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -10,7 +13,7 @@ from typing import Optional
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from config.settings import Config
-from pkm_bridge.database import Document, DocumentChunk, get_db
+from pkm_bridge.database import Document, DocumentChunk, bulk_copy_chunks, get_db
 from pkm_bridge.embeddings.chunker import NoteChunker
 from pkm_bridge.embeddings.voyage_client import VoyageClient
 
@@ -237,19 +240,23 @@ def embed_document(
             db.add(doc)
             db.flush()  # Get ID
 
-        # Insert chunks
-        for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            chunk_obj = DocumentChunk(
-                document_id=doc.id,
-                chunk_index=idx,
-                chunk_type=chunk.chunk_type,
-                heading_path=chunk.heading_path,
-                content=chunk.content,
-                start_line=chunk.start_line,
-                token_count=chunk.token_count,
-                embedding=embedding,
-            )
-            db.add(chunk_obj)
+        # Insert chunks (a single COPY rather than one INSERT per chunk)
+        bulk_copy_chunks(
+            db,
+            (
+                {
+                    "document_id": doc.id,
+                    "chunk_index": idx,
+                    "chunk_type": chunk.chunk_type,
+                    "heading_path": chunk.heading_path,
+                    "content": chunk.content,
+                    "start_line": chunk.start_line,
+                    "token_count": chunk.token_count,
+                    "embedding": embedding,
+                }
+                for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings))
+            ),
+        )
 
         doc.total_chunks = len(chunks)
         doc.last_embedded_at = datetime.utcnow()
@@ -265,20 +272,101 @@ def embed_document(
         return False
 
 
-def find_note_files(directories: list[Path], logger=None) -> list[Path]:
+# Per-directory `rg --files` results, so hot paths (recent-journal context on
+# every query) don't re-walk the whole tree. Each entry is invalidated when the
+# mtime of the root or any directory holding a listed file changes, i.e. when a
+# note is created, deleted or renamed. Entries also expire after a while to catch
+# notes appearing in previously note-free subdirectories.
+_MANIFEST_MAX_AGE = 300  # seconds
+_manifest_lock = threading.Lock()
+_manifest: dict[Path, tuple[float, dict[Path, int], list[Path]]] = {}
+
+
+def _dir_mtimes(dirs) -> dict[Path, int]:
+    """Snapshot st_mtime_ns for each directory (missing dirs map to -1)."""
+    mtimes = {}
+    for d in dirs:
+        try:
+            mtimes[d] = d.stat().st_mtime_ns
+        except OSError:
+            mtimes[d] = -1
+    return mtimes
+
+
+def _manifest_is_fresh(entry: tuple[float, dict[Path, int], list[Path]]) -> bool:
+    built_at, mtimes, _files = entry
+    if time.monotonic() - built_at > _MANIFEST_MAX_AGE:
+        return False
+    return _dir_mtimes(mtimes) == mtimes
+
+
+def invalidate_note_manifest() -> int:
+    """Drop all cached file manifests.
+
+    Returns:
+        Number of directory manifests dropped
+    """
+    with _manifest_lock:
+        count = len(_manifest)
+        _manifest.clear()
+    return count
+
+
+def _list_note_files(directory: Path, log) -> list[Path]:
+    """List note files under one directory, served from the manifest when fresh."""
+    with _manifest_lock:
+        entry = _manifest.get(directory)
+    if entry is not None and _manifest_is_fresh(entry):
+        return entry[2]
+
+    cmd = ["rg", "--files", "--type-add", "notes:*.{org,md}", "--type", "notes", str(directory)]
+    files: list[Path] = []
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+
+        if result.returncode == 0:
+            for line in result.stdout.strip().split("\n"):
+                if line:
+                    files.append(Path(line))
+        else:
+            log(f"⚠️  ripgrep returned code {result.returncode} for {directory}")
+            return files
+
+    except subprocess.TimeoutExpired:
+        log(f"⚠️  Timeout searching {directory}")
+        return files
+    except FileNotFoundError:
+        log("⚠️  ripgrep not found. Please install ripgrep (rg)")
+        # Fallback to glob (less reliable, not cached)
+        for pattern in ["**/*.org", "**/*.md"]:
+            files.extend(directory.glob(pattern))
+        return files
+
+    watched = {directory, *(f.parent for f in files)}
+    with _manifest_lock:
+        _manifest[directory] = (time.monotonic(), _dir_mtimes(watched), files)
+    return files
+
+
+def find_note_files(directories: list[Path], logger=None, sort_by_mtime: bool = True) -> list[Path]:
     """Find all .org and .md files in directories using ripgrep.
 
     Uses ripgrep to find files, which automatically respects .gitignore
     and filters out backup directories, internal config, sync files, etc.
+    The file list per directory is cached (see `_manifest`); only the mtime
+    sort touches every file.
 
     Args:
         directories: List of directories to search
         logger: Optional logger
+        sort_by_mtime: Sort newest first (stats every file); pass False when
+            the caller filters the list first
 
     Returns:
-        List of file paths sorted by modification time (newest first)
+        List of file paths, sorted by modification time (newest first) if
+        sort_by_mtime
     """
-    import subprocess
 
     def log(msg):
         if logger:
@@ -293,25 +381,10 @@ def find_note_files(directories: list[Path], logger=None) -> list[Path]:
             log(f"⚠️  Directory not found: {directory}")
             continue
 
-        cmd = ["rg", "--files", "--type-add", "notes:*.{org,md}", "--type", "notes", str(directory)]
+        files.extend(_list_note_files(directory, log))
 
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-            if result.returncode == 0:
-                for line in result.stdout.strip().split("\n"):
-                    if line:
-                        files.append(Path(line))
-            else:
-                log(f"⚠️  ripgrep returned code {result.returncode} for {directory}")
-
-        except subprocess.TimeoutExpired:
-            log(f"⚠️  Timeout searching {directory}")
-        except FileNotFoundError:
-            log("⚠️  ripgrep not found. Please install ripgrep (rg)")
-            # Fallback to glob (less reliable)
-            for pattern in ["**/*.org", "**/*.md"]:
-                files.extend(directory.glob(pattern))
+    if not sort_by_mtime:
+        return files
 
     # Sort by modification time (newest first)
     return sorted(files, key=lambda f: f.stat().st_mtime, reverse=True)
@@ -471,18 +544,22 @@ def embed_gmail_messages(
                     db.add(doc)
                     db.flush()
 
-                for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-                    chunk_obj = DocumentChunk(
-                        document_id=doc.id,
-                        chunk_index=idx,
-                        chunk_type=chunk.chunk_type,
-                        heading_path=chunk.heading_path,
-                        content=chunk.content,
-                        start_line=chunk.start_line,
-                        token_count=chunk.token_count,
-                        embedding=embedding,
-                    )
-                    db.add(chunk_obj)
+                bulk_copy_chunks(
+                    db,
+                    (
+                        {
+                            "document_id": doc.id,
+                            "chunk_index": idx,
+                            "chunk_type": chunk.chunk_type,
+                            "heading_path": chunk.heading_path,
+                            "content": chunk.content,
+                            "start_line": chunk.start_line,
+                            "token_count": chunk.token_count,
+                            "embedding": embedding,
+                        }
+                        for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings))
+                    ),
+                )
 
                 doc.total_chunks = len(chunks)
                 doc.last_embedded_at = datetime.utcnow()
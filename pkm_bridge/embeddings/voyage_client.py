@@ -5,12 +5,25 @@ retries, and cost tracking.
 """
 
 import logging
+import queue
+import threading
 import time
-from dataclasses import dataclass
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Concurrent embed_single_batched() calls arriving within this window share
+# one API request.
+BATCH_WINDOW = 0.01  # seconds
+BATCH_MAX_TEXTS = 32
+# Batches are embedded on a small pool, so one slow or retrying API call
+# doesn't hold up the batches behind it
+BATCH_WORKERS = 4
+# Longest a caller waits for its batch (covers embed()'s retries and backoff)
+BATCH_WAIT_TIMEOUT = 120.0
+
 
 @dataclass
 class EmbeddingResult:
@@ -21,6 +34,17 @@ class EmbeddingResult:
     cost: float  # USD
 
 
+@dataclass
+class _PendingEmbed:
+    """One caller waiting on the batching thread."""
+
+    text: str
+    input_type: str
+    done: threading.Event = field(default_factory=threading.Event)
+    embedding: Optional[List[float]] = None
+    error: Optional[BaseException] = None
+
+
 class VoyageClient:
     """Wrapper for Voyage AI API with batching and error handling."""
 
@@ -47,6 +71,13 @@ class VoyageClient:
                 "voyageai package not installed. " "Install with: pip install voyageai"
             )
 
+        self._pending: "queue.Queue[_PendingEmbed]" = queue.Queue()
+        self._batcher: Optional[threading.Thread] = None
+        self._batcher_lock = threading.Lock()
+        self._batch_pool = ThreadPoolExecutor(
+            max_workers=BATCH_WORKERS, thread_name_prefix="voyage-embed"
+        )
+
     def embed(
         self,
         texts: List[str],
@@ -116,3 +147,73 @@ class VoyageClient:
         """
         result = self.embed([text], input_type=input_type)
         return result.embeddings[0]
+
+    def embed_single_batched(self, text: str, input_type: str = "query") -> List[float]:
+        """Embed a single text, sharing an API call with concurrent callers.
+
+        Requests made within BATCH_WINDOW of each other are sent together by a
+        background thread, so simultaneous queries cost one round trip.
+
+        Args:
+            text: Text to embed
+            input_type: "document" or "query"
+
+        Returns:
+            Embedding vector
+
+        Raises:
+            TimeoutError: If the batch hasn't finished within BATCH_WAIT_TIMEOUT
+        """
+        with self._batcher_lock:
+            if self._batcher is None or not self._batcher.is_alive():
+                self._batcher = threading.Thread(
+                    target=self._run_batcher, name="voyage-batcher", daemon=True
+                )
+                self._batcher.start()
+
+        item = _PendingEmbed(text, input_type)
+        self._pending.put(item)
+        if not item.done.wait(BATCH_WAIT_TIMEOUT):
+            raise TimeoutError(f"Embedding not returned within {BATCH_WAIT_TIMEOUT:.0f}s")
+        if item.error is not None:
+            raise item.error
+        if item.embedding is None:
+            raise RuntimeError("Embedding batch ended without a result")
+        return item.embedding
+
+    def _run_batcher(self) -> None:
+        """Collect pending requests for up to BATCH_WINDOW and hand them to the pool."""
+        while True:
+            batch = [self._pending.get()]
+            deadline = time.monotonic() + BATCH_WINDOW
+            while len(batch) < BATCH_MAX_TEXTS:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            by_type: dict[str, List[_PendingEmbed]] = {}
+            for item in batch:
+                by_type.setdefault(item.input_type, []).append(item)
+            for input_type, items in by_type.items():
+                self._batch_pool.submit(self._embed_pending, items, input_type)
+
+    def _embed_pending(self, items: List[_PendingEmbed], input_type: str) -> None:
+        """Embed one batch and wake its callers."""
+        try:
+            result = self.embed([item.text for item in items], input_type=input_type)
+            if len(result.embeddings) != len(items):
+                raise ValueError(
+                    f"Voyage returned {len(result.embeddings)} embeddings for {len(items)} texts"
+                )
+            for item, embedding in zip(items, result.embeddings):
+                item.embedding = embedding
+        except Exception as e:
+            for item in items:
+                item.error = e
+        finally:
+            for item in items:
+                item.done.set()
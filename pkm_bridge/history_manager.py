@@ -23,8 +23,11 @@ Future Enhancement:
 """
 
 import json
+import logging
 from typing import Any, Dict, List
 
+logger = logging.getLogger(__name__)
+
 # Configuration constants for tool result filtering
 MIN_AGE_FOR_FILTERING = 5  # Filter tool results older than this many turns
 MIN_TOKENS_FOR_FILTERING = 10000  # Only filter tool results larger than this
@@ -218,7 +221,7 @@ class HistoryManager:
             return history
 
         # Estimate current size
-        total_tokens = sum(self.estimate_message_tokens(msg) for msg in history)
+        original_tokens = total_tokens = sum(self.estimate_message_tokens(msg) for msg in history)
 
         # If under budget, return as-is (no filtering needed)
         if total_tokens <= self.max_tokens:
@@ -303,14 +306,13 @@ class HistoryManager:
 
         new_history = filtered_history
 
-        # Log truncation
+        # Log truncation (both totals are already tracked above; re-estimating
+        # every message just for this line doubled the cost of truncation)
         if len(new_history) < len(history):
             removed_count = len(history) - len(new_history)
-            original_tokens = sum(self.estimate_message_tokens(msg) for msg in history)
-            new_tokens = sum(self.estimate_message_tokens(msg) for msg in new_history)
-            print(
+            logger.info(
                 f"[HISTORY] Truncated {removed_count} messages: "
-                f"{original_tokens} → {new_tokens} tokens"
+                f"{original_tokens} → {total_tokens} tokens"
             )
 
         return new_history
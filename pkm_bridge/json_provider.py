@@ -0,0 +1,54 @@
+"""orjson-backed JSON encoding for Flask responses and NDJSON streams."""
+
+from typing import Any
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+# Datetimes are passed through to the `default` hook so jsonify keeps Flask's
+# RFC 822 format; non-str dict keys are stringified like json.dumps does.
+_BASE_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj: Any, *, default=None, sort_keys: bool = False, indent: bool = False) -> str:
+    """Serialize to a JSON string with orjson.
+
+    Args:
+        obj: Object to serialize
+        default: Optional hook for types orjson can't serialize natively
+        sort_keys: Sort dict keys
+        indent: Pretty-print with 2-space indentation
+
+    Returns:
+        JSON text (UTF-8, non-ASCII characters are not escaped)
+    """
+    option = _BASE_OPTIONS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, default=default, option=option).decode()
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Drop-in replacement for Flask's json provider using orjson.
+
+    Keeps DefaultJSONProvider's behaviour (sorted keys, datetime/UUID/dataclass
+    handling, debug pretty-printing); only the encoder and decoder change.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        indent = kwargs.pop("indent", None)
+        kwargs.pop("separators", None)  # orjson output is always compact
+        sort_keys = kwargs.pop("sort_keys", self.sort_keys)
+        default = kwargs.pop("default", self.default)
+        kwargs.pop("ensure_ascii", None)
+        if kwargs or indent not in (None, 2):
+            # Exotic json.dumps arguments: let the stdlib handle them.
+            return super().dumps(obj, indent=indent, sort_keys=sort_keys, **kwargs)
+        return dumps(obj, default=default, sort_keys=sort_keys, indent=indent is not None)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
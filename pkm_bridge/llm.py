@@ -10,17 +10,32 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
 from dataclasses import asdict, dataclass, field
+from functools import cache
 from typing import Any
 
-import litellm
-
 from pkm_bridge.models import is_anthropic, supports_caching, supports_tools
 
 logger = logging.getLogger(__name__)
 
-# Suppress LiteLLM's verbose default logging
-litellm.suppress_debug_info = True
+# Default cap on concurrent in-flight LLM calls per LLMClient
+DEFAULT_LLM_MAX_CONCURRENCY = 8
+
+
+@cache
+def _litellm():
+    """Import LiteLLM on first use.
+
+    It takes a second or more to import and is only needed for non-Anthropic
+    models, so Claude-only deployments (and anything that just imports this
+    module) never pay for it.
+    """
+    import litellm
+
+    # Suppress LiteLLM's verbose default logging
+    litellm.suppress_debug_info = True
+    return litellm
 
 
 # ---------------------------------------------------------------------------
@@ -161,6 +176,40 @@ def _sanitize_for_anthropic(messages: list[dict]) -> list[dict]:
     return cleaned
 
 
+def response_text(content: list) -> str:
+    """Concatenate the text blocks of a response's content.
+
+    Joined in one pass rather than built up with += per block.
+    """
+    return "".join(block.text for block in content if getattr(block, "type", "") == "text")
+
+
+def _anthropic_params(
+    *,
+    model: str,
+    messages: list[dict],
+    system: str | list | None,
+    tools: list[dict] | None,
+    max_tokens: int,
+    thinking: dict | None,
+) -> dict[str, Any]:
+    """Build Messages API parameters (shared by create and stream)."""
+    params: dict[str, Any] = {
+        "model": model,
+        "max_tokens": max_tokens,
+        # Strip `reasoning` blocks left behind by prior non-Anthropic turns;
+        # Anthropic's API rejects unknown block types.
+        "messages": _sanitize_for_anthropic(messages),
+    }
+    if system is not None:
+        params["system"] = system
+    if tools:
+        params["tools"] = tools
+    if thinking:
+        params["thinking"] = thinking
+    return params
+
+
 def _web_search_result_preview(content: Any) -> tuple[bool, str]:
     """Summarize a web_search_tool_result's content for the UI.
 
@@ -428,6 +477,11 @@ class LLMClient:
     def __init__(self, anthropic_client: Any, config: Any | None = None):
         self.anthropic_client = anthropic_client
         self.config = config
+        # Requests are served on a thread pool and the scheduler / agents share
+        # this client, so bound in-flight LLM calls to stay under provider rate
+        # limits instead of fanning out and eating 429 retries.
+        max_calls = getattr(config, "llm_max_concurrency", DEFAULT_LLM_MAX_CONCURRENCY)
+        self._call_slots = threading.BoundedSemaphore(max(1, int(max_calls)))
 
     def complete(
         self,
@@ -449,6 +503,28 @@ class LLMClient:
         Returns an object with .content, .stop_reason, .usage matching
         the Anthropic SDK response format.
         """
+        with self._call_slots:
+            return self._complete(
+                model=model,
+                messages=messages,
+                system=system,
+                tools=tools,
+                max_tokens=max_tokens,
+                thinking=thinking,
+                extra_headers=extra_headers,
+            )
+
+    def _complete(
+        self,
+        *,
+        model: str,
+        messages: list[dict],
+        system: str | list | None,
+        tools: list[dict] | None,
+        max_tokens: int,
+        thinking: dict | None,
+        extra_headers: dict | None,
+    ) -> Any:
         if is_anthropic(model):
             return self._complete_anthropic(
                 model=model,
@@ -480,21 +556,16 @@ class LLMClient:
         extra_headers: dict | None,
     ) -> Any:
         """Direct Anthropic SDK call — zero translation overhead."""
-        params: dict[str, Any] = {
-            "model": model,
-            "max_tokens": max_tokens,
-            # Strip `reasoning` blocks left behind by prior non-Anthropic turns;
-            # Anthropic's API rejects unknown block types.
-            "messages": _sanitize_for_anthropic(messages),
-        }
-        if system is not None:
-            params["system"] = system
-        if tools:
-            params["tools"] = tools
+        params = _anthropic_params(
+            model=model,
+            messages=messages,
+            system=system,
+            tools=tools,
+            max_tokens=max_tokens,
+            thinking=thinking,
+        )
         if extra_headers:
             params["extra_headers"] = extra_headers
-        if thinking:
-            params["thinking"] = thinking
 
         return self.anthropic_client.messages.create(**params)
 
@@ -537,7 +608,7 @@ class LLMClient:
             logger.info(f"Model {model} may not support tools — skipping tool params")
 
         logger.info(f"LiteLLM call to {model} (max_tokens={capped_max_tokens})")
-        response = litellm.completion(**params)
+        response = _litellm().completion(**params)
         return _openai_response_to_llm_response(response)
 
     def complete_stream(
@@ -560,7 +631,33 @@ class LLMClient:
         Returns the fully-assembled response object via StopIteration.value
         (use `response = yield from llm_client.complete_stream(...)` from
         another generator to capture it).
+
+        Holds one of the client's concurrency slots until the stream finishes
+        (or the generator is closed).
         """
+        with self._call_slots:
+            response = yield from self._stream(
+                model=model,
+                messages=messages,
+                system=system,
+                tools=tools,
+                max_tokens=max_tokens,
+                thinking=thinking,
+                extra_headers=extra_headers,
+            )
+        return response
+
+    def _stream(
+        self,
+        *,
+        model: str,
+        messages: list[dict],
+        system: str | list | None,
+        tools: list[dict] | None,
+        max_tokens: int,
+        thinking: dict | None,
+        extra_headers: dict | None,
+    ):
         if is_anthropic(model):
             response = yield from self._stream_anthropic(
                 model=model,
@@ -625,7 +722,7 @@ class LLMClient:
         chunks_collected: list[Any] = []
         model_name = ""
 
-        for chunk in litellm.completion(**params):
+        for chunk in _litellm().completion(**params):
             chunks_collected.append(chunk)
             if not model_name:
                 model_name = getattr(chunk, "model", "") or model_name
@@ -704,7 +801,7 @@ class LLMClient:
         # can read it. stream_chunk_builder is the official helper for this.
         rebuilt: Any = None
         try:
-            rebuilt = litellm.stream_chunk_builder(chunks_collected, messages=openai_messages)
+            rebuilt = _litellm().stream_chunk_builder(chunks_collected, messages=openai_messages)
         except Exception as e:
             logger.debug(f"stream_chunk_builder failed (non-fatal): {e}")
 
@@ -729,19 +826,16 @@ class LLMClient:
     ):
         """Stream from the Anthropic SDK. Yields deltas; returns the final
         Anthropic Message object (same shape as non-streaming complete())."""
-        params: dict[str, Any] = {
-            "model": model,
-            "max_tokens": max_tokens,
-            "messages": _sanitize_for_anthropic(messages),
-        }
-        if system is not None:
-            params["system"] = system
-        if tools:
-            params["tools"] = tools
+        params = _anthropic_params(
+            model=model,
+            messages=messages,
+            system=system,
+            tools=tools,
+            max_tokens=max_tokens,
+            thinking=thinking,
+        )
         if extra_headers:
             params["extra_headers"] = extra_headers
-        if thinking:
-            params["thinking"] = thinking
 
         with self.anthropic_client.messages.stream(**params) as stream:
             for event in stream:
@@ -797,7 +891,7 @@ class LLMClient:
         """
         if isinstance(response, LLMResponse) and response._raw_response:
             try:
-                return litellm.completion_cost(completion_response=response._raw_response)
+                return _litellm().completion_cost(completion_response=response._raw_response)
             except Exception:
                 return None
         return None
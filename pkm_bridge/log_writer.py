@@ -0,0 +1,105 @@
+"""Batched background writes of ToolExecutionLog rows.
+
+Every tool call and every finished query records a ToolExecutionLog row.
+Written inline, each one costs the streaming request a pool checkout, an
+INSERT and a commit. Instead rows are queued and a daemon thread writes them
+with one multi-row INSERT per batch, so logging stays off the request path.
+Nothing reads a query's logs back while it is running (helpfulness marks are
+applied on a later turn), so a short delay is harmless.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# A batch is written when it reaches FLUSH_MAX_ROWS rows or FLUSH_INTERVAL
+# seconds after its first row, whichever comes first
+FLUSH_INTERVAL = 0.5
+FLUSH_MAX_ROWS = 100
+
+
+def _write_tool_logs(rows: List[Dict[str, Any]]) -> None:
+    from pkm_bridge.database import session_scope
+    from pkm_bridge.db_repository import ToolExecutionLogRepository
+
+    with session_scope() as db:
+        ToolExecutionLogRepository.create_logs(db, rows)
+
+
+class BatchedLogWriter:
+    """Queue of log rows drained in batches by a daemon thread.
+
+    The thread starts on the first submit, and pending rows are flushed at
+    interpreter exit. Write failures are logged and the batch is dropped:
+    losing a log row must never fail a query.
+    """
+
+    def __init__(
+        self,
+        sink: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        flush_interval: float = FLUSH_INTERVAL,
+        max_rows: int = FLUSH_MAX_ROWS,
+    ):
+        """Initialize the writer.
+
+        Args:
+            sink: Called with each batch of rows (defaults to a multi-row
+                ToolExecutionLog INSERT)
+            flush_interval: Longest a row waits for others to batch with
+            max_rows: Largest batch written at once
+        """
+        self._sink = sink or _write_tool_logs
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, **fields: Any) -> None:
+        """Queue one row (ToolExecutionLog column values) for writing.
+
+        created_at is stamped now, not when the batch is written.
+        """
+        fields.setdefault("created_at", datetime.utcnow())
+        self._queue.put(fields)
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="log-writer", daemon=True
+                    )
+                    self._thread.start()
+                    atexit.register(self.flush)
+
+    def flush(self) -> None:
+        """Block until every row submitted so far has been written."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._sink(batch)
+            except Exception as e:
+                logger.warning(f"Failed to write {len(batch)} tool log rows: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+tool_log_writer = BatchedLogWriter()
@@ -0,0 +1,128 @@
+"""Approximate (near-duplicate) cache of ContextRetriever results.
+
+RetrievalCache only catches a question asked again with the same wording.
+Rephrasings ("what did I note about X" / "notes re X") embed to nearly the
+same vector and retrieve the same chunks, so this cache matches on the query
+embedding instead. Candidates are found with random-hyperplane LSH (a few
+bucket probes rather than a scan of every cached query) and then confirmed
+with an exact cosine check, so only genuinely close queries hit.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+LSH_CACHE_TTL = 300.0
+LSH_CACHE_MAX = 512
+# Cosine similarity two query embeddings need to share a result
+LSH_MATCH_THRESHOLD = 0.95
+
+# (expires, params, unit query vector, bucket codes, result)
+_Entry = Tuple[float, Hashable, np.ndarray, Tuple[int, ...], Any]
+
+
+class LSHSemanticCache:
+    """Query embedding → retrieved chunks, matched by cosine similarity.
+
+    Each of n_tables hash tables buckets an embedding by the signs of n_bits
+    random projections; a lookup probes one bucket per table. Entries also
+    carry an exact-match `params` key (limit, threshold, filters) since those
+    change the result. Thread-safe; LRU eviction plus a TTL.
+    """
+
+    def __init__(
+        self,
+        dim: int = 1024,
+        n_tables: int = 8,
+        n_bits: int = 12,
+        ttl: float = LSH_CACHE_TTL,
+        maxsize: int = LSH_CACHE_MAX,
+        seed: int = 0,
+    ):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        rng = np.random.default_rng(seed)
+        # All tables' hyperplanes in one matrix: one matvec hashes every table
+        self._planes = rng.standard_normal((n_tables * n_bits, dim)).astype(np.float32)
+        self._n_tables = n_tables
+        self._weights = 1 << np.arange(n_bits, dtype=np.int64)
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _codes(self, unit: np.ndarray) -> Tuple[int, ...]:
+        bits = (self._planes @ unit > 0).reshape(self._n_tables, -1)
+        return tuple(int(c) for c in bits @ self._weights)
+
+    @staticmethod
+    def _unit(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else None
+
+    def lookup(
+        self, embedding: Sequence[float], params: Hashable, threshold: float = LSH_MATCH_THRESHOLD
+    ) -> Optional[Any]:
+        """Return the result cached for the closest matching query, if any.
+
+        Args:
+            embedding: Query embedding
+            params: Other inputs the result depends on; must match exactly
+            threshold: Minimum cosine similarity to the cached query
+
+        Returns:
+            The cached result, or None on a miss
+        """
+        unit = self._unit(embedding)
+        if unit is None:
+            return None
+        codes = self._codes(unit)
+        now = time.monotonic()
+        with self._lock:
+            ids = {
+                eid
+                for table, code in enumerate(codes)
+                for eid in self._buckets.get((table, code), ())
+            }
+            ids = [
+                eid
+                for eid in ids
+                if self._entries[eid][1] == params and self._entries[eid][0] > now
+            ]
+            if not ids:
+                return None
+            # Verify all candidates with a single matvec
+            sims = np.stack([self._entries[eid][2] for eid in ids]) @ unit
+            best = int(np.argmax(sims))
+            if sims[best] < threshold:
+                return None
+            eid = ids[best]
+            self._entries.move_to_end(eid)
+            return self._entries[eid][4]
+
+    def insert(self, embedding: Sequence[float], params: Hashable, result: Any) -> None:
+        """Cache a result under its query embedding."""
+        unit = self._unit(embedding)
+        if unit is None:
+            return
+        codes = self._codes(unit)
+        with self._lock:
+            eid = self._next_id
+            self._next_id += 1
+            self._entries[eid] = (time.monotonic() + self.ttl, params, unit, codes, result)
+            for table, code in enumerate(codes):
+                self._buckets.setdefault((table, code), []).append(eid)
+            while len(self._entries) > self.maxsize:
+                self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        eid, (_, _, _, codes, _) = self._entries.popitem(last=False)
+        for table, code in enumerate(codes):
+            bucket = self._buckets[(table, code)]
+            bucket.remove(eid)
+            if not bucket:
+                del self._buckets[(table, code)]
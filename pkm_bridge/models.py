@@ -6,6 +6,7 @@ an available models catalog for the frontend, and capability detection.
 
 import os
 from datetime import date, datetime, timezone
+from functools import lru_cache
 from typing import Any
 
 # ---------------------------------------------------------------------------
@@ -174,11 +175,13 @@ def web_search_tool(model: str) -> dict[str, Any] | None:
         tool_type = "web_search_20260209"
     else:
         tool_type = "web_search_20250305"
-    return {
-        "type": tool_type,
-        "name": "web_search",
-        "max_uses": int(os.getenv("WEB_SEARCH_MAX_USES", "5")),
-    }
+    return _web_search_definition(tool_type, int(os.getenv("WEB_SEARCH_MAX_USES", "5")))
+
+
+@lru_cache(maxsize=None)
+def _web_search_definition(tool_type: str, max_uses: int) -> dict[str, Any]:
+    # Shared like ToolRegistry's definitions: callers must copy before annotating.
+    return {"type": tool_type, "name": "web_search", "max_uses": max_uses}
 
 
 def supports_caching(model: str) -> bool:
@@ -0,0 +1,63 @@
+"""Anthropic prompt-cache breakpoint placement for growing message histories.
+
+Shared by the /query tool loop, the scheduler executor and the
+self-improvement agent.
+"""
+
+from typing import Any, Dict, List
+
+# Anthropic allows at most this many cache_control breakpoints per request
+# (tools, system and messages combined).
+MAX_CACHE_BREAKPOINTS = 4
+
+# Spacing of the fixed history checkpoint used when a third breakpoint is free
+CHECKPOINT_INTERVAL = 10
+
+
+def _mark_message_for_cache(msg: Dict[str, Any]) -> None:
+    """Put an ephemeral cache breakpoint on a message's last content block."""
+    content = msg.get("content")
+    if isinstance(content, list) and content and isinstance(content[-1], dict):
+        content[-1] = {**content[-1], "cache_control": {"type": "ephemeral"}}
+
+
+def mark_last_message_for_cache(messages: List[Dict[str, Any]], max_breakpoints: int = 1) -> None:
+    """Move the ephemeral cache breakpoint(s) to the end of the message list.
+
+    The conversation history (assistant tool_use + large tool_result blocks) is
+    re-sent on every tool-loop iteration and every turn. A moving breakpoint on
+    the last content block lets cache hits accrue through the loop. We clear any
+    previous per-message breakpoints first so that, together with the cached
+    system blocks, we stay within Anthropic's 4-breakpoint limit.
+    String-content messages can't carry a per-block breakpoint, so they're skipped.
+
+    With a spare breakpoint (max_breakpoints >= 2), the previous call's tail
+    (messages[-3]: one assistant reply + one user message ago) is marked too, so
+    the prefix written last time is read back even when the newly appended
+    blocks push it past the API's 20-block cache lookback.
+
+    With a third (max_breakpoints >= 3), a fixed checkpoint goes on the last
+    message before the most recent multiple of CHECKPOINT_INTERVAL. It stays put
+    for that many messages, so long histories keep a cached prefix even when
+    both moving breakpoints miss.
+
+    Blocks are *replaced* rather than mutated in place: a block dict may be shared
+    with the persisted history, so an in-place edit would leak the cache_control
+    marker (or a stripped-vs-unstripped mismatch) into stored conversation state.
+    """
+    for msg in messages:
+        content = msg.get("content")
+        if isinstance(content, list):
+            for i, block in enumerate(content):
+                if isinstance(block, dict) and "cache_control" in block:
+                    content[i] = {k: v for k, v in block.items() if k != "cache_control"}
+
+    if not messages or max_breakpoints < 1:
+        return
+    _mark_message_for_cache(messages[-1])
+    if max_breakpoints >= 2 and len(messages) >= 3:
+        _mark_message_for_cache(messages[-3])
+    if max_breakpoints >= 3:
+        checkpoint = (len(messages) // CHECKPOINT_INTERVAL) * CHECKPOINT_INTERVAL - 1
+        if 0 <= checkpoint < len(messages) - 3:
+            _mark_message_for_cache(messages[checkpoint])
@@ -0,0 +1,78 @@
+"""Short-lived cache of finished answers, for replaying client retries.
+
+When a stream drops just as a query finishes (tab sleep, flaky mobile network,
+proxy timeout) the client resends the same message. The turn is already
+saved, so re-running it would repeat the whole tool loop and add a duplicate
+turn to the history. Instead the previous final event is replayed, as long as
+nothing has been added to the session since.
+
+Matching is on a client-generated request id, not on the message text: the
+client sends a fresh id with each new message and reuses it only when it
+resends one whose answer never arrived. A deliberate repeat ("yes", "check
+again") gets a new id and runs as a normal turn.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# How long after an answer a resend of its request id counts as a retry
+RECENT_ANSWER_TTL = 120.0
+RECENT_ANSWER_MAX = 256
+
+
+class RecentAnswerCache:
+    """(session, request id) → final 'done' event, with a TTL.
+
+    Thread-safe; entries are evicted least recently used first.
+    """
+
+    def __init__(self, ttl: float = RECENT_ANSWER_TTL, maxsize: int = RECENT_ANSWER_MAX):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, int, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def put(
+        self, session_id: str, request_id: str, history_len: int, event: Dict[str, Any]
+    ) -> None:
+        """Remember the final event of a finished turn.
+
+        Args:
+            session_id: Session the turn belongs to
+            request_id: Client-generated id the message was sent with
+            history_len: Length of the stored history after the turn was saved
+            event: The 'done' event sent to the client
+        """
+        key = (session_id, request_id)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, history_len, event)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, session_id: str, request_id: str) -> Optional[Tuple[int, Dict]]:
+        """Return (history_len, event) for a matching unexpired turn, else None.
+
+        The caller must compare history_len with the session's current history
+        length: a mismatch means the conversation moved on since that turn.
+        """
+        key = (session_id, request_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, history_len, event = entry
+            if time.monotonic() >= expires:
+                del self._entries[key]
+                return None
+            return history_len, event
+
+    def invalidate(self, session_id: str) -> None:
+        """Forget all answers for a session (e.g. when it is deleted)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == session_id]:
+                del self._entries[key]
@@ -12,19 +12,32 @@ from .database import get_db
 from .db_repository import LearnedRuleRepository
 
 
+# Rules are also written outside the server's own endpoints (the self-improvement
+# agent, the retrospective, the MCP server), so the cache only lives this long
+VOCAB_CACHE_TTL = 60
+
+
 class QueryEnhancer:
     """Expands queries using vocabulary rules from the learned rules database."""
 
-    def __init__(self, logger, cache_ttl_seconds: int = 3600):
+    def __init__(self, logger, cache_ttl_seconds: int = VOCAB_CACHE_TTL):
         self.logger = logger
         self.cache_ttl_seconds = cache_ttl_seconds
         self._cache: List[Tuple[str, List[str]]] = []  # (user_term, note_terms) pairs
         self._cache_loaded_at: float = 0
 
+    def invalidate(self) -> None:
+        """Reload the rules on the next query (call after editing rules)."""
+        self._cache_loaded_at = 0
+
     def _refresh_cache(self) -> None:
-        """Reload vocabulary rules from database if cache is stale."""
+        """Reload vocabulary rules from database if cache is stale.
+
+        An empty rule set is cached too, so a database with no vocabulary
+        rules isn't queried on every request.
+        """
         now = time.time()
-        if self._cache and (now - self._cache_loaded_at) < self.cache_ttl_seconds:
+        if self._cache_loaded_at and (now - self._cache_loaded_at) < self.cache_ttl_seconds:
             return
 
         try:
@@ -0,0 +1,72 @@
+"""Short-lived cache of ContextRetriever results.
+
+A repeated question (same wording, give or take case and surrounding
+whitespace) would otherwise pay the Voyage embedding call plus two Postgres
+queries again. Results are kept for a few minutes only, so newly embedded
+notes show up without any explicit invalidation.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+RETRIEVAL_CACHE_TTL = 300.0
+RETRIEVAL_CACHE_MAX = 512
+
+CacheKey = Tuple[bytes, int, float, Optional[str]]
+
+
+class RetrievalCache:
+    """(query, limit, min_similarity, newer) → retrieved chunks, with a TTL.
+
+    Thread-safe; entries are evicted least recently used first.
+    """
+
+    def __init__(self, ttl: float = RETRIEVAL_CACHE_TTL, maxsize: int = RETRIEVAL_CACHE_MAX):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[CacheKey, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(query: str, limit: int, min_similarity: float, newer: Optional[str]) -> CacheKey:
+        """Cache key for a retrieval; the query is normalized and hashed."""
+        digest = hashlib.blake2b(query.strip().lower().encode(), digest_size=16).digest()
+        return digest, limit, min_similarity, newer
+
+    def get(self, key: CacheKey) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached chunks for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry[0]:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+    def put(self, key: CacheKey, chunks: List[Dict[str, Any]]) -> None:
+        """Remember the chunks retrieved for key."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, list(chunks))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
@@ -16,6 +16,7 @@ from .db_repository import (
     QueryFeedbackRepository,
     ToolExecutionLogExtendedRepository,
 )
+from .llm import response_text
 from .models import get_role_model
 
 RETROSPECTIVE_PROMPT = """\
@@ -301,13 +302,10 @@ class SessionRetrospective:
                 messages=[{"role": "user", "content": prompt}],
             )
 
-            response_text = ""
-            for block in response.content:
-                if getattr(block, "type", "") == "text":
-                    response_text += block.text
+            reply = response_text(response.content)
 
             # 7. Parse JSON response
-            parsed = self._parse_response(response_text)
+            parsed = self._parse_response(reply)
             if not parsed:
                 result["error"] = "Failed to parse Opus response"
                 self.last_run_result = result
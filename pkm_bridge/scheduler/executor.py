@@ -7,8 +7,9 @@ by the ScheduledTask row (prompt, budget, allowed tools).
 import logging
 from typing import Any, Dict, List, Optional
 
+from ..llm import response_text
 from ..models import get_role_model, supports_caching
-from ..self_improvement.agent import mark_last_message_for_cache
+from ..prompt_cache import MAX_CACHE_BREAKPOINTS, mark_last_message_for_cache
 from ..self_improvement.budget import Budget
 
 
@@ -85,14 +86,21 @@ class TaskExecutor:
         else:
             system_param = self.system_prompt
         if cache_enabled and tools:
-            tools[-1]["cache_control"] = {"type": "ephemeral"}
+            # Copy: the registry shares its tool dicts across callers
+            tools[-1] = {**tools[-1], "cache_control": {"type": "ephemeral"}}
+        # Whatever the system/tools breakpoints leave goes to the history
+        message_breakpoints = (
+            MAX_CACHE_BREAKPOINTS
+            - (1 if isinstance(system_param, list) else 0)
+            - (1 if cache_enabled and tools else 0)
+        )
 
         try:
             while budget.can_continue:
                 # Move the cache breakpoint to the tail of the growing history
                 # so the large tool_result blocks are re-sent from cache.
                 if cache_enabled:
-                    mark_last_message_for_cache(messages)
+                    mark_last_message_for_cache(messages, message_breakpoints)
 
                 api_params: Dict[str, Any] = {
                     "model": model,
@@ -119,9 +127,7 @@ class TaskExecutor:
 
                 # No tool use → done
                 if response.stop_reason != "tool_use":
-                    for block in response.content:
-                        if getattr(block, "type", "") == "text":
-                            agent_summary += block.text
+                    agent_summary = response_text(response.content)
                     break
 
                 # Process tool calls
@@ -10,7 +10,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from ..llm import response_text
 from ..models import get_role_model, supports_caching
+from ..prompt_cache import MAX_CACHE_BREAKPOINTS, mark_last_message_for_cache
 from ..tools.registry import ToolRegistry
 from .budget import Budget
 from .filesystem import ensure_pkm_structure, get_runs_dir
@@ -34,31 +36,6 @@ ACTION_TOOL_NAMES = frozenset(
 )
 
 
-def mark_last_message_for_cache(messages: List[Dict[str, Any]]) -> None:
-    """Move the ephemeral cache breakpoint to the end of the message history.
-
-    The growing `messages` array (assistant tool_use + huge tool_result blocks)
-    is re-sent every turn. Caching it keeps re-sends at ~10% of the input rate.
-    We keep a single moving breakpoint on the last content block of the last
-    message, clearing any previous message breakpoint first, so that together
-    with the cached system prompt and tools we stay within Anthropic's 4-block
-    cache_control limit. String-content messages (the initial kickoff) can't
-    carry a per-block breakpoint, so they're skipped.
-    """
-    for msg in messages:
-        content = msg.get("content")
-        if isinstance(content, list):
-            for block in content:
-                if isinstance(block, dict):
-                    block.pop("cache_control", None)
-
-    if not messages:
-        return
-    last_content = messages[-1].get("content")
-    if isinstance(last_content, list) and last_content and isinstance(last_content[-1], dict):
-        last_content[-1]["cache_control"] = {"type": "ephemeral"}
-
-
 class SelfImprovementAgent:
     """Multi-turn agent that inspects and improves the PKM system.
 
@@ -248,8 +225,11 @@ class SelfImprovementAgent:
                 }
             ]
             if tools:
-                tools[-1]["cache_control"] = {"type": "ephemeral"}
+                # Copy: the registry shares its tool dicts across callers
+                tools[-1] = {**tools[-1], "cache_control": {"type": "ephemeral"}}
             extra_headers = {"anthropic-beta": "prompt-caching-2024-07-31"}
+            # System + (last) tool breakpoints; the rest go to the history
+            message_breakpoints = MAX_CACHE_BREAKPOINTS - 1 - (1 if tools else 0)
         else:
             system_blocks = system_prompt
             extra_headers = None
@@ -260,7 +240,7 @@ class SelfImprovementAgent:
                 # Move the cache breakpoint to the tail of the growing history
                 # so the large tool_result blocks are re-sent from cache.
                 if caching:
-                    mark_last_message_for_cache(messages)
+                    mark_last_message_for_cache(messages, message_breakpoints)
 
                 api_params = {
                     "model": model,
@@ -287,9 +267,7 @@ class SelfImprovementAgent:
                 # If no tool use, we're done
                 if response.stop_reason != "tool_use":
                     # Extract final text as agent summary
-                    for block in response.content:
-                        if getattr(block, "type", "") == "text":
-                            agent_summary += block.text
+                    agent_summary = response_text(response.content)
                     break
 
                 # Process tool calls
@@ -736,15 +736,10 @@ class ManageRulesTool(BaseTool):
                 rule_id = params.get("rule_id")
                 if not rule_id:
                     return "Error: rule_id required for reinforce."
-                rule = LearnedRuleRepository.get_by_id(db, rule_id)
-                if not rule:
+                confidence = LearnedRuleRepository.reinforce(db, rule_id)
+                if confidence is None:
                     return f"Rule #{rule_id} not found."
-                rule.hit_count += 1
-                rule.confidence = min(1.0, rule.confidence + 0.1)
-                rule.last_reinforced_at = datetime.utcnow()
-                rule.is_active = True
-                db.commit()
-                msg = f"Reinforced rule #{rule_id} (confidence now {rule.confidence:.2f})"
+                msg = f"Reinforced rule #{rule_id} (confidence now {confidence:.2f})"
 
             elif action == "deactivate":
                 rule_id = params.get("rule_id")
@@ -13,8 +13,13 @@ class BaseTool(ABC):
     - description: Tool description for Claude
     - input_schema: JSON schema for tool parameters
     - execute(): Tool execution logic
+
+    Tools that only read (notes, the index, the database) set read_only, which
+    lets several calls from one turn run concurrently.
     """
 
+    read_only: bool = False
+
     def __init__(self, logger: logging.Logger):
         """Initialize tool with logger.
 
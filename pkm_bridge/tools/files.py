@@ -1,15 +1,97 @@
 """File listing and reading tools."""
 
 import datetime
+import os
+from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple, Union
 
 from .base import BaseTool
 
+# Most lines list_files returns per directory
+MAX_FILES = 100
+
+FileEntry = Union[os.DirEntry, Path]
+
+
+def scan_entries(base_dir: Path, pattern: str) -> List[Tuple[str, os.DirEntry]] | None:
+    """List (relative path, DirEntry) pairs under base_dir matching a simple glob.
+
+    Handles the patterns the model actually sends — a name glob ('*.org') at
+    the top level, or '**/<name glob>' at any depth — with os.scandir, which
+    gets file types from the directory read itself instead of stat()ing every
+    path. Hidden entries are skipped and hidden directories (.git etc.) are
+    never descended into. A directory that can't be read (permissions, removed
+    mid-walk) is skipped rather than failing the whole listing.
+
+    Returns:
+        Matching entries, or None if the pattern needs full glob semantics
+        (a directory component other than a leading '**/').
+    """
+    recursive = pattern.startswith("**/")
+    name_glob = pattern[3:] if recursive else pattern
+    if not name_glob or "/" in name_glob or "**" in name_glob:
+        return None
+
+    matches = []
+    stack = [(str(base_dir), "")]
+    while stack:
+        path, prefix = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name.startswith("."):
+                        continue
+                    rel = prefix + entry.name
+                    if fnmatchcase(entry.name, name_glob):
+                        matches.append((rel, entry))
+                    if recursive and entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, rel + "/"))
+        except OSError:
+            continue
+    return matches
+
+
+def format_entries(
+    entries: List[Tuple[str, FileEntry]], dir_label: str, show_stats: bool
+) -> List[str]:
+    """Format up to MAX_FILES listing lines, newest first when show_stats is set.
+
+    Entries are (relative path, DirEntry or Path) pairs; stat() is only called
+    when stats are requested.
+    """
+    if not entries:
+        return []
+    stats = {}
+    if show_stats:
+        for rel, entry in entries:
+            if entry.is_file():
+                stats[rel] = entry.stat()
+        entries.sort(key=lambda e: stats[e[0]].st_mtime if e[0] in stats else 0, reverse=True)
+    else:
+        entries.sort(key=lambda e: e[0].split("/"))
+
+    output = []
+    for rel, _entry in entries[:MAX_FILES]:
+        st = stats.get(rel)
+        if st is not None:
+            size = st.st_size
+            size_str = f"{size:,} bytes" if size < 1024 else f"{size/1024:.1f} KB"
+            mtime_str = datetime.datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M")
+            output.append(f"[{dir_label}] {rel} ({size_str}, modified {mtime_str})")
+        else:
+            output.append(f"[{dir_label}] {rel}")
+
+    if len(entries) > MAX_FILES:
+        output.append(f"\n... (showing {MAX_FILES} files; truncated)")
+    return output
+
 
 class ListFilesTool(BaseTool):
     """List files in PKM directories with optional stats."""
 
+    read_only = True
+
     def __init__(self, logger, org_dir: Path, logseq_dir: Path | None = None):
         """Initialize file listing tool.
 
@@ -68,52 +150,20 @@ class ListFilesTool(BaseTool):
         try:
 
             def list_from_dir(base_dir: Path, dir_label: str):
-                if "**" in pattern:
-                    files = list(base_dir.rglob(pattern.replace("**", "*")))
-                else:
-                    files = list(base_dir.glob(pattern))
-
-                # Hide dotfiles and .git
-                files = [
-                    f
-                    for f in files
-                    if ".git" not in f.parts and not any(part.startswith(".") for part in f.parts)
-                ]
-                if not files:
-                    return []
-
-                if show_stats:
-                    files.sort(key=lambda f: f.stat().st_mtime if f.is_file() else 0, reverse=True)
-                else:
-                    files.sort()
-
-                MAX_FILES = 100
-                if len(files) > MAX_FILES:
-                    files = files[:MAX_FILES]
-                    truncated = True
-                else:
-                    truncated = False
-
-                output = []
-                for f in files:
-                    rel_path = f.relative_to(base_dir)
-                    if show_stats and f.is_file():
-                        size = f.stat().st_size
-                        size_str = f"{size:,} bytes" if size < 1024 else f"{size/1024:.1f} KB"
-                        mtime = f.stat().st_mtime
-                        mtime_str = datetime.datetime.fromtimestamp(mtime).strftime(
-                            "%Y-%m-%d %H:%M"
-                        )
-                        output.append(
-                            f"[{dir_label}] {rel_path} ({size_str}, modified {mtime_str})"
-                        )
+                entries = scan_entries(base_dir, pattern)
+                if entries is None:
+                    if "**" in pattern:
+                        files = base_dir.rglob(pattern.replace("**", "*"))
                     else:
-                        output.append(f"[{dir_label}] {rel_path}")
-
-                if truncated:
-                    output.append(f"\n... (showing {MAX_FILES} files; truncated)")
-
-                return output
+                        files = base_dir.glob(pattern)
+                    # Hide dotfiles and .git
+                    rels = ((f.relative_to(base_dir), f) for f in files)
+                    entries = [
+                        (str(rel), f)
+                        for rel, f in rels
+                        if not any(part.startswith(".") for part in rel.parts)
+                    ]
+                return format_entries(entries, dir_label, show_stats)
 
             all_output = []
 
@@ -141,6 +191,8 @@ class ListFilesTool(BaseTool):
 class ReadNoteTool(BaseTool):
     """Read a note file's content (read-only, path-contained)."""
 
+    read_only = True
+
     def __init__(self, logger, org_dir: Path, logseq_dir: Path | None = None):
         super().__init__(logger)
         from ..file_editor import FileEditor
@@ -23,9 +23,11 @@ if __name__ == "__main__":
     from pkm_bridge.logging_config import setup_logging
     from pkm_bridge.org_links import rewrite_org_links_to_markdown
     from pkm_bridge.tools.base import BaseTool
+    from pkm_bridge.tools.utils import LiteralYamlDumper
 else:
     from ..org_links import rewrite_org_links_to_markdown
     from .base import BaseTool
+    from .utils import LiteralYamlDumper
 
 
 class FindContextTool(BaseTool):
@@ -37,6 +39,8 @@ class FindContextTool(BaseTool):
     - File metadata (name, type, line number)
     """
 
+    read_only = True
+
     def __init__(self, logger, org_dir: Path, logseq_dir: Path | None = None):
         """Initialize find_context tool.
 
@@ -504,15 +508,13 @@ Default directories searched (if paths not provided):
 
         output = {"pattern": pattern, "total_matches": len(all_results), "results": all_results}
 
-        # Custom representer for multiline strings - use literal block style (|)
-        def str_representer(dumper, data):
-            if "\n" in data:
-                return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
-            return dumper.represent_scalar("tag:yaml.org,2002:str", data)
-
-        yaml.add_representer(str, str_representer)
-
-        return yaml.dump(output, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        return yaml.dump(
+            output,
+            Dumper=LiteralYamlDumper,
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=False,
+        )
 
 
 def main():
@@ -192,6 +192,8 @@ class ProposeNoteOrganizationTool(_ProposalToolBase):
 class ListNoteProposalsTool(BaseTool):
     """List note-organization proposals for review."""
 
+    read_only = True
+
     @property
     def name(self) -> str:
         return "list_note_proposals"
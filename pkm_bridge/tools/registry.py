@@ -11,6 +11,9 @@ class ToolRegistry:
     def __init__(self):
         """Initialize empty tool registry."""
         self._tools: Dict[str, BaseTool] = {}
+        # Built once and reused so every request sends byte-identical tool
+        # definitions, keeping the tools→system prompt-cache prefix stable.
+        self._anthropic_tools: List[Dict[str, Any]] | None = None
 
     def register(self, tool: BaseTool):
         """Register a tool.
@@ -19,6 +22,7 @@ class ToolRegistry:
             tool: Tool instance to register
         """
         self._tools[tool.name] = tool
+        self._anthropic_tools = None
 
     def get_tool(self, name: str) -> BaseTool:
         """Get a tool by name.
@@ -36,6 +40,11 @@ class ToolRegistry:
             raise KeyError(f"Tool not found: {name}")
         return self._tools[name]
 
+    def is_read_only(self, name: str) -> bool:
+        """Whether a tool is registered and declares itself read-only."""
+        tool = self._tools.get(name)
+        return tool is not None and tool.read_only
+
     def execute_tool(
         self, name: str, params: Dict[str, Any], context: Dict[str, Any] = None
     ) -> str:
@@ -64,10 +73,16 @@ class ToolRegistry:
     def get_anthropic_tools(self) -> List[Dict[str, Any]]:
         """Get all tools formatted for Anthropic API.
 
+        The definitions are built once (rebuilt after `register`) and shared
+        between calls; the returned list is a fresh copy, but callers must not
+        mutate the dicts inside it (copy a dict before annotating it).
+
         Returns:
             List of tool definitions for Anthropic API
         """
-        return [tool.to_anthropic_tool() for tool in self._tools.values()]
+        if self._anthropic_tools is None:
+            self._anthropic_tools = [tool.to_anthropic_tool() for tool in self._tools.values()]
+        return list(self._anthropic_tools)
 
     def list_tools(self) -> List[str]:
         """Get list of registered tool names.
@@ -11,6 +11,8 @@ from .utils import run_command_with_error_handling
 class SearchNotesTool(BaseTool):
     """Search all notes in PKM directories."""
 
+    read_only = True
+
     def __init__(self, logger, org_dir: Path, logseq_dir: Path | None = None):
         """Initialize search_notes tool.
 
@@ -10,11 +10,14 @@ import yaml
 
 from pkm_bridge.context_retriever import DEFAULT_MIN_SIMILARITY, ContextRetriever
 from pkm_bridge.tools.base import BaseTool
+from pkm_bridge.tools.utils import LiteralYamlDumper, YamlDumper
 
 
 class SemanticSearchTool(BaseTool):
     """Semantic search using vector embeddings."""
 
+    read_only = True
+
     def __init__(self, logger, context_retriever: ContextRetriever):
         """Initialize semantic search tool.
 
@@ -112,7 +115,7 @@ Results are sorted by hybrid relevance (best first).
             )
         except Exception as e:
             self.logger.error(f"Semantic search failed: {e}")
-            return yaml.dump({"error": str(e), "query": query})
+            return yaml.dump({"error": str(e), "query": query}, Dumper=YamlDumper)
 
         # Format results
         results = []
@@ -130,4 +133,10 @@ Results are sorted by hybrid relevance (best first).
 
         output = {"query": query, "total_results": len(results), "results": results}
 
-        return yaml.dump(output, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        return yaml.dump(
+            output,
+            Dumper=LiteralYamlDumper,
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=False,
+        )
@@ -1,16 +1,27 @@
 """Shell command execution tools."""
 
+import os
 import re
+import selectors
+import shlex
+import signal
 import subprocess
 import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Sequence, Tuple
 
 from .base import BaseTool
 
 
-def validate_command(command: str, dangerous_patterns: List[str]) -> Tuple[bool, str]:
+@lru_cache(maxsize=32)
+def _compile_patterns(dangerous_patterns: Tuple[str, ...]) -> Tuple[Tuple[str, re.Pattern], ...]:
+    """Compile a blacklist once; the same few pattern lists are checked on every call."""
+    return tuple((p, re.compile(p, re.IGNORECASE | re.MULTILINE)) for p in dangerous_patterns)
+
+
+def validate_command(command: str, dangerous_patterns: Sequence[str]) -> Tuple[bool, str]:
     """Validate command against blacklist of dangerous patterns.
 
     Args:
@@ -20,13 +31,119 @@ def validate_command(command: str, dangerous_patterns: List[str]) -> Tuple[bool,
     Returns:
         Tuple of (is_valid, error_message)
     """
-    for pattern in dangerous_patterns:
-        if re.search(pattern, command, re.IGNORECASE | re.MULTILINE):
+    for pattern, regex in _compile_patterns(tuple(dangerous_patterns)):
+        if regex.search(command):
             return False, f"Command blocked by safety pattern: {pattern}"
 
     return True, ""
 
 
+# Anything bash would interpret beyond word splitting and quoting: pipes,
+# redirects, globs, expansions, substitutions, comments, line breaks.
+_SHELL_SYNTAX = re.compile(r"[|&;<>()$`\\*?\[\]{}~!#\n]")
+
+
+def simple_argv(command: str) -> List[str] | None:
+    """Split `command` into argv if it can run without a shell.
+
+    Most tool calls are a single rg/fd invocation; running those directly
+    skips the /bin/bash fork+exec and its startup. Returns None when the
+    command uses any shell syntax (or starts with a VAR=value assignment),
+    in which case it must go through bash.
+    """
+    if _SHELL_SYNTAX.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:  # unbalanced quotes: let bash report it
+        return None
+    if not argv or "=" in argv[0]:
+        return None
+    return argv
+
+
+# Output is cut to this many characters before it reaches the model, so never
+# buffer (much) more than that from a child process.
+MAX_OUTPUT = 20000
+
+
+def run_bounded(
+    args: str | List[str], *, timeout: float, max_bytes: int = MAX_OUTPUT, **popen_kwargs
+) -> Tuple[subprocess.CompletedProcess, bool]:
+    """Run a process, keeping at most `max_bytes` of each of stdout and stderr.
+
+    Both pipes are read as the child writes. Once a stream passes `max_bytes`
+    the whole process group is killed, so a broad `rg` or `find` stops
+    instead of producing (and us holding) output that would be thrown away.
+    Killing the group also takes down the children of a bash pipeline on
+    timeout, which subprocess.run(timeout=...) leaves running.
+
+    Args:
+        args: Command (string if shell=True) or argv list
+        timeout: Seconds before the process group is killed
+        max_bytes: Per-stream output cap
+        **popen_kwargs: Passed to subprocess.Popen (cwd, shell, executable...)
+
+    Returns:
+        Tuple of (CompletedProcess with decoded stdout/stderr, truncated flag)
+
+    Raises:
+        subprocess.TimeoutExpired: If the process runs longer than `timeout`
+    """
+    proc = subprocess.Popen(
+        args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,  # own process group, see _kill_group
+        **popen_kwargs,
+    )
+    bufs = {proc.stdout: bytearray(), proc.stderr: bytearray()}
+    truncated = False
+    deadline = time.monotonic() + timeout
+    try:
+        with selectors.DefaultSelector() as sel:
+            for pipe in bufs:
+                sel.register(pipe, selectors.EVENT_READ)
+            while sel.get_map() and not truncated:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(args, timeout)
+                for key, _ in sel.select(remaining):
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        sel.unregister(key.fileobj)
+                        continue
+                    buf = bufs[key.fileobj]
+                    room = max_bytes - len(buf)
+                    buf += chunk[:room]
+                    truncated = truncated or len(chunk) > room
+        if truncated:
+            _kill_group(proc)
+        returncode = proc.wait(timeout=max(deadline - time.monotonic(), 0))
+    except subprocess.TimeoutExpired:
+        _kill_group(proc)
+        proc.wait()
+        raise
+    finally:
+        proc.stdout.close()
+        proc.stderr.close()
+
+    result = subprocess.CompletedProcess(
+        args,
+        returncode,
+        bufs[proc.stdout].decode(errors="replace"),
+        bufs[proc.stderr].decode(errors="replace"),
+    )
+    return result, truncated
+
+
+def _kill_group(proc: subprocess.Popen) -> None:
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
 def confine_working_dir(working_dir: str | None, org_dir: Path, logseq_dir: Path | None) -> str:
     """Resolve a requested working_dir, confining it to org_dir/logseq_dir.
 
@@ -181,15 +298,21 @@ Security notes:
 
         try:
             start_time = time.time()
-            result = subprocess.run(
-                command,
-                shell=True,
-                executable="/bin/bash",  # Use bash for brace expansion, process substitution, etc.
-                cwd=working_dir,
-                capture_output=True,
-                text=True,
-                timeout=60,
-            )
+            result = None
+            argv = simple_argv(command)
+            if argv is not None:
+                try:
+                    result, truncated = run_bounded(argv, cwd=working_dir, timeout=60)
+                except OSError:
+                    pass  # not an executable (builtin, typo...): bash reports it
+            if result is None:
+                result, truncated = run_bounded(
+                    command,
+                    shell=True,
+                    executable="/bin/bash",  # brace expansion, process substitution, etc.
+                    cwd=working_dir,
+                    timeout=60,
+                )
             elapsed = time.time() - start_time
 
             # Build detailed output
@@ -201,7 +324,8 @@ Security notes:
             if result.stderr:
                 output_parts.append(f"\n[stderr]:\n{result.stderr.rstrip()}")
 
-            if result.returncode != 0:
+            # A truncated run was killed by us, so its exit code means nothing
+            if result.returncode != 0 and not truncated:
                 output_parts.append(f"\n[exit code: {result.returncode}]")
 
             output = "\n".join(output_parts) if output_parts else "[No output]"
@@ -214,7 +338,7 @@ Security notes:
                 f"stderr_bytes={len(result.stderr or '')}"
             )
 
-            if result.returncode != 0:
+            if result.returncode != 0 and not truncated:
                 self.logger.warning(
                     f"[SHELL_ERROR] command={command[:100]}, "
                     f"returncode={result.returncode}, "
@@ -223,8 +347,8 @@ Security notes:
                 )
 
             # Truncate if too long
-            if len(output) > 20000:
-                output = output[:20000] + "\n\n... (output truncated to 20000 chars)"
+            if truncated or len(output) > MAX_OUTPUT:
+                output = output[:MAX_OUTPUT] + f"\n\n... (output truncated to {MAX_OUTPUT} chars)"
 
             return output
 
@@ -355,12 +479,8 @@ Security notes:
         # Execute script
         try:
             start_time = time.time()
-            result = subprocess.run(
-                [script_path],
-                cwd=working_dir,
-                capture_output=True,
-                text=True,
-                timeout=120,  # Longer timeout for scripts
+            result, truncated = run_bounded(
+                [script_path], cwd=working_dir, timeout=120  # Longer timeout for scripts
             )
             elapsed = time.time() - start_time
 
@@ -373,7 +493,8 @@ Security notes:
             if result.stderr:
                 output_parts.append(f"\n[stderr]:\n{result.stderr.rstrip()}")
 
-            output_parts.append(f"\n[exit code: {result.returncode}]")
+            if not truncated:
+                output_parts.append(f"\n[exit code: {result.returncode}]")
             output_parts.append(f"[elapsed: {elapsed:.3f}s]")
 
             output = "\n".join(output_parts)
@@ -386,7 +507,7 @@ Security notes:
                 f"stderr_bytes={len(result.stderr or '')}"
             )
 
-            if result.returncode != 0:
+            if result.returncode != 0 and not truncated:
                 self.logger.warning(
                     f"[SCRIPT_ERROR] path={script_path}, "
                     f"returncode={result.returncode}, "
@@ -395,8 +516,8 @@ Security notes:
                 )
 
             # Truncate if too long
-            if len(output) > 20000:
-                output = output[:20000] + "\n\n... (output truncated to 20000 chars)"
+            if truncated or len(output) > MAX_OUTPUT:
+                output = output[:MAX_OUTPUT] + f"\n\n... (output truncated to {MAX_OUTPUT} chars)"
 
             return output
 
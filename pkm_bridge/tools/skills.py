@@ -17,6 +17,7 @@ from typing import Any, Dict, Optional
 import yaml
 
 from .base import BaseTool
+from .utils import YamlDumper, YamlLoader
 
 # Regex for valid skill names
 SKILL_NAME_RE = re.compile(r"^[a-z0-9][a-z0-9-]{0,48}[a-z0-9]$")
@@ -89,7 +90,7 @@ def _parse_shell_frontmatter(content: str) -> tuple[dict, str]:
         fm_lines.append(stripped)
 
     try:
-        metadata = yaml.safe_load("\n".join(fm_lines)) or {}
+        metadata = yaml.load("\n".join(fm_lines), Loader=YamlLoader) or {}
     except yaml.YAMLError:
         metadata = {}
 
@@ -112,7 +113,7 @@ def _parse_md_frontmatter(content: str) -> tuple[dict, str]:
         fm_lines.append(line)
 
     try:
-        metadata = yaml.safe_load("\n".join(fm_lines)) or {}
+        metadata = yaml.load("\n".join(fm_lines), Loader=YamlLoader) or {}
     except yaml.YAMLError:
         metadata = {}
 
@@ -122,35 +123,68 @@ def _parse_md_frontmatter(content: str) -> tuple[dict, str]:
 
 def _build_shell_frontmatter(metadata: dict) -> str:
     """Build shell script frontmatter block."""
-    yaml_str = yaml.dump(metadata, default_flow_style=False, sort_keys=False).strip()
+    yaml_str = yaml.dump(
+        metadata, Dumper=YamlDumper, default_flow_style=False, sort_keys=False
+    ).strip()
     fm_lines = [f"# {line}" for line in yaml_str.split("\n")]
     return SHELL_FM_START + "\n" + "\n".join(fm_lines) + "\n" + SHELL_FM_END
 
 
 def _build_md_frontmatter(metadata: dict) -> str:
     """Build markdown frontmatter block."""
-    yaml_str = yaml.dump(metadata, default_flow_style=False, sort_keys=False).strip()
+    yaml_str = yaml.dump(
+        metadata, Dumper=YamlDumper, default_flow_style=False, sort_keys=False
+    ).strip()
     return MD_FM_DELIM + "\n" + yaml_str + "\n" + MD_FM_DELIM
 
 
-def _parse_skill_file(filepath: Path) -> Optional[dict]:
-    """Parse a skill file and return its metadata + content."""
-    try:
-        content = filepath.read_text(encoding="utf-8")
-    except (OSError, IOError):
-        return None
+def _read_frontmatter_head(filepath: Path, delim: str) -> str:
+    """Read a skill file only as far as the end of its frontmatter block.
+
+    Stops after the closing delimiter (or after the first line when the file
+    has no frontmatter), so listing skills never pulls in script bodies.
+    """
+    head = []
+    with filepath.open(encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            head.append(line)
+            is_delim = line.strip() == delim
+            if (i == 0 and not is_delim) or (i > 0 and is_delim):
+                break
+    return "".join(head)
+
+
+def _parse_skill_file(filepath: Path, include_body: bool = True) -> Optional[dict]:
+    """Parse a skill file and return its metadata + content.
 
+    Args:
+        filepath: Skill file (.sh, .py or .md)
+        include_body: If False, read only the frontmatter and omit `_body`
+
+    Returns:
+        Metadata dict with `_file`, `_type` (and `_body`), or None if unreadable
+    """
     ext = filepath.suffix
     if ext in (".sh", ".py"):
-        metadata, body = _parse_shell_frontmatter(content)
+        parse, delim = _parse_shell_frontmatter, SHELL_FM_END
     elif ext == ".md":
-        metadata, body = _parse_md_frontmatter(content)
+        parse, delim = _parse_md_frontmatter, MD_FM_DELIM
     else:
         return None
 
+    try:
+        if include_body:
+            content = filepath.read_text(encoding="utf-8")
+        else:
+            content = _read_frontmatter_head(filepath, delim)
+    except (OSError, IOError):
+        return None
+
+    metadata, body = parse(content)
     metadata["_file"] = filepath.name
     metadata["_type"] = {".sh": "shell", ".py": "python", ".md": "recipe"}[ext]
-    metadata["_body"] = body.strip()
+    if include_body:
+        metadata["_body"] = body.strip()
     return metadata
 
 
@@ -279,6 +313,8 @@ class SaveSkillTool(BaseTool):
 class ListSkillsTool(BaseTool):
     """List available skills with metadata."""
 
+    read_only = True
+
     def __init__(self, logger, org_dir: Path):
         super().__init__(logger)
         self.org_dir = org_dir
@@ -317,7 +353,7 @@ class ListSkillsTool(BaseTool):
         for filepath in sorted(skills_dir.iterdir()):
             if filepath.suffix not in (".sh", ".py", ".md"):
                 continue
-            parsed = _parse_skill_file(filepath)
+            parsed = _parse_skill_file(filepath, include_body=False)
             if not parsed:
                 continue
 
@@ -407,35 +443,35 @@ class UseSkillTool(BaseTool):
         if not filepath:
             return f"Skill '{skill_name}' not found. Use list_skills to see available skills."
 
-        parsed = _parse_skill_file(filepath)
-        if not parsed:
+        # Read and parse once: the same parse serves the response and the
+        # use_count bump written back below.
+        try:
+            content = filepath.read_text(encoding="utf-8")
+        except (OSError, IOError):
             return (
                 f"Error reading skill '{skill_name}': file exists at {filepath.name} "
                 "but could not be parsed. Check that it has valid YAML frontmatter."
             )
 
-        # Bump use_count and last_used
-        now = datetime.utcnow().isoformat(timespec="seconds") + "Z"
-        content = filepath.read_text(encoding="utf-8")
-
         if filepath.suffix in (".sh", ".py"):
             metadata, body = _parse_shell_frontmatter(content)
-            metadata["use_count"] = metadata.get("use_count", 0) + 1
-            metadata["last_used"] = now
-            fm = _build_shell_frontmatter(metadata)
-            updated = fm + "\n" + body.lstrip("\n")
         else:
             metadata, body = _parse_md_frontmatter(content)
-            metadata["use_count"] = metadata.get("use_count", 0) + 1
-            metadata["last_used"] = now
-            fm = _build_md_frontmatter(metadata)
-            updated = fm + "\n\n" + body.lstrip("\n")
 
-        _atomic_write(filepath, updated)
+        stype = {".sh": "shell", ".py": "python", ".md": "recipe"}[filepath.suffix]
+        body_content = body.strip()
+        desc = metadata.get("description", "")
 
-        stype = parsed.get("_type", "unknown")
-        body_content = parsed.get("_body", "")
-        desc = parsed.get("description", "")
+        # Bump use_count and last_used
+        now = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+        metadata["use_count"] = metadata.get("use_count", 0) + 1
+        metadata["last_used"] = now
+        if filepath.suffix in (".sh", ".py"):
+            updated = _build_shell_frontmatter(metadata) + "\n" + body.lstrip("\n")
+        else:
+            updated = _build_md_frontmatter(metadata) + "\n\n" + body.lstrip("\n")
+
+        _atomic_write(filepath, updated)
 
         self.logger.info(f"Skill loaded: {skill_name} (use_count now {metadata['use_count']})")
 
@@ -4,6 +4,29 @@ import logging
 import subprocess
 from typing import List, Optional, Tuple
 
+import yaml
+
+# libyaml-backed loader/dumper when PyYAML was built with it (several times
+# faster); same behaviour as yaml.safe_load / yaml.dump otherwise.
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YamlDumper = getattr(yaml, "CDumper", yaml.Dumper)
+
+
+class LiteralYamlDumper(YamlDumper):
+    """YAML dumper that writes multiline strings in literal block style (|).
+
+    Used for tool output the model reads, where escaped newlines hurt.
+    """
+
+
+def _literal_str_representer(dumper, data):
+    if "\n" in data:
+        return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
+    return dumper.represent_scalar("tag:yaml.org,2002:str", data)
+
+
+LiteralYamlDumper.add_representer(str, _literal_str_representer)
+
 
 def run_command_with_error_handling(
     cmd: List[str], timeout: int = 15, logger: Optional[logging.Logger] = None
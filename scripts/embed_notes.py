@@ -3,7 +3,7 @@
 # dependencies = [
 #   "sqlalchemy>=2.0.23",
 #   "psycopg2-binary>=2.9.9",
-#   "pgvector>=0.2.0",
+#   "pgvector>=0.3.0",
 #   "voyageai>=0.2.0",
 #   "python-dotenv>=1.0.0",
 #   "pyyaml>=6.0.2",
@@ -16,6 +16,7 @@ Usage:
     ./scripts/embed_notes.py --incremental      # Only changed files
     ./scripts/embed_notes.py --file path.org    # Single file
     ./scripts/embed_notes.py --limit 10         # Limit to N files (for testing)
+    ./scripts/embed_notes.py --force --bulk     # Full re-embed, vector index built once at the end
     ./scripts/embed_notes.py --clear            # Clear all embeddings (with confirmation)
     ./scripts/embed_notes.py --clear --force    # Clear all embeddings (no confirmation)
 
@@ -36,7 +37,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from dotenv import load_dotenv
 
 from config.settings import Config
-from pkm_bridge.database import Document, DocumentChunk, get_db, init_db
+from pkm_bridge.database import (
+    Document,
+    DocumentChunk,
+    drop_vector_index,
+    get_db,
+    init_db,
+    rebuild_vector_index,
+)
 from pkm_bridge.embeddings.chunker import NoteChunker
 from pkm_bridge.embeddings.embedding_service import embed_document, find_note_files
 from pkm_bridge.embeddings.voyage_client import VoyageClient
@@ -50,6 +58,12 @@ def main():
     parser.add_argument("--force", action="store_true", help="Force re-embedding all files")
     parser.add_argument("--clear", action="store_true", help="Clear all embeddings from database")
     parser.add_argument("--limit", type=int, help="Limit number of files (for testing)")
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Drop the vector index while embedding and rebuild it at the end "
+        "(much faster for a full or initial load)",
+    )
     parser.add_argument("--org-dir", type=Path, help="Override ORG_DIR")
     parser.add_argument("--logseq-dir", type=Path, help="Override LOGSEQ_DIR")
 
@@ -147,6 +161,10 @@ def main():
     embedded_count = 0
     skipped_count = 0
 
+    if args.bulk:
+        print("🗂️  Bulk mode: dropping vector index until the load finishes")
+        drop_vector_index()
+
     try:
         for i, file_path in enumerate(files, 1):
             print(f"\n[{i}/{len(files)}] Processing: {file_path.name}")
@@ -158,6 +176,9 @@ def main():
 
     finally:
         db.close()
+        if args.bulk:
+            print("🗂️  Rebuilding vector index...")
+            rebuild_vector_index()
 
     # Summary
     print("\n" + "=" * 60)
@@ -96,7 +96,7 @@ def main():
     tool_registry = ToolRegistry()
 
     execute_shell_tool = ExecuteShellTool(
-        logger, config.allowed_commands, config.org_dir, config.logseq_dir
+        logger, config.dangerous_patterns, config.org_dir, config.logseq_dir
     )
     tool_registry.register(execute_shell_tool)
     tool_registry.register(ListFilesTool(logger, config.org_dir, config.logseq_dir))
@@ -0,0 +1,85 @@
+"""Tests for AuthManager password and token checks."""
+
+import time
+
+import bcrypt
+import jwt
+
+from pkm_bridge.auth import AuthManager
+
+
+def _manager(password="secret"):
+    password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=4)).decode()
+    return AuthManager(secret_key="k" * 32, password_hash=password_hash)
+
+
+def test_repeat_login_skips_bcrypt(monkeypatch):
+    auth = _manager()
+    assert auth.verify_password("secret")
+
+    def fail(*args):
+        raise AssertionError("bcrypt called again")
+
+    monkeypatch.setattr(bcrypt, "checkpw", fail)
+    assert auth.verify_password("secret")
+
+
+def test_wrong_password_is_not_cached():
+    auth = _manager()
+    assert auth.verify_password("secret")
+    assert not auth.verify_password("guess")
+    assert not auth.verify_password("guess")
+    assert auth.verify_password("secret")
+
+
+def test_verified_token_is_cached(monkeypatch):
+    auth = _manager()
+    token = auth.generate_token()
+    payload = auth.verify_token(token)
+    assert payload["username"] == "user"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("jwt.decode called again")
+
+    monkeypatch.setattr(jwt, "decode", fail)
+    assert auth.verify_token(token) == payload
+
+
+def test_cached_token_near_expiry_is_redecoded():
+    auth = _manager()
+    token = auth.generate_token()
+    auth.verify_token(token)
+    auth._token_cache[token]["exp"] = int(time.time()) - 10
+    assert auth.verify_token(token) is not None  # real exp still valid, re-decoded
+    assert auth.verify_token("not-a-token") is None
+
+
+def test_callers_cannot_modify_the_cached_payload():
+    auth = _manager()
+    token = auth.generate_token()
+    for _ in range(2):  # fresh decode, then cache hit
+        payload = auth.verify_token(token)
+        payload["username"] = "mallory"
+    assert auth.verify_token(token)["username"] == "user"
+
+
+def test_expired_and_mcp_tokens_are_rejected():
+    auth = _manager()
+    now = int(time.time())
+    expired = jwt.encode({"username": "user", "exp": now - 60}, auth.secret_key, "HS256")
+    mcp = jwt.encode({"aud": "mcp", "exp": now + 60}, auth.secret_key, "HS256")
+    assert auth.verify_token(expired) is None
+    assert auth.verify_token(mcp) is None
+
+
+def test_empty_and_oversized_passwords_skip_bcrypt(monkeypatch):
+    auth = _manager()
+
+    def fail(*args):
+        raise AssertionError("bcrypt called")
+
+    monkeypatch.setattr(bcrypt, "checkpw", fail)
+    assert not auth.verify_password("")
+    assert not auth.verify_password("x" * 5000)
+    for value in (None, 12345, ["secret"], {"password": "secret"}):
+        assert not auth.verify_password(value)
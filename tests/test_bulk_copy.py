@@ -0,0 +1,68 @@
+"""Tests for database.bulk_copy_chunks (COPY-based chunk ingestion)."""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+from pkm_bridge.database import bulk_copy_chunks, halfvec_literal
+
+
+class _FakeCursor:
+    def __init__(self):
+        self.sql = None
+        self.data = None
+        self.closed = False
+
+    def copy_expert(self, sql, file):
+        self.sql = sql
+        self.data = file.read()
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeSession:
+    def __init__(self):
+        self.cursor = _FakeCursor()
+        self.flushed = False
+
+    def flush(self):
+        self.flushed = True
+
+    def connection(self):
+        return SimpleNamespace(connection=SimpleNamespace(cursor=lambda: self.cursor))
+
+
+def test_rows_are_escaped_for_copy_text_format():
+    db = _FakeSession()
+    row = {
+        "document_id": 7,
+        "chunk_index": 0,
+        "chunk_type": "content",
+        "heading_path": None,
+        "content": "a\tb\nc\\d",
+        "start_line": 3,
+        "token_count": 5,
+        "embedding": [0.5, -1.0],
+        "created_at": datetime(2024, 5, 1, 12, 0),
+    }
+    assert bulk_copy_chunks(db, [row]) == 1
+    assert db.flushed and db.cursor.closed
+    assert db.cursor.sql.startswith("COPY document_chunks (document_id, chunk_index,")
+    assert db.cursor.data == (
+        "7\t0\tcontent\t\\N\ta\\tb\\nc\\\\d\t3\t5\t[0.5,-1]\t2024-05-01T12:00:00\n"
+    )
+
+
+def test_no_rows_skips_copy():
+    db = _FakeSession()
+    assert bulk_copy_chunks(db, iter([])) == 0
+    assert db.cursor.sql is None
+
+
+def test_halfvec_literal_round_trips_fp16():
+    values = np.random.default_rng(0).normal(0, 0.05, 1024)
+    text = halfvec_literal(values.tolist())
+    parsed = np.array([float(v) for v in text[1:-1].split(",")], dtype=np.float32)
+    assert np.array_equal(parsed.astype(np.float16), values.astype(np.float16))
@@ -1,6 +1,13 @@
 """Tests for the hybrid-retrieval RRF fusion in context_retriever."""
 
-from pkm_bridge.context_retriever import KEYWORD_WEIGHT, RRF_K, VECTOR_WEIGHT, rrf_fuse
+from pkm_bridge.context_retriever import (
+    KEYWORD_WEIGHT,
+    RRF_K,
+    VECTOR_WEIGHT,
+    ContextRetriever,
+    is_trivial_query,
+    rrf_fuse,
+)
 
 
 def test_both_lists_beats_single_list():
@@ -45,3 +52,63 @@ def test_weighted_scores_match_formula():
         assert k_pos < v30_pos
     else:
         assert k_pos > v30_pos
+
+
+class _CountingVoyage:
+    model = "voyage-test"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_single_batched(self, text, input_type="query"):
+        self.calls.append((text, input_type))
+        return [float(len(text))]
+
+
+def test_query_embedding_is_cached():
+    voyage = _CountingVoyage()
+    retriever = ContextRetriever(voyage)
+    assert retriever._embed_query("music notes").tolist() == [11.0]
+    assert retriever._embed_query("music notes").tolist() == [11.0]
+    assert retriever._embed_query("other").tolist() == [5.0]
+    assert retriever._embed_query("other").dtype == "float32"
+    assert voyage.calls == [("music notes", "query"), ("other", "query")]
+
+
+def test_trivial_queries_skip_retrieval():
+    assert is_trivial_query("thanks!")
+    assert is_trivial_query("ok, do it again")
+    assert is_trivial_query("What's that?")
+    assert not is_trivial_query("jazz chord voicings")
+    assert not is_trivial_query("when did I see Dr. Patel?")
+    # A single name or topic is a real lookup
+    assert not is_trivial_query("Who is Bob?")
+    assert not is_trivial_query("What is Kubernetes?")
+    assert is_trivial_query("summarize that")
+
+    voyage = _CountingVoyage()
+    assert ContextRetriever(voyage).retrieve_and_format("hi there") == ""
+    assert voyage.calls == []
+
+
+class _VersionDb:
+    def __init__(self, version):
+        self.version = version
+        self.calls = 0
+
+    def execute(self, statement):
+        self.calls += 1
+        return self
+
+    def scalar(self):
+        return self.version
+
+
+def test_iterative_scan_needs_pgvector_0_8():
+    for version, expected in [("0.8.0", True), ("0.10.1", True), ("0.7.4", False), (None, False)]:
+        db = _VersionDb(version)
+        retriever = ContextRetriever()
+        assert retriever._supports_iterative_scan(db) is expected
+        # Checked once per retriever
+        retriever._supports_iterative_scan(db)
+        assert db.calls == 1
@@ -0,0 +1,56 @@
+"""Tests for the orjson-backed Flask JSON provider."""
+
+import datetime
+import json
+import uuid
+
+from flask import Flask, jsonify
+
+from pkm_bridge.json_provider import OrjsonProvider, dumps
+
+
+def _app(debug: bool = False) -> Flask:
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    app.debug = debug
+    return app
+
+
+def test_jsonify_matches_flask_defaults():
+    app = _app()
+    payload = {
+        "b": 1,
+        "a": datetime.datetime(2020, 1, 1),
+        "id": uuid.UUID(int=1),
+    }
+    with app.app_context():
+        body = jsonify(payload).get_data(as_text=True)
+    assert body == (
+        '{"a":"Wed, 01 Jan 2020 00:00:00 GMT","b":1,'
+        '"id":"00000000-0000-0000-0000-000000000001"}\n'
+    )
+
+
+def test_debug_mode_pretty_prints():
+    app = _app(debug=True)
+    with app.app_context():
+        body = jsonify({"a": [1]}).get_data(as_text=True)
+    assert json.loads(body) == {"a": [1]}
+    assert "\n  " in body
+
+
+def test_request_json_round_trip():
+    app = _app()
+
+    @app.post("/echo")
+    def echo():
+        from flask import request
+
+        return jsonify(request.get_json())
+
+    resp = app.test_client().post("/echo", json={"note": "café ☕"})
+    assert resp.get_json() == {"note": "café ☕"}
+
+
+def test_dumps_unicode_and_int_keys():
+    assert dumps({"s": "ü", 1: True}) == '{"s":"ü","1":true}'
@@ -0,0 +1,58 @@
+"""Tests for the scandir-based list_files fast path."""
+
+import logging
+import os
+
+from pkm_bridge.tools.files import ListFilesTool, scan_entries
+
+
+def _tree(tmp_path):
+    for rel in ["a.org", "b.md", "sub/c.org", "sub/deep/d.org", ".git/x.org", ".hidden.org"]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    return tmp_path
+
+
+def test_top_level_pattern(tmp_path):
+    names = sorted(rel for rel, _ in scan_entries(_tree(tmp_path), "*.org"))
+    assert names == ["a.org"]
+
+
+def test_recursive_pattern_skips_hidden(tmp_path):
+    names = sorted(rel for rel, _ in scan_entries(_tree(tmp_path), "**/*.org"))
+    assert names == ["a.org", "sub/c.org", "sub/deep/d.org"]
+
+
+def test_unreadable_directory_is_skipped(tmp_path, monkeypatch):
+    root = _tree(tmp_path)
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if path.endswith("deep"):
+            raise PermissionError(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    names = sorted(rel for rel, _ in scan_entries(root, "**/*.org"))
+    assert names == ["a.org", "sub/c.org"]
+
+
+def test_complex_patterns_fall_back(tmp_path):
+    assert scan_entries(tmp_path, "sub/*.org") is None
+    assert scan_entries(tmp_path, "**/sub/*.org") is None
+
+
+def test_tool_output(tmp_path):
+    tool = ListFilesTool(logging.getLogger("test"), _tree(tmp_path))
+    assert tool.execute({"pattern": "*"}) == "[org-mode] a.org\n[org-mode] b.md\n[org-mode] sub"
+    with_stats = tool.execute({"pattern": "**/*.org", "show_stats": True}).splitlines()
+    assert len(with_stats) == 3
+    assert all("(1 bytes, modified " in line for line in with_stats)
+
+
+def test_fallback_output_matches_fast_path(tmp_path):
+    tool = ListFilesTool(logging.getLogger("test"), _tree(tmp_path))
+    assert tool.execute({"pattern": "sub/*.org"}) == "[org-mode] sub/c.org"
+    with_stats = tool.execute({"pattern": "sub/*/*.org", "show_stats": True})
+    assert with_stats.startswith("[org-mode] sub/deep/d.org (1 bytes, modified ")
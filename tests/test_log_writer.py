@@ -0,0 +1,30 @@
+"""Tests for the batched ToolExecutionLog writer."""
+
+from pkm_bridge.log_writer import BatchedLogWriter
+
+
+def test_rows_are_written_in_batches():
+    batches = []
+    writer = BatchedLogWriter(sink=batches.append, flush_interval=0.5, max_rows=2)
+    for i in range(5):
+        writer.submit(tool_name=f"t{i}")
+    writer.flush()
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert [row["tool_name"] for b in batches for row in b] == ["t0", "t1", "t2", "t3", "t4"]
+    assert all("created_at" in row for b in batches for row in b)
+
+
+def test_sink_errors_do_not_stop_the_writer():
+    batches = []
+
+    def sink(batch):
+        if batch[0]["tool_name"] == "bad":
+            raise RuntimeError("db down")
+        batches.append(batch)
+
+    writer = BatchedLogWriter(sink=sink, flush_interval=0, max_rows=1)
+    writer.submit(tool_name="bad")
+    writer.flush()
+    writer.submit(tool_name="good")
+    writer.flush()
+    assert [[row["tool_name"] for row in b] for b in batches] == [["good"]]
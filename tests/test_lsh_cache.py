@@ -0,0 +1,41 @@
+"""Tests for the near-duplicate query cache."""
+
+import numpy as np
+
+from pkm_bridge.lsh_cache import LSHSemanticCache
+
+
+def _vec(seed, dim=64):
+    return np.random.default_rng(seed).standard_normal(dim)
+
+
+def test_near_duplicate_hits_and_unrelated_misses():
+    cache = LSHSemanticCache(dim=64)
+    base = _vec(1)
+    cache.insert(base, ("p",), ["chunks"])
+
+    close = base + 0.05 * _vec(2)
+    assert cache.lookup(close, ("p",)) == ["chunks"]
+    assert cache.lookup(_vec(3), ("p",)) is None
+
+
+def test_params_must_match():
+    cache = LSHSemanticCache(dim=64)
+    cache.insert(_vec(1), (12, 0.35, None), ["a"])
+    assert cache.lookup(_vec(1), (5, 0.35, None)) is None
+    assert cache.lookup(_vec(1), (12, 0.35, None)) == ["a"]
+
+
+def test_eviction_removes_bucket_entries():
+    cache = LSHSemanticCache(dim=64, maxsize=2)
+    for seed in (1, 2, 3):
+        cache.insert(_vec(seed), (), seed)
+    assert cache.lookup(_vec(1), ()) is None
+    assert cache.lookup(_vec(3), ()) == 3
+    assert sum(len(b) for b in cache._buckets.values()) == 2 * cache._n_tables
+
+
+def test_expired_entries_miss():
+    cache = LSHSemanticCache(dim=64, ttl=0)
+    cache.insert(_vec(1), (), "x")
+    assert cache.lookup(_vec(1), ()) is None
@@ -0,0 +1,76 @@
+"""Tests for cache breakpoint placement in prompt_cache."""
+
+from pkm_bridge.prompt_cache import mark_last_message_for_cache
+
+
+def _msg(role, *texts):
+    return {"role": role, "content": [{"type": "text", "text": t} for t in texts]}
+
+
+def _marked(messages):
+    return [
+        (i, j)
+        for i, m in enumerate(messages)
+        if isinstance(m["content"], list)
+        for j, b in enumerate(m["content"])
+        if "cache_control" in b
+    ]
+
+
+def test_single_breakpoint_on_tail():
+    messages = [_msg("user", "a"), _msg("assistant", "b"), _msg("user", "c", "d")]
+    mark_last_message_for_cache(messages)
+    assert _marked(messages) == [(2, 1)]
+
+
+def test_breakpoint_moves_forward():
+    messages = [_msg("user", "a")]
+    mark_last_message_for_cache(messages)
+    messages += [_msg("assistant", "b"), _msg("user", "c")]
+    mark_last_message_for_cache(messages)
+    assert _marked(messages) == [(2, 0)]
+
+
+def test_spare_breakpoint_marks_previous_tail():
+    messages = [_msg("user", "a"), _msg("assistant", "b"), _msg("user", "c")]
+    mark_last_message_for_cache(messages, max_breakpoints=2)
+    assert _marked(messages) == [(0, 0), (2, 0)]
+
+
+def test_zero_budget_clears_everything():
+    messages = [_msg("user", "a")]
+    mark_last_message_for_cache(messages)
+    mark_last_message_for_cache(messages, max_breakpoints=0)
+    assert _marked(messages) == []
+
+
+def test_string_content_is_skipped():
+    messages = [{"role": "user", "content": "hello"}]
+    mark_last_message_for_cache(messages)
+    assert messages == [{"role": "user", "content": "hello"}]
+
+
+def test_shared_blocks_are_not_mutated():
+    block = {"type": "text", "text": "a"}
+    persisted = [{"role": "user", "content": [block]}]
+    api_messages = [{**m, "content": list(m["content"])} for m in persisted]
+    mark_last_message_for_cache(api_messages)
+    assert "cache_control" not in block
+    assert "cache_control" in api_messages[0]["content"][0]
+
+
+def test_third_breakpoint_is_a_fixed_checkpoint():
+    messages = [_msg("user" if i % 2 == 0 else "assistant", str(i)) for i in range(25)]
+    mark_last_message_for_cache(messages, max_breakpoints=3)
+    assert _marked(messages) == [(19, 0), (22, 0), (24, 0)]
+
+    # Two more messages later the checkpoint hasn't moved
+    messages += [_msg("assistant", "25"), _msg("user", "26")]
+    mark_last_message_for_cache(messages, max_breakpoints=3)
+    assert _marked(messages) == [(19, 0), (24, 0), (26, 0)]
+
+
+def test_checkpoint_skipped_when_it_overlaps_the_tails():
+    messages = [_msg("user" if i % 2 == 0 else "assistant", str(i)) for i in range(11)]
+    mark_last_message_for_cache(messages, max_breakpoints=3)
+    assert _marked(messages) == [(8, 0), (10, 0)]
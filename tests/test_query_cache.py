@@ -0,0 +1,38 @@
+"""Tests for the recent-answer replay cache."""
+
+from pkm_bridge.query_cache import RecentAnswerCache
+
+EVENT = {"type": "done", "response": "hi", "usage": {"input_tokens": 5}}
+
+
+def test_resent_request_id_hits():
+    cache = RecentAnswerCache()
+    cache.put("s1", "req-1", 4, EVENT)
+    assert cache.get("s1", "req-1") == (4, EVENT)
+
+
+def test_other_session_or_request_id_misses():
+    cache = RecentAnswerCache()
+    cache.put("s1", "req-1", 4, EVENT)
+    assert cache.get("s2", "req-1") is None
+    # Same message sent again on purpose carries a new id
+    assert cache.get("s1", "req-2") is None
+
+
+def test_expired_and_invalidated_entries_miss():
+    cache = RecentAnswerCache(ttl=0)
+    cache.put("s1", "req-1", 4, EVENT)
+    assert cache.get("s1", "req-1") is None
+
+    cache = RecentAnswerCache()
+    cache.put("s1", "req-1", 4, EVENT)
+    cache.invalidate("s1")
+    assert cache.get("s1", "req-1") is None
+
+
+def test_lru_bound():
+    cache = RecentAnswerCache(maxsize=2)
+    for request_id in ["a", "b", "c"]:
+        cache.put("s1", request_id, 0, EVENT)
+    assert cache.get("s1", "a") is None
+    assert cache.get("s1", "c") is not None
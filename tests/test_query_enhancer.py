@@ -0,0 +1,43 @@
+"""Tests for QueryEnhancer's vocabulary rule cache."""
+
+import logging
+from types import SimpleNamespace
+
+from pkm_bridge import query_enhancer
+from pkm_bridge.query_enhancer import QueryEnhancer
+
+
+class _FakeDb:
+    def close(self):
+        pass
+
+
+def _enhancer(monkeypatch, rules):
+    loads = []
+
+    def get_vocabulary_rules(db):
+        loads.append(db)
+        return rules
+
+    monkeypatch.setattr(query_enhancer, "get_db", _FakeDb)
+    monkeypatch.setattr(
+        query_enhancer.LearnedRuleRepository, "get_vocabulary_rules", get_vocabulary_rules
+    )
+    return QueryEnhancer(logging.getLogger("test")), loads
+
+
+def test_expands_mapped_terms(monkeypatch):
+    rule = SimpleNamespace(rule_data={"user_term": "Car", "note_terms": ["Subaru", "vehicle"]})
+    enhancer, _ = _enhancer(monkeypatch, [rule])
+    assert enhancer.expand_query("my car notes") == "my car notes (related: Subaru, vehicle)"
+
+
+def test_empty_rule_set_is_cached(monkeypatch):
+    enhancer, loads = _enhancer(monkeypatch, [])
+    for _ in range(3):
+        assert enhancer.expand_query("anything") == "anything"
+    assert len(loads) == 1
+
+    enhancer.invalidate()
+    enhancer.expand_query("anything")
+    assert len(loads) == 2
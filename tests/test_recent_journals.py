@@ -0,0 +1,60 @@
+"""Tests for ContextRetriever.retrieve_recent_journals."""
+
+import os
+import time
+
+from pkm_bridge.context_retriever import ContextRetriever
+from pkm_bridge.embeddings import embedding_service
+
+
+def test_reads_only_recent_journals(tmp_path, monkeypatch):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    files = {
+        "2024_05_02.md": 0,
+        "2024-05-01.org": 0,
+        "2020_01_01.md": 30,  # days old
+    }
+    for name, age_days in files.items():
+        path = journals / name
+        path.write_text(f"entry {name}", encoding="utf-8")
+        stamp = time.time() - age_days * 86400
+        os.utime(path, (stamp, stamp))
+    page = tmp_path / "pages" / "topic.md"
+    page.parent.mkdir()
+    page.write_text("not a journal")
+    listed = [journals / n for n in files] + [page, journals / "deleted.md"]
+
+    monkeypatch.setenv("LOGSEQ_DIR", str(tmp_path))
+    monkeypatch.setenv("ORG_DIR", str(tmp_path / "missing"))
+    monkeypatch.setattr(embedding_service, "find_note_files", lambda dirs, **kw: listed)
+
+    result = ContextRetriever().retrieve_recent_journals(days=3)
+    assert [(j["date"], j["file_type"]) for j in result] == [
+        ("2024-05-02", "md"),
+        ("2024-05-01", "org"),
+    ]
+    assert result[0]["content"] == "entry 2024_05_02.md"
+
+
+def test_unchanged_journals_are_not_reread(tmp_path, monkeypatch):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    entry = journals / "2024_05_02.md"
+    entry.write_text("first", encoding="utf-8")
+    monkeypatch.setenv("LOGSEQ_DIR", str(tmp_path))
+    monkeypatch.setenv("ORG_DIR", str(tmp_path / "missing"))
+    monkeypatch.setattr(embedding_service, "find_note_files", lambda dirs, **kw: [entry])
+
+    retriever = ContextRetriever()
+    assert retriever.retrieve_recent_journals()[0]["content"] == "first"
+
+    # Same mtime: the cached content is served
+    stamp = entry.stat().st_mtime
+    entry.write_text("second", encoding="utf-8")
+    os.utime(entry, (stamp, stamp))
+    assert retriever.retrieve_recent_journals()[0]["content"] == "first"
+
+    # Edited: re-read
+    os.utime(entry, (stamp + 1, stamp + 1))
+    assert retriever.retrieve_recent_journals()[0]["content"] == "second"
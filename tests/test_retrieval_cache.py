@@ -0,0 +1,32 @@
+"""Tests for the ContextRetriever result cache."""
+
+from pkm_bridge.retrieval_cache import RetrievalCache
+
+
+def test_hit_normalizes_query_and_copies_list():
+    cache = RetrievalCache()
+    cache.put(RetrievalCache.key("Music notes", 12, 0.35, None), [{"content": "a"}])
+    hit = cache.get(RetrievalCache.key("  music NOTES ", 12, 0.35, None))
+    assert hit == [{"content": "a"}]
+    hit.append({"content": "b"})
+    assert len(cache.get(RetrievalCache.key("music notes", 12, 0.35, None))) == 1
+
+
+def test_other_parameters_miss():
+    cache = RetrievalCache()
+    cache.put(RetrievalCache.key("q", 12, 0.35, None), [])
+    assert cache.get(RetrievalCache.key("q", 5, 0.35, None)) is None
+    assert cache.get(RetrievalCache.key("q", 12, 0.35, "2024-01-01")) is None
+    assert cache.stats() == {"hits": 0, "misses": 2, "evictions": 0, "size": 1}
+
+
+def test_expiry_and_eviction():
+    cache = RetrievalCache(ttl=0)
+    cache.put(RetrievalCache.key("q", 1, 0.0, None), [])
+    assert cache.get(RetrievalCache.key("q", 1, 0.0, None)) is None
+
+    cache = RetrievalCache(maxsize=2)
+    for q in ("a", "b", "c"):
+        cache.put(RetrievalCache.key(q, 1, 0.0, None), [])
+    assert cache.get(RetrievalCache.key("a", 1, 0.0, None)) is None
+    assert cache.stats()["evictions"] == 1
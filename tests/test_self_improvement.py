@@ -142,6 +142,26 @@ class TestParseSkillFile:
         assert parsed["_type"] == "recipe"
         assert "foo" in parsed["_body"]
 
+    def test_metadata_only(self, skills_dir: Path):
+        fm = _build_shell_frontmatter({"name": "my-shell", "use_count": 3})
+        p = skills_dir / "my-shell.sh"
+        p.write_text(fm + "\n#!/bin/bash\n# ---\ndate\n")
+
+        parsed = _parse_skill_file(p, include_body=False)
+        assert parsed == {
+            "name": "my-shell",
+            "use_count": 3,
+            "_file": "my-shell.sh",
+            "_type": "shell",
+        }
+
+    def test_metadata_only_without_frontmatter(self, skills_dir: Path):
+        p = skills_dir / "bare.md"
+        p.write_text("# Just a heading\n---\nbody\n")
+
+        parsed = _parse_skill_file(p, include_body=False)
+        assert parsed == {"_file": "bare.md", "_type": "recipe"}
+
     def test_unsupported_extension(self, tmp_path: Path):
         p = tmp_path / "readme.txt"
         p.write_text("hello")
@@ -596,6 +616,7 @@ class TestSchemaUpgrade:
             {"name": "tool_name"},
             {"name": "exit_code"},
         ]  # no was_helpful
+        mock_inspector.get_indexes.return_value = [{"name": "ix_tool_execution_logs_created_at"}]
 
         mock_conn = MagicMock()
         mock_engine.begin.return_value.__enter__ = MagicMock(return_value=mock_conn)
@@ -622,9 +643,32 @@ class TestSchemaUpgrade:
             {"name": "tool_name"},
             {"name": "was_helpful"},
         ]
+        mock_inspector.get_indexes.return_value = [{"name": "ix_tool_execution_logs_created_at"}]
 
         with patch("pkm_bridge.database.inspect", return_value=mock_inspector):
             _upgrade_schema(mock_engine)
 
         # Should NOT have called engine.begin (no ALTER needed)
         mock_engine.begin.assert_not_called()
+
+    def test_halfvec_conversion_drops_vector_indexes_first(self):
+        """Old vector_cosine_ops indexes must be gone before the halfvec ALTER."""
+        from pkm_bridge.database import _upgrade_schema
+
+        mock_engine = MagicMock()
+        mock_inspector = MagicMock()
+        mock_inspector.get_table_names.return_value = ["document_chunks"]
+
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value.scalar.return_value = "vector(1024)"
+        mock_engine.begin.return_value.__enter__ = MagicMock(return_value=mock_conn)
+        mock_engine.begin.return_value.__exit__ = MagicMock(return_value=False)
+
+        with patch("pkm_bridge.database.inspect", return_value=mock_inspector):
+            _upgrade_schema(mock_engine)
+
+        statements = [str(c[0][0]) for c in mock_conn.execute.call_args_list]
+        alter = next(i for i, s in enumerate(statements) if "TYPE halfvec" in s)
+        for index in ("idx_embedding_cosine", "idx_embedding_hnsw"):
+            drop = statements.index(f"DROP INDEX IF EXISTS {index}")
+            assert drop < alter
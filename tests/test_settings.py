@@ -0,0 +1,46 @@
+"""Tests for system prompt assembly in config.settings."""
+
+import os
+
+import pytest
+
+from config.settings import Config
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    monkeypatch.setenv("ORG_DIR", str(tmp_path))
+    monkeypatch.setenv("LOGSEQ_DIR", str(tmp_path / "missing"))
+    monkeypatch.setenv("AUTH_ENABLED", "false")
+    return Config(env_file=str(tmp_path / "none.env"))
+
+
+def test_cached_blocks_are_byte_identical_across_calls(config):
+    first = config.get_system_prompt_blocks(user_context="ctx")
+    second = config.get_system_prompt_blocks(user_context="ctx")
+    # Everything but the trailing date block must be stable for prompt caching
+    assert first[:-1] == second[:-1]
+    assert all("cache_control" in b for b in first[:-1])
+    assert "cache_control" not in first[-1]
+    assert config.get_system_prompt("ctx") == config.get_system_prompt("ctx")
+
+
+def test_curated_patterns_are_reread_after_edit(config):
+    path = config.org_dir / ".pkm" / "learned-patterns.md"
+    path.parent.mkdir()
+    path.write_text("one")
+    assert config.get_learned_patterns_block() == "\n\none"
+
+    path.write_text("two")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert config.get_learned_patterns_block() == "\n\ntwo"
+
+
+def test_missing_system_prompt_raises(config, tmp_path):
+    config.system_prompt_file = tmp_path / "gone.txt"
+    with pytest.raises(FileNotFoundError):
+        config.get_system_prompt_blocks(user_context="ctx")
+    with pytest.raises(FileNotFoundError):
+        config.get_system_prompt("ctx")
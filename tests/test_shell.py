@@ -0,0 +1,62 @@
+"""Tests for shell tool command handling."""
+
+import logging
+import subprocess
+import time
+
+import pytest
+
+from pkm_bridge.tools.shell import ExecuteShellTool, run_bounded, simple_argv
+
+
+def test_simple_commands_skip_the_shell():
+    assert simple_argv("rg -i 'foo bar' --type=org") == ["rg", "-i", "foo bar", "--type=org"]
+    assert simple_argv('fd --changed-within 2d "meeting notes"') == [
+        "fd",
+        "--changed-within",
+        "2d",
+        "meeting notes",
+    ]
+
+
+def test_shell_syntax_needs_bash():
+    for command in [
+        "rg foo | head",
+        "rg foo > out.txt",
+        "ls *.org",
+        "echo $HOME",
+        "cat ~/notes.org",
+        "echo {a,b}",
+        "rg 'a|b'",
+        "FOO=1 env",
+        "echo 'unterminated",
+        "",
+    ]:
+        assert simple_argv(command) is None, command
+
+
+def test_execute_falls_back_to_bash_for_builtins(tmp_path):
+    tool = ExecuteShellTool(logging.getLogger("test"), [], tmp_path)
+    assert tool.execute({"command": "type cd"}).startswith("cd is a shell builtin")
+    assert tool.execute({"command": "echo hi there"}) == "hi there"
+
+
+def test_run_bounded_stops_runaway_output():
+    start = time.monotonic()
+    result, truncated = run_bounded(["yes"], timeout=10, max_bytes=1000)
+    assert truncated
+    assert len(result.stdout) == 1000
+    assert time.monotonic() - start < 5
+
+
+def test_run_bounded_keeps_short_output_and_exit_code():
+    result, truncated = run_bounded("echo out; echo err >&2; exit 3", shell=True, timeout=10)
+    assert not truncated
+    assert (result.stdout, result.stderr, result.returncode) == ("out\n", "err\n", 3)
+
+
+def test_run_bounded_timeout_kills_pipeline():
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_bounded("sleep 30 | cat", shell=True, timeout=0.5)
+    assert time.monotonic() - start < 5
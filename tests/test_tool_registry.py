@@ -0,0 +1,66 @@
+"""Tests for ToolRegistry's memoized Anthropic tool definitions."""
+
+import logging
+
+from pkm_bridge.tools.base import BaseTool
+from pkm_bridge.tools.registry import ToolRegistry
+
+
+class _EchoTool(BaseTool):
+    def __init__(self, name: str):
+        super().__init__(logging.getLogger("test"))
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return f"Echo ({self._name})"
+
+    @property
+    def input_schema(self):
+        return {"type": "object", "properties": {}}
+
+    def execute(self, params, context=None) -> str:
+        return "ok"
+
+
+def test_definitions_are_reused_between_calls():
+    registry = ToolRegistry()
+    registry.register(_EchoTool("a"))
+    first = registry.get_anthropic_tools()
+    second = registry.get_anthropic_tools()
+    assert first is not second
+    assert first[0] is second[0]
+
+
+def test_register_rebuilds_definitions():
+    registry = ToolRegistry()
+    registry.register(_EchoTool("a"))
+    assert [t["name"] for t in registry.get_anthropic_tools()] == ["a"]
+    registry.register(_EchoTool("b"))
+    assert [t["name"] for t in registry.get_anthropic_tools()] == ["a", "b"]
+
+
+def test_list_mutation_does_not_leak():
+    registry = ToolRegistry()
+    registry.register(_EchoTool("a"))
+    tools = registry.get_anthropic_tools()
+    tools.append({"name": "web_search"})
+    tools[-1] = {**tools[0], "cache_control": {"type": "ephemeral"}}
+    assert registry.get_anthropic_tools() == [
+        {"name": "a", "description": "Echo (a)", "input_schema": tools[0]["input_schema"]}
+    ]
+
+
+def test_only_declared_tools_are_read_only():
+    reader = _EchoTool("reader")
+    reader.read_only = True
+    registry = ToolRegistry()
+    registry.register(reader)
+    registry.register(_EchoTool("writer"))
+    assert registry.is_read_only("reader")
+    assert not registry.is_read_only("writer")
+    assert not registry.is_read_only("unknown")
@@ -0,0 +1,88 @@
+"""Tests for request coalescing in VoyageClient.embed_single_batched."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from pkm_bridge.embeddings import voyage_client
+from pkm_bridge.embeddings.voyage_client import VoyageClient
+
+
+class _FakeVoyage:
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+        self.short = False
+
+    def embed(self, texts, model, input_type):
+        self.calls.append((list(texts), input_type))
+        if "slow" in texts:
+            self.release.wait(5)
+        if "boom" in texts:
+            raise RuntimeError("api down")
+        embeddings = [[float(len(t))] for t in texts]
+        return SimpleNamespace(
+            embeddings=embeddings[:-1] if self.short else embeddings, total_tokens=1
+        )
+
+
+def _client():
+    client = VoyageClient(api_key="test")
+    client.client = _FakeVoyage()
+    return client
+
+
+def _run_all(client, texts):
+    results = {}
+
+    def run(text):
+        results[text] = client.embed_single_batched(text)
+
+    threads = [threading.Thread(target=run, args=(t,)) for t in texts]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return results
+
+
+def test_concurrent_requests_share_one_call(monkeypatch):
+    monkeypatch.setattr(voyage_client, "BATCH_WINDOW", 0.5)
+    client = _client()
+
+    results = _run_all(client, ["a", "bb", "ccc"])
+
+    assert results == {"a": [1.0], "bb": [2.0], "ccc": [3.0]}
+    assert len(client.client.calls) == 1
+    assert sorted(client.client.calls[0][0]) == ["a", "bb", "ccc"]
+    assert client.client.calls[0][1] == "query"
+
+
+def test_slow_call_does_not_block_later_batches():
+    client = _client()
+    client.client.release.clear()
+    slow = threading.Thread(target=client.embed_single_batched, args=("slow",))
+    slow.start()
+    while not client.client.calls:
+        time.sleep(0.001)
+
+    assert client.embed_single_batched("bb") == [2.0]
+    client.client.release.set()
+    slow.join(5)
+
+
+def test_errors_reach_the_caller(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda s: None)  # skip retry backoff
+    client = _client()
+    with pytest.raises(RuntimeError, match="api down"):
+        client.embed_single_batched("boom")
+
+
+def test_missing_embeddings_are_an_error():
+    client = _client()
+    client.client.short = True
+    with pytest.raises(ValueError, match="0 embeddings for 1 texts"):
+        client.embed_single_batched("a")